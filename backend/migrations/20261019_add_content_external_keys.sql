@@ -0,0 +1,22 @@
+-- Migration: Clés externes pour l'import en masse du contenu
+-- Date: 2026-10-19
+-- Permet l'upsert idempotent des subjects et lessons par POST /api/admin/bulk/content/import
+
+ALTER TABLE subjects ADD COLUMN IF NOT EXISTS "externalKey" VARCHAR(255);
+ALTER TABLE lessons ADD COLUMN IF NOT EXISTS "externalKey" VARCHAR(255);
+
+COMMENT ON COLUMN subjects."externalKey" IS 'Clé stable fournie par l''import en masse';
+COMMENT ON COLUMN lessons."externalKey" IS 'Clé stable fournie par l''import en masse';
+
+-- Index uniques requis par ON CONFLICT ("externalKey")
+CREATE UNIQUE INDEX IF NOT EXISTS idx_subjects_external_key ON subjects("externalKey");
+CREATE UNIQUE INDEX IF NOT EXISTS idx_lessons_external_key ON lessons("externalKey");
+
+-- Contenu existant: même clé que celle dérivée par l'export NDJSON (subject-<id>, lesson-<id>),
+-- pour qu'un export réimporté dans la même base mette à jour les lignes au lieu de les dupliquer
+UPDATE subjects s SET "externalKey" = 'subject-' || s.id
+WHERE s."externalKey" IS NULL
+  AND NOT EXISTS (SELECT 1 FROM subjects o WHERE o."externalKey" = 'subject-' || s.id);
+UPDATE lessons l SET "externalKey" = 'lesson-' || l.id
+WHERE l."externalKey" IS NULL
+  AND NOT EXISTS (SELECT 1 FROM lessons o WHERE o."externalKey" = 'lesson-' || l.id);
@@ -0,0 +1,35 @@
+-- Migration: notifications."userId" en UUID (clé étrangère vers users.id)
+-- Date: 2026-10-19
+-- users.id est un UUID: avec un "userId" INTEGER, aucune notification ne pouvait être
+-- enregistrée pour un utilisateur réel (ex: notifications d'expiration des essais).
+-- Les lignes existantes, qui ne peuvent référencer aucun utilisateur, sont conservées
+-- dans notifications_legacy_integer_user avant conversion.
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'notifications' AND column_name = 'userId' AND data_type = 'integer'
+    ) THEN
+        CREATE TABLE IF NOT EXISTS notifications_legacy_integer_user AS
+            SELECT * FROM notifications WITH NO DATA;
+        INSERT INTO notifications_legacy_integer_user SELECT * FROM notifications;
+        DELETE FROM notifications;
+
+        ALTER TABLE notifications DROP CONSTRAINT IF EXISTS "notifications_userId_fkey";
+        ALTER TABLE notifications ALTER COLUMN "userId" TYPE UUID USING NULL;
+    END IF;
+
+    IF EXISTS (SELECT 1 FROM information_schema.tables WHERE table_name = 'notifications') THEN
+        IF NOT EXISTS (
+            SELECT 1 FROM information_schema.table_constraints
+            WHERE table_name = 'notifications' AND constraint_name = 'notifications_userId_fkey'
+        ) THEN
+            ALTER TABLE notifications
+                ADD CONSTRAINT "notifications_userId_fkey" FOREIGN KEY ("userId")
+                REFERENCES users(id) ON DELETE CASCADE;
+        END IF;
+
+        CREATE INDEX IF NOT EXISTS notifications_user_id_is_read ON notifications("userId", "isRead");
+    END IF;
+END $$;
@@ -5,6 +5,7 @@
 
 const { Sequelize } = require('sequelize');
 const logger = require('../utils/logger');
+const startupProfiler = require('../utils/startupProfiler');
 
 // Configuration selon l'environnement
 const config = {
@@ -109,7 +110,14 @@ async function testConnection() {
 }
 
 // Fonction pour initialiser les modèles
+let modelsProfiled = false;
+let initializeModelsCalls = 0;
 function initializeModels() {
+  initializeModelsCalls++;
+  // Profilage: seule la première initialisation (souvent pendant la 1ère requête) est mesurée
+  const endProfile = modelsProfiled ? null : startupProfiler.start('models:initializeModels');
+  modelsProfiled = true;
+
   // Import des modèles existants
   const User = require('../models/User')(sequelize);
   const Family = require('../models/Family')(sequelize);
@@ -175,6 +183,8 @@ function initializeModels() {
     PaymentTicket,
   });
 
+  if (endProfile) endProfile();
+
   return {
     User,
     Family,
@@ -531,9 +541,30 @@ function defineAssociations(models) {
   });
 }
 
+/**
+ * Utilisation du pool de connexions et des modèles (métriques d'endurance)
+ */
+function getDatabaseStats() {
+  const pool = sequelize.connectionManager.pool;
+
+  return {
+    dialect: dbConfig.dialect,
+    pool: pool && typeof pool.size === 'number' ? {
+      size: pool.size,
+      available: pool.available,
+      using: pool.using,
+      waiting: pool.waiting,
+      max: pool.maxSize
+    } : null,
+    definedModels: Object.keys(sequelize.models).length,
+    initializeModelsCalls
+  };
+}
+
 module.exports = {
   sequelize,
   testConnection,
   initializeModels,
+  getDatabaseStats,
   config
 };
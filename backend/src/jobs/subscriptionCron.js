@@ -25,6 +25,7 @@ if (fs.existsSync(envPath)) {
 const cron = require('node-cron');
 const database = require('../config/database');
 const SubscriptionService = require('../services/subscriptionService');
+const notificationQueue = require('../services/notificationQueue');
 const logger = require('../utils/logger');
 
 class SubscriptionCronJobs {
@@ -67,8 +68,10 @@ class SubscriptionCronJobs {
       cron.schedule('0 0 * * *', async () => {
         logger.info('⏰ Démarrage: Vérification essais expirés (00:00)');
         try {
+          const before = notificationQueue.getStats();
           const result = await this.subscriptionService.checkExpiredTrials();
           logger.info('✅ Vérification essais terminée', result);
+          await this.reportNotifications(before);
         } catch (error) {
           logger.error('❌ Erreur vérification essais:', error);
         }
@@ -182,6 +185,26 @@ class SubscriptionCronJobs {
     logger.info('✅ Cron jobs arrêtés');
   }
 
+  /**
+   * Attend l'enregistrement des notifications mises en file par un job et journalise
+   * combien ont réellement été enregistrées (les échecs ne sont pas comptés comme envoyés)
+   */
+  async reportNotifications(before) {
+    await notificationQueue.drain();
+    const after = notificationQueue.getStats();
+    const report = {
+      delivered: after.delivered - before.delivered,
+      failed: after.failed - before.failed
+    };
+
+    if (report.failed > 0) {
+      logger.error(`❌ ${report.failed} notifications non enregistrées`, { ...report, lastError: after.lastError });
+    } else {
+      logger.info('📨 Notifications enregistrées', report);
+    }
+    return report;
+  }
+
   /**
    * Exécuter manuellement un job spécifique (pour testing)
    */
@@ -191,9 +214,12 @@ class SubscriptionCronJobs {
 
       let result;
       switch (jobName) {
-        case 'checkExpiredTrials':
+        case 'checkExpiredTrials': {
+          const before = notificationQueue.getStats();
           result = await this.subscriptionService.checkExpiredTrials();
+          result.notifications = await this.reportNotifications(before);
           break;
+        }
         case 'checkExpiredSubscriptions':
           result = await this.subscriptionService.checkExpiredSubscriptions();
           break;
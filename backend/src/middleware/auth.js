@@ -170,7 +170,8 @@ const authenticate = async (req, res, next) => {
       '/api/auth/logout'         // Déconnexion
     ];
 
-    const isPaymentRoute = paymentWhitelist.some(route => req.path.startsWith(route));
+    // originalUrl: req.path est relatif au routeur /api et ne contient pas le préfixe
+    const isPaymentRoute = paymentWhitelist.some(route => req.originalUrl.startsWith(route));
 
     // Vérification de l'abonnement familial (sauf pour les routes de paiement)
     if (!isPaymentRoute && user.family && !isSubscriptionValid(user.family)) {
@@ -137,6 +137,12 @@ module.exports = (sequelize) => {
     publishedAt: {
       type: DataTypes.DATE,
       allowNull: true
+    },
+    externalKey: {
+      type: DataTypes.STRING,
+      allowNull: true,
+      unique: true,
+      comment: 'Clé stable fournie par l\'import en masse (upsert idempotent)'
     }
   }, {
     tableName: 'lessons',
@@ -3,7 +3,7 @@
  * Intégration MAVIANCE Smobil Pay - Claudyne
  */
 
-const { DataTypes } = require('sequelize');
+const { DataTypes, Op } = require('sequelize');
 
 module.exports = (sequelize) => {
   const Payment = sequelize.define('Payment', {
@@ -286,8 +286,20 @@ module.exports = (sequelize) => {
   };
 
   Payment.prototype.markAsCompleted = async function(externalId = null, providerData = {}) {
+    // Le webhook opérateur et le polling du statut peuvent confirmer le même
+    // paiement en parallèle: seul l'appel qui effectue la transition active l'abonnement
+    const completedAt = new Date();
+    const [claimed] = await Payment.update(
+      { status: 'completed', completedAt },
+      { where: { id: this.id, status: { [Op.ne]: 'completed' } }, hooks: false }
+    );
+    if (!claimed) {
+      await this.reload();
+      return;
+    }
+
     this.status = 'completed';
-    this.completedAt = new Date();
+    this.completedAt = completedAt;
     if (externalId) {
       this.externalTransactionId = externalId;
     }
@@ -95,6 +95,12 @@ module.exports = (sequelize) => {
     lastUpdatedBy: {
       type: DataTypes.STRING,
       allowNull: true
+    },
+    externalKey: {
+      type: DataTypes.STRING,
+      allowNull: true,
+      unique: true,
+      comment: 'Clé stable fournie par l\'import en masse (upsert idempotent)'
     }
   }, {
     tableName: 'subjects',
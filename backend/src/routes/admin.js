@@ -964,30 +964,78 @@ router.get('/analytics/basic', async (req, res) => {
   }
 });
 
+// Jeux de données exportables en flux (NDJSON / CSV)
+const EXPORT_DATASETS = {
+  students: {
+    model: 'Student',
+    attributes: [
+      'id', 'userId', 'familyId', 'firstName', 'lastName', 'educationLevel', 'schoolName',
+      'studentType', 'status', 'isActive', 'totalPoints', 'claudinePoints', 'createdAt', 'updatedAt'
+    ]
+  },
+  progress: {
+    model: 'Progress',
+    attributes: [
+      'id', 'studentId', 'lessonId', 'status', 'completionPercentage', 'timeSpent', 'attempts',
+      'lastScore', 'bestScore', 'averageScore', 'claudinePointsEarned',
+      'startedAt', 'completedAt', 'lastActivityAt', 'createdAt', 'updatedAt'
+    ],
+    dateField: 'updatedAt'
+  }
+};
+
 // Export des données analytics
+// format=json: tableau de bord agrégé
+// format=ndjson|csv: historique complet en flux (dataset=progress|students)
 router.get('/analytics/export', async (req, res) => {
   try {
-    const { AnalyticsService } = require('../services/analyticsService');
-    const { timeframe = '30d', region, format = 'json' } = req.query;
+    const { timeframe = '30d', region, format = 'json', dataset = 'progress', since } = req.query;
 
-    const analyticsService = new AnalyticsService(req.models);
-    const dashboard = await analyticsService.getAdvancedDashboard(timeframe, region);
+    if (format === 'ndjson' || format === 'csv') {
+      const config = EXPORT_DATASETS[dataset];
+      if (!config) {
+        return res.status(400).json({
+          success: false,
+          message: `Jeu de données inconnu: ${dataset} (${Object.keys(EXPORT_DATASETS).join(', ')})`
+        });
+      }
+
+      // Validé avant l'envoi des en-têtes: une date invalide ferait échouer le flux en cours
+      const sinceDate = since ? new Date(since) : null;
+      if (sinceDate && Number.isNaN(sinceDate.getTime())) {
+        return res.status(400).json({
+          success: false,
+          message: `Date invalide pour since: ${since} (format ISO 8601 attendu)`
+        });
+      }
 
-    if (format === 'csv') {
-      // Conversion en CSV pour export Excel
-      const csvData = this.convertToCsv(dashboard);
+      const { keysetPaginate, streamRows } = require('../services/exportService');
+      const where = {};
+      if (sinceDate && config.dateField) {
+        where[config.dateField] = { [Op.gte]: sinceDate };
+      }
 
-      res.setHeader('Content-Type', 'text/csv');
-      res.setHeader('Content-Disposition', `attachment; filename=claudyne-analytics-${timeframe}.csv`);
-      res.send(csvData);
-    } else {
-      res.setHeader('Content-Type', 'application/json');
-      res.setHeader('Content-Disposition', `attachment; filename=claudyne-analytics-${timeframe}.json`);
-      res.json(dashboard);
+      return streamRows(res, keysetPaginate(req.models[config.model], {
+        where,
+        attributes: config.attributes
+      }), {
+        format,
+        filename: `claudyne-${dataset}-${new Date().toISOString().slice(0, 10)}`,
+        columns: config.attributes
+      });
     }
 
+    const { AnalyticsService } = require('../services/analyticsService');
+    const analyticsService = new AnalyticsService(req.models);
+    const dashboard = await analyticsService.getAdvancedDashboard(timeframe, region);
+
+    res.setHeader('Content-Type', 'application/json');
+    res.setHeader('Content-Disposition', `attachment; filename=claudyne-analytics-${timeframe}.json`);
+    res.json(dashboard);
+
   } catch (error) {
     logger.error('Erreur export analytics:', error);
+    if (res.headersSent) return;
     res.status(500).json({
       success: false,
       message: 'Erreur lors de l\'export des analytics'
@@ -1252,19 +1300,45 @@ router.get('/prix-claudine', async (req, res) => {
   }
 });
 
-// Lancer l'évaluation mensuelle
+// Lancer l'évaluation mensuelle (en arrière-plan, progression sur GET)
+// Corps optionnel: { strategy: 'batch'|'per-student', award, resume, chunkSize, concurrency,
+// collectResults, wait }
 router.post('/prix-claudine/evaluate', async (req, res) => {
   try {
-    const { PrixClaudineService } = require('../services/prixClaudineService');
-    const prixService = new PrixClaudineService();
+    const batchEvaluator = require('../services/prixClaudineBatchEvaluator');
+    const { strategy, award, resume, chunkSize, concurrency, collectResults, wait } = req.body || {};
 
-    // Lancer l'évaluation mensuelle
-    const results = await prixService.runMonthlyEvaluation();
+    if (strategy && !batchEvaluator.STRATEGIES.includes(strategy)) {
+      return res.status(400).json({
+        success: false,
+        message: `Stratégie inconnue: ${strategy} (${batchEvaluator.STRATEGIES.join(', ')})`
+      });
+    }
 
-    res.json({
+    if (batchEvaluator.isRunning()) {
+      return res.status(409).json({
+        success: false,
+        message: 'Une évaluation Prix Claudine est déjà en cours',
+        data: batchEvaluator.getStatus()
+      });
+    }
+
+    const options = { strategy, award, resume, chunkSize, concurrency, collectResults };
+
+    if (wait === true) {
+      const job = await batchEvaluator.run(options);
+      return res.json({
+        success: true,
+        data: batchEvaluator.getStatus({ includeResults: true }),
+        message: `Évaluation terminée: ${job.prizesAwarded} prix attribués, ${job.prizesAlreadyAwarded} déjà attribués`
+      });
+    }
+
+    const status = batchEvaluator.start(options);
+    res.status(202).json({
       success: true,
-      data: results,
-      message: `Évaluation terminée: ${results.totalPrizesAwarded} prix attribués`
+      data: status,
+      message: 'Évaluation Prix Claudine démarrée'
     });
 
   } catch (error) {
@@ -1276,6 +1350,16 @@ router.post('/prix-claudine/evaluate', async (req, res) => {
   }
 });
 
+// Progression de l'évaluation en cours ou de la dernière évaluation
+router.get('/prix-claudine/evaluate', (req, res) => {
+  const batchEvaluator = require('../services/prixClaudineBatchEvaluator');
+
+  res.json({
+    success: true,
+    data: batchEvaluator.getStatus({ includeResults: req.query.includeResults === 'true' })
+  });
+});
+
 // Évaluer un étudiant spécifique
 router.post('/prix-claudine/student/:studentId/evaluate', async (req, res) => {
   try {
@@ -2673,9 +2757,25 @@ router.post('/subscriptions/run-job/:jobName', async (req, res) => {
     let result;
 
     switch (jobName) {
-      case 'checkExpiredTrials':
-        result = await subscriptionService.checkExpiredTrials();
+      case 'checkExpiredTrials': {
+        const notificationQueue = require('../services/notificationQueue');
+        const before = notificationQueue.getStats();
+
+        // mode: 'bulk' (défaut) ou 'row' (ancien traitement, comparaison)
+        result = await subscriptionService.checkExpiredTrials({
+          mode: req.body.mode,
+          batchSize: parseInt(req.body.batchSize) || undefined
+        });
+
+        // Notifications réellement enregistrées, pas seulement mises en file
+        await notificationQueue.drain();
+        const after = notificationQueue.getStats();
+        result.notifications = {
+          delivered: after.delivered - before.delivered,
+          failed: after.failed - before.failed
+        };
         break;
+      }
 
       case 'checkExpiredSubscriptions':
         result = await subscriptionService.checkExpiredSubscriptions();
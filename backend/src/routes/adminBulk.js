@@ -0,0 +1,802 @@
+/**
+ * Routes admin d'import en masse - Claudyne Backend
+ * Inscription d'élèves par classes entières pour l'onboarding des établissements
+ * et import idempotent du contenu pédagogique (subjects / lessons)
+ */
+
+const express = require('express');
+const router = express.Router();
+const { Op } = require('sequelize');
+const { v4: uuidv4 } = require('uuid');
+const { body, validationResult } = require('express-validator');
+const logger = require('../utils/logger');
+const passwordHashPool = require('../services/passwordHashPool');
+
+// Nombre maximum de lignes par requête et par transaction
+const MAX_ROWS_PER_REQUEST = parseInt(process.env.BULK_REGISTER_MAX_ROWS) || 500;
+const INSERT_BATCH_SIZE = parseInt(process.env.BULK_INSERT_BATCH_SIZE) || 100;
+const MAX_CONTENT_RECORDS = parseInt(process.env.BULK_CONTENT_MAX_RECORDS) || 2000;
+
+const EDUCATION_LEVELS = [
+  'MATERNELLE_PETITE', 'MATERNELLE_MOYENNE', 'MATERNELLE_GRANDE',
+  'SIL', 'CP', 'CE1', 'CE2', 'CM1', 'CM2',
+  '6EME', '5EME', '4EME', '3EME',
+  'SECONDE', 'PREMIERE', 'TERMINALE',
+  'SUPERIEUR',
+  'ADULTE_DEBUTANT', 'ADULTE_INTERMEDIAIRE', 'ADULTE_AVANCE'
+];
+
+// Mapping niveaux JSON -> PostgreSQL (identique à contentManagement-postgres.js)
+const LEVEL_MAPPING = {
+  'cp': 'CP', 'ce1': 'CE1', 'ce2': 'CE2', 'cm1': 'CM1', 'cm2': 'CM2',
+  '6eme': '6ème', '5eme': '5ème', '4eme': '4ème', '3eme': '3ème',
+  '2nde': '2nde', '1ere': '1ère', 'terminale': 'Tle'
+};
+
+// Mapping matières JSON -> catégories PostgreSQL
+const SUBJECT_MAPPING = {
+  'mathematiques': 'Mathématiques',
+  'physique': 'Sciences',
+  'chimie': 'Sciences',
+  'svt': 'Sciences',
+  'francais': 'Français',
+  'anglais': 'Langues',
+  'espagnol': 'Langues',
+  'allemand': 'Langues',
+  'histoire': 'Histoire-Géographie',
+  'geographie': 'Histoire-Géographie',
+  'philosophie': 'Français',
+  'informatique': 'Informatique',
+  'eps': 'Sport',
+  'arts': 'Arts'
+};
+
+const ICONS = {
+  'Mathématiques': '📐',
+  'Sciences': '🔬',
+  'Français': '📚',
+  'Langues': '🌍',
+  'Histoire-Géographie': '🗺️',
+  'Informatique': '💻',
+  'Sport': '⚽',
+  'Arts': '🎨'
+};
+
+const COLORS = {
+  'Mathématiques': '#3B82F6',
+  'Sciences': '#10B981',
+  'Français': '#F59E0B',
+  'Langues': '#8B5CF6',
+  'Histoire-Géographie': '#EF4444',
+  'Informatique': '#06B6D4',
+  'Sport': '#84CC16',
+  'Arts': '#EC4899'
+};
+
+const LESSON_TYPES = ['video', 'interactive', 'reading', 'exercise', 'lab', 'quiz'];
+const DIFFICULTIES = ['Débutant', 'Intermédiaire', 'Avancé'];
+const REVIEW_STATUSES = ['draft', 'pending_review', 'approved', 'rejected', 'needs_revision'];
+const SUBJECT_DIFFICULTIES = ['Débutant', 'Intermédiaire', 'Avancé', 'Expert'];
+const HEX_COLOR = /^#([A-Fa-f0-9]{6}|[A-Fa-f0-9]{3})$/;
+// Erreurs de données: rejouer le même lot échouerait de la même façon
+const DATA_ERRORS = [
+  'AggregateError', 'SequelizeBulkRecordError', 'SequelizeValidationError',
+  'SequelizeUniqueConstraintError', 'SequelizeForeignKeyConstraintError'
+];
+
+// Colonnes mises à jour lors d'un upsert (ON CONFLICT ("externalKey"))
+const SUBJECT_UPSERT_FIELDS = [
+  'title', 'description', 'level', 'category', 'icon', 'color', 'difficulty',
+  'estimatedDuration', 'isActive', 'isPremium', 'order', 'lastUpdatedBy', 'updatedAt', 'deletedAt'
+];
+const LESSON_UPSERT_FIELDS = [
+  'subjectId', 'title', 'description', 'content', 'type', 'difficulty', 'estimatedDuration',
+  'objectives', 'prerequisites', 'order', 'isActive', 'isPremium', 'isFree', 'reviewStatus',
+  'updatedAt', 'deletedAt'
+];
+
+// Middleware pour initialiser les modèles
+router.use(async (req, res, next) => {
+  if (!req.models) {
+    const database = require('../config/database');
+    req.models = database.initializeModels();
+  }
+  next();
+});
+
+/**
+ * Normalisation identique au hook beforeValidate du modèle User,
+ * pour détecter les doublons avant l'insertion
+ */
+function normalizePhone(phone) {
+  if (!phone) return null;
+  let normalized = phone.replace(/\s+/g, '');
+  if (!normalized.startsWith('+') && !normalized.startsWith('237')) {
+    normalized = '+237' + normalized;
+  }
+  return normalized;
+}
+
+function chunk(items, size) {
+  const chunks = [];
+  for (let i = 0; i < items.length; i += size) {
+    chunks.push(items.slice(i, i + size));
+  }
+  return chunks;
+}
+
+// ===============================
+// INSCRIPTION D'ÉLÈVES EN MASSE
+// ===============================
+
+/**
+ * POST /api/admin/bulk/students/register
+ * Inscrit un lot d'élèves (formule individuelle, essai 7 jours) en une requête.
+ * Retourne un résultat par ligne: created, exists, invalid ou failed.
+ */
+router.post('/students/register', [
+  body('students')
+    .isArray({ min: 1, max: MAX_ROWS_PER_REQUEST })
+    .withMessage(`Le lot doit contenir entre 1 et ${MAX_ROWS_PER_REQUEST} élèves`),
+  body('students.*.email')
+    .if((value) => value && value.trim() !== '')
+    .isEmail()
+    .normalizeEmail()
+    .withMessage('Format email invalide'),
+  body('students.*.phone')
+    .if((value) => value && value.trim() !== '')
+    .matches(/^\+?[1-9]\d{6,14}$/)
+    .withMessage('Format téléphone E.164 invalide (ex: +237695000000)'),
+  body('students.*.firstName')
+    .trim()
+    .isLength({ min: 2, max: 50 })
+    .withMessage('Le prénom doit contenir entre 2 et 50 caractères'),
+  body('students.*.lastName')
+    .trim()
+    .isLength({ min: 2, max: 50 })
+    .withMessage('Le nom doit contenir entre 2 et 50 caractères'),
+  body('students.*.password')
+    .isLength({ min: 8, max: 100 })
+    .withMessage('Le mot de passe doit contenir entre 8 et 100 caractères')
+    .matches(/^(?=.*[a-z])(?=.*[A-Z])(?=.*\d)/)
+    .withMessage('Le mot de passe doit contenir au moins une minuscule, une majuscule et un chiffre'),
+  body('students.*.educationLevel')
+    .isIn(EDUCATION_LEVELS)
+    .withMessage('Niveau scolaire invalide'),
+  body('students.*.dateOfBirth')
+    .optional({ checkFalsy: true })
+    .isISO8601()
+    .withMessage('Date de naissance invalide (format AAAA-MM-JJ)')
+], async (req, res) => {
+  const startedAt = Date.now();
+
+  try {
+    const { User, Family, Student } = req.models;
+
+    // Erreurs globales (lot absent ou trop grand) vs erreurs par ligne
+    const errors = validationResult(req).array();
+    const globalErrors = errors.filter(error => error.path === 'students');
+    if (globalErrors.length > 0) {
+      return res.status(400).json({
+        success: false,
+        message: globalErrors[0].msg,
+        errors: globalErrors
+      });
+    }
+
+    const { students, schoolName, city, region } = req.body;
+    const results = students.map((student, index) => ({
+      index,
+      externalRef: student.externalRef || null,
+      status: 'pending'
+    }));
+
+    for (const error of errors) {
+      const match = /^students\[(\d+)\]\.(\w+)$/.exec(error.path);
+      if (!match) continue;
+      const result = results[parseInt(match[1])];
+      result.status = 'invalid';
+      result.errors = result.errors || [];
+      result.errors.push({ field: match[2], message: error.msg });
+    }
+
+    // Doublons dans le lot et en base
+    const seen = new Set();
+    const candidates = [];
+    students.forEach((student, index) => {
+      const result = results[index];
+      if (result.status !== 'pending') return;
+
+      student.phone = normalizePhone(student.phone);
+      student.email = student.email ? student.email.toLowerCase().trim() : null;
+      if (!student.email && !student.phone) {
+        result.status = 'invalid';
+        result.errors = [{ field: 'email', message: 'Email ou numéro de téléphone requis' }];
+        return;
+      }
+
+      const keys = [student.email, student.phone].filter(Boolean);
+      if (keys.some(key => seen.has(key))) {
+        result.status = 'invalid';
+        result.errors = [{ field: 'email', message: 'Doublon dans le lot' }];
+        return;
+      }
+      keys.forEach(key => seen.add(key));
+      candidates.push(index);
+    });
+
+    if (candidates.length > 0) {
+      const emails = candidates.map(i => students[i].email).filter(Boolean);
+      const phones = candidates.map(i => students[i].phone).filter(Boolean);
+      const existingUsers = await User.findAll({
+        attributes: ['id', 'email', 'phone'],
+        where: {
+          [Op.or]: [
+            emails.length ? { email: { [Op.in]: emails } } : null,
+            phones.length ? { phone: { [Op.in]: phones } } : null
+          ].filter(Boolean)
+        }
+      });
+
+      const existingByKey = new Map();
+      for (const user of existingUsers) {
+        if (user.email) existingByKey.set(user.email, user.id);
+        if (user.phone) existingByKey.set(user.phone, user.id);
+      }
+
+      for (let i = candidates.length - 1; i >= 0; i--) {
+        const student = students[candidates[i]];
+        const existingId = existingByKey.get(student.email) || existingByKey.get(student.phone);
+        if (existingId) {
+          Object.assign(results[candidates[i]], { status: 'exists', userId: existingId });
+          candidates.splice(i, 1);
+        }
+      }
+    }
+
+    // Hachage parallèle sur le pool de workers
+    const hashes = await passwordHashPool.hashMany(candidates.map(i => students[i].password));
+    const hashByIndex = new Map(candidates.map((index, i) => [index, hashes[i]]));
+
+    // Insertion par transactions groupées
+    const trialEndsAt = new Date(Date.now() + 7 * 24 * 60 * 60 * 1000); // 7 jours d'essai
+    let batches = 0;
+
+    for (const batch of chunk(candidates, INSERT_BATCH_SIZE)) {
+      const transaction = await User.sequelize.transaction();
+      batches++;
+
+      try {
+        const families = await Family.bulkCreate(batch.map(index => {
+          const student = students[index];
+          const virtualFamilyName = `Famille ${student.firstName} ${student.lastName}`;
+          return {
+            name: virtualFamilyName,
+            displayName: virtualFamilyName,
+            city: student.city || city || 'Autre',
+            region: student.region || region || 'Centre',
+            subscriptionType: 'INDIVIDUAL',
+            subscriptionStatus: 'TRIAL',
+            trialEndsAt,
+            maxStudents: 1,
+            currentMembersCount: 1,
+            monthlyPrice: 8000.00,
+            status: 'ACTIVE',
+            language: 'fr',
+            timezone: 'Africa/Douala'
+          };
+        }), { transaction, validate: true });
+
+        // Mot de passe déjà haché: pas de hook beforeSave (individualHooks désactivés)
+        const users = await User.bulkCreate(batch.map((index, i) => {
+          const student = students[index];
+          return {
+            email: student.email,
+            phone: student.phone,
+            password: hashByIndex.get(index),
+            firstName: student.firstName,
+            lastName: student.lastName,
+            role: 'STUDENT',
+            userType: 'INDIVIDUAL',
+            familyId: families[i].id,
+            isVerified: false,
+            language: 'fr',
+            timezone: 'Africa/Douala',
+            subscriptionStatus: 'TRIAL',
+            subscriptionPlan: 'INDIVIDUAL_STUDENT',
+            trialEndsAt,
+            monthlyPrice: 8000.00,
+            autoRenew: true
+          };
+        }), { transaction, validate: true });
+
+        const profiles = await Student.bulkCreate(batch.map((index, i) => {
+          const student = students[index];
+          return {
+            familyId: families[i].id,
+            userId: users[i].id,
+            firstName: users[i].firstName,
+            lastName: users[i].lastName,
+            dateOfBirth: student.dateOfBirth || new Date('2010-01-01'),
+            educationLevel: student.educationLevel,
+            schoolName: student.schoolName || schoolName || null,
+            studentType: 'CHILD',
+            status: 'ACTIVE',
+            isActive: true,
+            currentLevel: 1,
+            totalPoints: 0,
+            claudinePoints: 0
+          };
+        }), { transaction, validate: true });
+
+        await transaction.commit();
+
+        batch.forEach((index, i) => {
+          Object.assign(results[index], {
+            status: 'created',
+            userId: users[i].id,
+            studentId: profiles[i].id,
+            familyId: families[i].id
+          });
+        });
+      } catch (error) {
+        await transaction.rollback();
+        logger.error('Erreur insertion lot inscription en masse:', {
+          error: error.message,
+          rows: batch.length
+        });
+        batch.forEach(index => {
+          Object.assign(results[index], {
+            status: 'failed',
+            errors: [{ message: process.env.NODE_ENV === 'development' ? error.message : 'Erreur insertion' }]
+          });
+        });
+      }
+    }
+
+    const summary = results.reduce((acc, result) => {
+      acc[result.status] = (acc[result.status] || 0) + 1;
+      return acc;
+    }, { total: results.length });
+    summary.batches = batches;
+    summary.durationMs = Date.now() - startedAt;
+
+    logger.info('Inscription en masse terminée', {
+      adminId: req.user?.id,
+      schoolName,
+      ...summary
+    });
+
+    res.json({
+      success: true,
+      message: `${summary.created || 0} élèves inscrits sur ${summary.total}`,
+      data: {
+        summary,
+        results
+      }
+    });
+
+  } catch (error) {
+    logger.error('Erreur inscription en masse:', error);
+    res.status(500).json({
+      success: false,
+      message: 'Erreur lors de l\'inscription en masse',
+      error: process.env.NODE_ENV === 'development' ? error.message : undefined
+    });
+  }
+});
+
+// ===============================
+// IMPORT DE CONTENU EN MASSE (NDJSON)
+// ===============================
+
+const SUBJECT_LEVELS = Object.values(LEVEL_MAPPING);
+const SUBJECT_CATEGORIES = Object.keys(ICONS);
+
+function resolveLevel(level) {
+  if (!level) return null;
+  const mapped = LEVEL_MAPPING[String(level).toLowerCase()] || level;
+  return SUBJECT_LEVELS.includes(mapped) ? mapped : null;
+}
+
+function resolveCategory(record) {
+  if (record.category && SUBJECT_CATEGORIES.includes(record.category)) return record.category;
+  const subject = record.subject || record.category;
+  return subject ? SUBJECT_MAPPING[String(subject).toLowerCase()] || null : null;
+}
+
+/**
+ * Normalise le contenu d'une leçon (même structure que POST /admin/courses)
+ */
+function buildLessonContent(content) {
+  if (typeof content === 'string') {
+    return { transcript: content, keyPoints: [], exercises: [], resources: [], downloadableFiles: [], videoUrl: null };
+  }
+  content = content || {};
+  return {
+    transcript: content.transcript || null,
+    keyPoints: content.keyPoints || [],
+    exercises: content.exercises || [],
+    resources: content.resources || [],
+    downloadableFiles: content.downloadableFiles || [],
+    videoUrl: content.videoUrl || null
+  };
+}
+
+/**
+ * Parse le corps de la requête: NDJSON (une entrée par ligne) ou JSON { records: [...] }
+ */
+function parseRecords(req) {
+  if (typeof req.body === 'string') {
+    const records = [];
+    req.body.split('\n').forEach((line, i) => {
+      if (!line.trim()) return;
+      try {
+        records.push({ line: i + 1, record: JSON.parse(line) });
+      } catch (error) {
+        records.push({ line: i + 1, error: 'JSON invalide' });
+      }
+    });
+    return records;
+  }
+  const list = Array.isArray(req.body?.records) ? req.body.records : [];
+  return list.map((record, i) => ({ line: i + 1, record }));
+}
+
+/**
+ * Clés dérivées par l'export (subject-<id>, lesson-<id>) pour le contenu créé hors import:
+ * la ligne existante adopte la clé avant l'upsert, au lieu d'être dupliquée
+ */
+async function adoptDerivedKeys(Model, prefix, keys, transaction) {
+  const pattern = new RegExp(`^${prefix}-(.+)$`);
+  const ids = [...new Set(keys)].map(key => pattern.exec(key)?.[1]).filter(Boolean);
+  if (ids.length === 0) return;
+
+  await Model.sequelize.query(
+    `UPDATE "${Model.getTableName()}" SET "externalKey" = :prefix || CAST(id AS TEXT)
+     WHERE "externalKey" IS NULL AND CAST(id AS TEXT) IN (:ids)`,
+    { replacements: { prefix: `${prefix}-`, ids }, transaction }
+  );
+}
+
+function validateRecord(record) {
+  if (!record || typeof record !== 'object') return 'Entrée invalide';
+  if (!['subject', 'lesson'].includes(record.type)) return 'type doit être "subject" ou "lesson"';
+  if (!record.externalKey || String(record.externalKey).length > 255) return 'externalKey requis (255 caractères max)';
+  if (!record.title || record.title.length < 2) return 'title requis (2 caractères min)';
+
+  if (record.type === 'subject') {
+    if (record.title.length > 100) return 'title: 100 caractères max';
+    if (!resolveLevel(record.level)) return `Niveau invalide: ${record.level}`;
+    if (!resolveCategory(record)) return `Matière invalide: ${record.subject || record.category}`;
+    if (record.difficulty && !SUBJECT_DIFFICULTIES.includes(record.difficulty)) return `difficulty invalide: ${record.difficulty}`;
+    if (record.color && !HEX_COLOR.test(record.color)) return `color invalide (format #RRGGBB): ${record.color}`;
+    return null;
+  }
+
+  if (record.title.length > 200) return 'title: 200 caractères max';
+  if (!record.subjectKey && !(resolveLevel(record.level) && resolveCategory(record))) {
+    return 'subjectKey ou subject + level requis';
+  }
+  if (record.lessonType && !LESSON_TYPES.includes(record.lessonType)) return `lessonType invalide: ${record.lessonType}`;
+  if (record.difficulty && !DIFFICULTIES.includes(record.difficulty)) return `difficulty invalide: ${record.difficulty}`;
+  if (record.reviewStatus && !REVIEW_STATUSES.includes(record.reviewStatus)) return `reviewStatus invalide: ${record.reviewStatus}`;
+  return null;
+}
+
+/**
+ * POST /api/admin/bulk/content/import
+ * Upsert idempotent de subjects et lessons par externalKey, un lot = une transaction.
+ *
+ * Corps NDJSON (Content-Type: application/x-ndjson), une entrée par ligne:
+ *   {"type":"subject","externalKey":"math-6eme","title":"Mathématiques 6ème","subject":"mathematiques","level":"6eme"}
+ *   {"type":"lesson","externalKey":"math-6eme-c1-l1","subjectKey":"math-6eme","title":"...","content":{...}}
+ * Une leçon peut aussi référencer sa matière par subject + level (créée si absente).
+ * Les clés subject-<id> / lesson-<id> de l'export NDJSON désignent les lignes existantes.
+ * Le type pédagogique d'une leçon (video, reading...) est passé dans lessonType.
+ */
+router.post('/content/import',
+  express.text({ type: ['application/x-ndjson', 'application/ndjson'], limit: '20mb' }),
+  async (req, res) => {
+    const startedAt = Date.now();
+
+    try {
+      const { Subject, Lesson } = req.models;
+      const entries = parseRecords(req);
+
+      if (entries.length === 0 || entries.length > MAX_CONTENT_RECORDS) {
+        return res.status(400).json({
+          success: false,
+          message: `Le lot doit contenir entre 1 et ${MAX_CONTENT_RECORDS} entrées`
+        });
+      }
+
+      const results = entries.map(({ line, record, error }) => ({
+        line,
+        type: record?.type || null,
+        externalKey: record?.externalKey || null,
+        status: error ? 'invalid' : 'pending',
+        error
+      }));
+
+      // Validation et dédoublonnage (la dernière occurrence d'une clé l'emporte)
+      const lastIndexByKey = new Map();
+      entries.forEach(({ record }, i) => {
+        if (results[i].status !== 'pending') return;
+        const error = validateRecord(record);
+        if (error) {
+          Object.assign(results[i], { status: 'invalid', error });
+          return;
+        }
+        const key = `${record.type}:${record.externalKey}`;
+        if (lastIndexByKey.has(key)) {
+          Object.assign(results[lastIndexByKey.get(key)], { status: 'skipped', error: 'Remplacée par une entrée ultérieure' });
+        }
+        lastIndexByKey.set(key, i);
+      });
+
+      const subjectIndexes = [];
+      const lessonIndexes = [];
+      results.forEach((result, i) => {
+        if (result.status !== 'pending') return;
+        (result.type === 'subject' ? subjectIndexes : lessonIndexes).push(i);
+      });
+
+      const now = new Date();
+      const transaction = await Subject.sequelize.transaction();
+
+      try {
+        // 0. Contenu exporté depuis cette base avant d'avoir une externalKey
+        await adoptDerivedKeys(Subject, 'subject', [
+          ...subjectIndexes.map(i => entries[i].record.externalKey),
+          ...lessonIndexes.map(i => entries[i].record.subjectKey).filter(Boolean)
+        ], transaction);
+        await adoptDerivedKeys(Lesson, 'lesson', lessonIndexes.map(i => entries[i].record.externalKey), transaction);
+
+        // 1. Subjects
+        if (subjectIndexes.length > 0) {
+          const keys = subjectIndexes.map(i => entries[i].record.externalKey);
+          const existing = new Set((await Subject.findAll({
+            attributes: ['externalKey'],
+            where: { externalKey: { [Op.in]: keys } },
+            paranoid: false,
+            transaction
+          })).map(subject => subject.externalKey));
+
+          await Subject.bulkCreate(subjectIndexes.map(i => {
+            const record = entries[i].record;
+            const category = resolveCategory(record);
+            return {
+              id: uuidv4(),
+              externalKey: record.externalKey,
+              title: record.title,
+              description: record.description || '',
+              level: resolveLevel(record.level),
+              category,
+              icon: record.icon || ICONS[category] || '📚',
+              color: record.color || COLORS[category] || '#3B82F6',
+              difficulty: record.difficulty || 'Intermédiaire',
+              estimatedDuration: parseInt(record.estimatedDuration || record.duration) || 45,
+              isActive: record.isActive !== false,
+              isPremium: record.isPremium === true,
+              order: parseInt(record.order) || 0,
+              lastUpdatedBy: req.user?.email || null,
+              updatedAt: now,
+              deletedAt: null
+            };
+          }), {
+            transaction,
+            validate: true,
+            conflictAttributes: ['externalKey'],
+            updateOnDuplicate: SUBJECT_UPSERT_FIELDS
+          });
+
+          subjectIndexes.forEach(i => {
+            results[i].status = existing.has(entries[i].record.externalKey) ? 'updated' : 'created';
+          });
+        }
+
+        // 2. Résolution des matières référencées par les leçons
+        const subjectKeys = [...new Set(lessonIndexes
+          .map(i => entries[i].record.subjectKey)
+          .filter(Boolean))];
+        const subjectIdByKey = new Map();
+
+        if (subjectKeys.length > 0) {
+          const subjects = await Subject.findAll({
+            attributes: ['id', 'externalKey'],
+            where: { externalKey: { [Op.in]: subjectKeys } },
+            transaction
+          });
+          subjects.forEach(subject => subjectIdByKey.set(subject.externalKey, subject.id));
+        }
+
+        // Matières référencées par subject + level (comme POST /admin/courses)
+        const pairs = new Map();
+        lessonIndexes.forEach(i => {
+          const record = entries[i].record;
+          if (record.subjectKey) return;
+          const level = resolveLevel(record.level);
+          const category = resolveCategory(record);
+          pairs.set(`${category}|${level}`, { level, category });
+        });
+
+        if (pairs.size > 0) {
+          const pairList = [...pairs.values()];
+          const found = await Subject.findAll({
+            attributes: ['id', 'level', 'category', 'createdAt'],
+            where: { [Op.or]: pairList.map(({ level, category }) => ({ level, category })) },
+            order: [['createdAt', 'ASC']],
+            transaction
+          });
+          const pairIds = new Map();
+          found.forEach(subject => {
+            const key = `${subject.category}|${subject.level}`;
+            if (!pairIds.has(key)) pairIds.set(key, subject.id);
+          });
+
+          const missing = pairList.filter(({ level, category }) => !pairIds.has(`${category}|${level}`));
+          if (missing.length > 0) {
+            // Clé déterministe pour que deux lots concurrents créent la même matière
+            const autoKeys = missing.map(({ level, category }) => `auto:${category}:${level}`);
+            await Subject.bulkCreate(missing.map(({ level, category }, i) => ({
+              id: uuidv4(),
+              externalKey: autoKeys[i],
+              title: `${category} ${level}`,
+              description: '',
+              level,
+              category,
+              icon: ICONS[category] || '📚',
+              color: COLORS[category] || '#3B82F6',
+              difficulty: 'Intermédiaire',
+              isActive: true,
+              isPremium: false,
+              order: 0,
+              prerequisites: [],
+              cameroonCurriculum: { officialCode: null, ministerialRef: null, competencies: [] }
+            })), { transaction, ignoreDuplicates: true });
+
+            const created = await Subject.findAll({
+              attributes: ['id', 'externalKey'],
+              where: { externalKey: { [Op.in]: autoKeys } },
+              transaction
+            });
+            created.forEach(subject => {
+              const [, category, level] = subject.externalKey.split(':');
+              pairIds.set(`${category}|${level}`, subject.id);
+            });
+          }
+
+          lessonIndexes.forEach(i => {
+            const record = entries[i].record;
+            if (record.subjectKey) return;
+            record.subjectId = pairIds.get(`${resolveCategory(record)}|${resolveLevel(record.level)}`);
+          });
+        }
+
+        const lessonsToWrite = [];
+        lessonIndexes.forEach(i => {
+          const record = entries[i].record;
+          if (record.subjectKey) {
+            record.subjectId = subjectIdByKey.get(record.subjectKey);
+          }
+          if (!record.subjectId) {
+            Object.assign(results[i], { status: 'invalid', error: `Matière introuvable: ${record.subjectKey}` });
+            return;
+          }
+          lessonsToWrite.push(i);
+        });
+
+        // 3. Lessons
+        if (lessonsToWrite.length > 0) {
+          const keys = lessonsToWrite.map(i => entries[i].record.externalKey);
+          const existingLessons = await Lesson.findAll({
+            attributes: ['externalKey', 'order'],
+            where: { externalKey: { [Op.in]: keys } },
+            paranoid: false,
+            transaction
+          });
+          const existingOrder = new Map(existingLessons.map(lesson => [lesson.externalKey, lesson.order]));
+
+          // Ordre suivant par matière en une seule requête groupée
+          const subjectIds = [...new Set(lessonsToWrite.map(i => entries[i].record.subjectId))];
+          const maxOrders = await Lesson.findAll({
+            attributes: ['subjectId', [Lesson.sequelize.fn('MAX', Lesson.sequelize.col('order')), 'maxOrder']],
+            where: { subjectId: { [Op.in]: subjectIds } },
+            group: ['subjectId'],
+            raw: true,
+            transaction
+          });
+          const nextOrder = new Map(maxOrders.map(row => [row.subjectId, (parseInt(row.maxOrder) || 0) + 1]));
+
+          await Lesson.bulkCreate(lessonsToWrite.map(i => {
+            const record = entries[i].record;
+            let order = parseInt(record.order);
+            if (isNaN(order)) {
+              if (existingOrder.has(record.externalKey)) {
+                order = existingOrder.get(record.externalKey);
+              } else {
+                order = nextOrder.get(record.subjectId) || 1;
+                nextOrder.set(record.subjectId, order + 1);
+              }
+            }
+
+            return {
+              externalKey: record.externalKey,
+              subjectId: record.subjectId,
+              title: record.title,
+              description: record.description || '',
+              content: buildLessonContent(record.content),
+              type: record.lessonType || 'reading',
+              difficulty: record.difficulty || 'Débutant',
+              estimatedDuration: parseInt(record.estimatedDuration || record.duration) || 45,
+              objectives: record.objectives || [],
+              prerequisites: record.prerequisites || [],
+              hasQuiz: Boolean(record.quiz),
+              quiz: record.quiz || null,
+              order,
+              isActive: record.isActive !== false,
+              isPremium: record.isPremium === true,
+              isFree: record.isFree === true,
+              reviewStatus: record.reviewStatus || 'approved',
+              createdBy: req.user?.email || null,
+              updatedAt: now,
+              deletedAt: null
+            };
+          }), {
+            transaction,
+            validate: true,
+            conflictAttributes: ['externalKey'],
+            updateOnDuplicate: [...LESSON_UPSERT_FIELDS, 'hasQuiz', 'quiz']
+          });
+
+          lessonsToWrite.forEach(i => {
+            results[i].status = existingOrder.has(entries[i].record.externalKey) ? 'updated' : 'created';
+          });
+        }
+
+        await transaction.commit();
+      } catch (error) {
+        await transaction.rollback();
+        throw error;
+      }
+
+      const summary = results.reduce((acc, result) => {
+        acc[result.status] = (acc[result.status] || 0) + 1;
+        return acc;
+      }, { total: results.length });
+      summary.durationMs = Date.now() - startedAt;
+
+      logger.info('Import de contenu en masse', { adminId: req.user?.id, ...summary });
+
+      res.json({
+        success: true,
+        message: `${(summary.created || 0) + (summary.updated || 0)} entrées importées sur ${summary.total}`,
+        data: {
+          summary,
+          // Seules les entrées en erreur sont détaillées pour garder la réponse compacte
+          results: results.filter(result => !['created', 'updated'].includes(result.status))
+        }
+      });
+
+    } catch (error) {
+      logger.error('Erreur import de contenu en masse:', error);
+
+      // Lot rejeté par la base (contrainte, validation): erreur client, à ne pas réessayer
+      if (DATA_ERRORS.includes(error.name)) {
+        return res.status(422).json({
+          success: false,
+          message: 'Lot rejeté: une entrée ne respecte pas le schéma du contenu',
+          error: error.errors ? error.errors.map(e => e.message).slice(0, 10) : error.message
+        });
+      }
+
+      res.status(500).json({
+        success: false,
+        message: 'Erreur lors de l\'import du contenu',
+        error: process.env.NODE_ENV === 'development' ? error.message : undefined
+      });
+    }
+  });
+
+module.exports = router;
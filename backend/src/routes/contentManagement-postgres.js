@@ -68,6 +68,7 @@ const COLORS = {
 
 // ===============================
 // GET /content - Vue d'ensemble
+// GET /content?format=ndjson - Export complet en flux (subjects puis lessons)
 // ===============================
 router.get('/content', async (req, res) => {
   try {
@@ -78,6 +79,67 @@ router.get('/content', async (req, res) => {
 
     const { Subject, Lesson, Resource } = req.models;
 
+    if (req.query.format === 'ndjson') {
+      const { keysetPaginate, streamRows, concat } = require('../services/exportService');
+
+      // Format de POST /admin/bulk/content/import: l'export se réimporte tel quel.
+      // Un contenu créé hors import n'a pas d'externalKey: une clé stable est dérivée de son id,
+      // que l'import fait adopter par la ligne existante (pas de doublon à la réimportation).
+      const subjectKeys = new Map();
+      const subjectKey = (id, externalKey) => externalKey || `subject-${id}`;
+
+      const subjects = (async function* () {
+        for await (const row of keysetPaginate(Subject)) {
+          const key = subjectKey(row.id, row.externalKey);
+          subjectKeys.set(row.id, key);
+          yield {
+            type: 'subject',
+            externalKey: key,
+            title: row.title,
+            category: row.category,
+            level: row.level,
+            description: row.description,
+            icon: row.icon,
+            color: row.color,
+            difficulty: row.difficulty,
+            estimatedDuration: row.estimatedDuration,
+            isActive: row.isActive,
+            isPremium: row.isPremium,
+            order: row.order
+          };
+        }
+      })();
+
+      const lessons = (async function* () {
+        for await (const row of keysetPaginate(Lesson)) {
+          yield {
+            type: 'lesson',
+            externalKey: row.externalKey || `lesson-${row.id}`,
+            subjectKey: subjectKeys.get(row.subjectId) || subjectKey(row.subjectId, null),
+            title: row.title,
+            description: row.description,
+            content: row.content,
+            lessonType: row.type,
+            difficulty: row.difficulty,
+            estimatedDuration: row.estimatedDuration,
+            objectives: row.objectives,
+            prerequisites: row.prerequisites,
+            quiz: row.quiz,
+            order: row.order,
+            isActive: row.isActive,
+            isPremium: row.isPremium,
+            isFree: row.isFree,
+            reviewStatus: row.reviewStatus || undefined
+          };
+        }
+      })();
+
+      return streamRows(res, concat(subjects, lessons), {
+        format: 'ndjson',
+        filename: `claudyne-content-${new Date().toISOString().slice(0, 10)}`
+      });
+    }
+
     // Compter les Subjects actifs
     const totalSubjects = await Subject.count({ where: { isActive: true } });
 
@@ -146,6 +208,7 @@ router.get('/content', async (req, res) => {
 
   } catch (error) {
     logger.error('Erreur GET /content:', error);
+    if (res.headersSent) return;
     res.status(500).json({
       success: false,
       message: 'Erreur lors du chargement du contenu',
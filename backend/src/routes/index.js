@@ -34,6 +34,8 @@ const paymentTicketRoutes = require('./paymentTickets');
 const adminPaymentTicketRoutes = require('./adminPaymentTickets');
 const migrateTempRoutes = require('./migrate-temp');
 const chaptersRoutes = require('./chapters');
+const adminBulkRoutes = require('./adminBulk');
+const paymentWebhookRoutes = require('./paymentWebhooks');
 
 // Middleware d'authentification
 const { authenticate, authorize } = require('../middleware/auth');
@@ -284,6 +286,9 @@ router.post('/admin/generate-token', async (req, res) => {
     }
 });
 
+// Callbacks des opérateurs Mobile Money (appelés sans token utilisateur)
+router.use('/payments/webhook', paymentWebhookRoutes);
+
 // Middleware d'authentification pour toutes les autres routes
 router.use(authenticate);
 
@@ -311,6 +316,7 @@ router.use('/community', communityRoutes);
 
 // Routes administrateur (nécessite rôle ADMIN ou MODERATOR)
 // IMPORTANT: contentManagementRoutes AVANT adminRoutes pour prioriser les routes /content JSON
+router.use('/admin/bulk', authorize(['ADMIN']), adminBulkRoutes);
 router.use('/admin', authorize(['ADMIN', 'MODERATOR']), contentManagementRoutes);
 router.use('/admin', authorize(['ADMIN', 'MODERATOR']), adminRoutes);
 router.use('/admin/payment-tickets', adminPaymentTicketRoutes);
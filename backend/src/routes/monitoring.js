@@ -3,10 +3,17 @@ const fs = require('fs').promises;
 const { exec } = require('child_process');
 const util = require('util');
 const execAsync = util.promisify(exec);
+const v8 = require('v8');
+const { monitorEventLoopDelay, performance } = require('perf_hooks');
 const { validateAdminToken } = require('../middleware/adminTokenAuth');
 
 const router = express.Router();
 
+// Mesure continue du retard de la boucle d'événements (réinitialisée à chaque lecture)
+const eventLoopDelay = monitorEventLoopDelay({ resolution: 20 });
+eventLoopDelay.enable();
+let lastEventLoopUtilization = performance.eventLoopUtilization();
+
 // =============================================================================
 // SYSTEM HEALTH ENDPOINT
 // =============================================================================
@@ -68,6 +75,24 @@ router.get('/system/metrics', validateAdminToken, async (req, res) => {
     }
 });
 
+// =============================================================================
+// PROCESS METRICS ENDPOINT (mémoire, boucle d'événements, handles, pool BDD)
+// =============================================================================
+router.get('/process/metrics', validateAdminToken, async (req, res) => {
+    try {
+        res.json({
+            success: true,
+            data: getProcessMetrics()
+        });
+    } catch (error) {
+        console.error('Erreur métriques processus:', error);
+        res.json({
+            success: false,
+            message: error.message
+        });
+    }
+});
+
 // =============================================================================
 // SYSTEM LOGS ENDPOINT
 // =============================================================================
@@ -112,6 +137,62 @@ router.get('/system/backups', validateAdminToken, async (req, res) => {
 // HELPER FUNCTIONS
 // =============================================================================
 
+function getProcessMetrics() {
+    const ms = (nanoseconds) => Math.round(nanoseconds / 1e4) / 100;
+    const memory = process.memoryUsage();
+    const heap = v8.getHeapStatistics();
+
+    // Handles ouverts par type (sockets, timers, fichiers...)
+    const handles = {};
+    for (const type of process.getActiveResourcesInfo()) {
+        handles[type] = (handles[type] || 0) + 1;
+    }
+
+    const utilization = performance.eventLoopUtilization(lastEventLoopUtilization);
+    lastEventLoopUtilization = performance.eventLoopUtilization();
+
+    const eventLoop = {
+        meanMs: ms(eventLoopDelay.mean),
+        p50Ms: ms(eventLoopDelay.percentile(50)),
+        p99Ms: ms(eventLoopDelay.percentile(99)),
+        maxMs: ms(eventLoopDelay.max),
+        utilization: Math.round(utilization.utilization * 1000) / 1000
+    };
+    eventLoopDelay.reset();
+
+    const { getDatabaseStats } = require('../config/database');
+    const { getSocketStats } = require('../websockets/socketHandler');
+    const cacheService = require('../services/cacheService');
+    const progressWriteBuffer = require('../services/progressWriteBuffer');
+    const notificationQueue = require('../services/notificationQueue');
+
+    return {
+        timestamp: new Date().toISOString(),
+        pid: process.pid,
+        uptimeSeconds: Math.round(process.uptime()),
+        memory: {
+            rss: memory.rss,
+            heapUsed: memory.heapUsed,
+            heapTotal: memory.heapTotal,
+            external: memory.external,
+            arrayBuffers: memory.arrayBuffers,
+            heapSizeLimit: heap.heap_size_limit,
+            nativeContexts: heap.number_of_native_contexts,
+            detachedContexts: heap.number_of_detached_contexts
+        },
+        eventLoop,
+        handles: {
+            total: Object.values(handles).reduce((sum, count) => sum + count, 0),
+            byType: handles
+        },
+        database: getDatabaseStats(),
+        sockets: getSocketStats(),
+        cache: cacheService.getStats(),
+        progressBuffer: progressWriteBuffer.getStats(),
+        notifications: notificationQueue.getStats()
+    };
+}
+
 async function getSystemHealth() {
     try {
         // CPU Usage (Linux)
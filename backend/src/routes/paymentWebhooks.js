@@ -0,0 +1,83 @@
+/**
+ * Callbacks des opérateurs Mobile Money - Claudyne Backend
+ * Routes publiques (les opérateurs n'ont pas de token Claudyne).
+ * Le contenu du callback n'est pas considéré comme fiable: il sert uniquement à
+ * déclencher une vérification du statut auprès de l'opérateur.
+ */
+
+const express = require('express');
+const router = express.Router();
+const { Op } = require('sequelize');
+const logger = require('../utils/logger');
+const { syncPaymentStatus } = require('../services/paymentSyncService');
+
+// Import des modèles
+router.use(async (req, res, next) => {
+  if (!req.models) {
+    const database = require('../config/database');
+    req.models = database.initializeModels();
+  }
+  next();
+});
+
+/**
+ * Retrouve le paiement par notre transactionId (externalId MTN / order_id Orange)
+ * ou, à défaut, par la référence opérateur enregistrée à l'initialisation
+ */
+async function findPayment(Payment, transactionId, providerReference) {
+  const conditions = [];
+  if (transactionId) conditions.push({ transactionId });
+  if (providerReference) conditions.push({ externalTransactionId: providerReference });
+  if (conditions.length === 0) return null;
+
+  return Payment.findOne({ where: { [Op.or]: conditions } });
+}
+
+async function handleCallback(req, res, provider, transactionId, providerReference) {
+  const startedAt = Date.now();
+
+  try {
+    const { Payment } = req.models;
+    const payment = await findPayment(Payment, transactionId, providerReference);
+
+    if (!payment) {
+      logger.warn(`Callback ${provider} pour un paiement inconnu:`, { transactionId, providerReference });
+      return res.status(404).json({ success: false, message: 'Payment not found' });
+    }
+
+    const status = await syncPaymentStatus(payment, `callback:${provider}`);
+
+    logger.info(`📩 Callback ${provider} traité`, {
+      transactionId: payment.transactionId,
+      status,
+      durationMs: Date.now() - startedAt
+    });
+
+    res.json({ success: true, message: `Callback ${provider} traité`, data: { status } });
+
+  } catch (error) {
+    logger.error(`Erreur callback ${provider}:`, error);
+    // 500 pour que l'opérateur renvoie le callback plus tard
+    res.status(500).json({ success: false, message: 'Webhook processing failed' });
+  }
+}
+
+// ===============================
+// CALLBACK MTN MOBILE MONEY
+// ===============================
+
+router.post('/mtn', (req, res) => {
+  const { externalId, referenceId } = req.body || {};
+  return handleCallback(req, res, 'mtn', externalId, referenceId || req.get('X-Reference-Id'));
+});
+
+// ===============================
+// CALLBACK ORANGE MONEY
+// ===============================
+
+router.post('/orange', (req, res) => {
+  const { order_id: orderId, txnid, transaction_id: transactionId } = req.body || {};
+  return handleCallback(req, res, 'orange', orderId, txnid || transactionId);
+});
+
+module.exports = router;
@@ -10,12 +10,7 @@ const logger = require('../utils/logger');
 
 // Import des services de paiement
 const mavianceService = require('../services/mavianceService');
-const { MtnMobileMoneyService } = require('../services/mtnMobileMoney');
-const { OrangeMoneyService } = require('../services/orangeMoneyService');
-
-// Initialiser les services
-const mtnService = new MtnMobileMoneyService();
-const orangeService = new OrangeMoneyService();
+const { mtnService, orangeService, syncPaymentStatus } = require('../services/paymentSyncService');
 
 // Import des modèles
 router.use(async (req, res, next) => {
@@ -328,6 +323,9 @@ router.post('/initialize', async (req, res) => {
 
           if (mtnDirectResponse && mtnDirectResponse.success) {
             providerResponse = mtnDirectResponse;
+            // Référence MTN nécessaire au polling du statut et au rapprochement des callbacks
+            payment.externalTransactionId = mtnDirectResponse.mtnReferenceId;
+            payment.providerResponse = { provider: 'mtn_direct', initiation: mtnDirectResponse };
             await payment.markAsProcessing();
             message = `Demande de paiement MTN envoyée au ${phone}. Composez *126# pour confirmer.`;
             nextStep = 'confirm_mobile_payment';
@@ -371,6 +369,8 @@ router.post('/initialize', async (req, res) => {
 
           if (orangeDirectResponse && orangeDirectResponse.success) {
             providerResponse = orangeDirectResponse;
+            payment.externalTransactionId = orangeDirectResponse.transactionId;
+            payment.providerResponse = { provider: 'orange_direct', initiation: orangeDirectResponse };
             await payment.markAsProcessing();
             message = `Lien de paiement Orange Money généré. Cliquez sur le lien ou composez #150*4*4#`;
             nextStep = 'confirm_mobile_payment';
@@ -499,22 +499,10 @@ router.get('/:transactionId/status', async (req, res) => {
       });
     }
 
-    // Si le paiement est en cours, vérifier avec le provider
+    // Si le paiement est en cours, vérifier avec le provider qui l'a initié
     if (payment.status === 'processing' && payment.paymentMethod !== 'wallet') {
       try {
-        let providerStatus;
-
-        if (payment.paymentMethod === 'mtn_momo') {
-          providerStatus = await mavianceService.checkMtnPaymentStatus(payment.transactionId);
-        } else if (payment.paymentMethod === 'orange_money') {
-          providerStatus = await mavianceService.checkOrangePaymentStatus(payment.transactionId);
-        }
-
-        if (providerStatus && providerStatus.status === 'completed') {
-          await payment.markAsCompleted(providerStatus.externalId, providerStatus);
-        } else if (providerStatus && providerStatus.status === 'failed') {
-          await payment.markAsFailed(providerStatus.message, providerStatus);
-        }
+        await syncPaymentStatus(payment, 'polling');
       } catch (error) {
         logger.error('Erreur vérification statut provider:', error);
       }
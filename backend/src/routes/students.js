@@ -6,6 +6,7 @@
 const express = require('express');
 const router = express.Router();
 const logger = require('../utils/logger');
+const progressWriteBuffer = require('../services/progressWriteBuffer');
 
 router.use(async (req, res, next) => {
   if (!req.models) {
@@ -744,6 +745,9 @@ router.get('/subjects', async (req, res) => {
       });
     }
 
+    // Lire ses propres écritures: les progrès encore dans le tampon WebSocket sont écrits d'abord
+    await progressWriteBuffer.flushStudent(student.id);
+
     // Mapping niveau Student -> niveau Subject
     const LEVEL_MAPPING = {
       'MATERNELLE_PETITE': 'Maternelle',
@@ -0,0 +1,170 @@
+/**
+ * Jeu de données de banc d'essai pour l'évaluation Prix Claudine
+ * Crée une famille dédiée avec N élèves, leurs progrès sur les leçons existantes et des
+ * participations aux battles existantes (scores, statuts et dates reproductibles via --seed).
+ * Utilisé par scripts/test/benchmark-prix-claudine.py.
+ *
+ * Usage:
+ *   node backend/src/scripts/seed-prix-claudine-bench.js --students 2000 --progress 40 --seed 42
+ *   node backend/src/scripts/seed-prix-claudine-bench.js --cleanup
+ */
+
+// Load environment variables
+require('dotenv').config({ path: __dirname + '/../../../.env' });
+
+const { Op } = require('sequelize');
+const database = require('../config/database');
+
+const BENCH_FAMILY_NAME = 'Banc Prix Claudine';
+const EDUCATION_LEVELS = ['6EME', '5EME', '4EME', '3EME', 'SECONDE', 'PREMIERE', 'TERMINALE'];
+const STATUSES = ['completed', 'completed', 'mastered', 'in_progress', 'needs_review'];
+const INSERT_BATCH = 1000;
+
+function parseArgs(argv) {
+  const args = { students: 1000, progress: 30, battles: 5, seed: 42, cleanup: false };
+  for (let i = 0; i < argv.length; i++) {
+    const name = argv[i].replace(/^--/, '');
+    if (name === 'cleanup') {
+      args.cleanup = true;
+    } else if (name in args) {
+      args[name] = parseInt(argv[++i], 10);
+    }
+  }
+  return args;
+}
+
+// Générateur pseudo-aléatoire déterministe (mulberry32)
+function createRandom(seed) {
+  let state = seed >>> 0;
+  return () => {
+    state = (state + 0x6D2B79F5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+function sample(random, items, count) {
+  const pool = [...items];
+  for (let i = pool.length - 1; i > 0; i--) {
+    const j = Math.floor(random() * (i + 1));
+    [pool[i], pool[j]] = [pool[j], pool[i]];
+  }
+  return pool.slice(0, count);
+}
+
+async function insertInBatches(model, rows) {
+  for (let i = 0; i < rows.length; i += INSERT_BATCH) {
+    await model.bulkCreate(rows.slice(i, i + INSERT_BATCH));
+  }
+}
+
+async function cleanup(models) {
+  const { Family, Student, Progress, BattleParticipation } = models;
+  const family = await Family.findOne({ where: { name: BENCH_FAMILY_NAME }, paranoid: false });
+  if (!family) {
+    console.log('ℹ️  Aucun jeu de données de banc d\'essai');
+    return;
+  }
+
+  const students = await Student.findAll({ where: { familyId: family.id }, attributes: ['id'], paranoid: false });
+  const studentIds = students.map(student => student.id);
+
+  await Progress.destroy({ where: { studentId: { [Op.in]: studentIds } } });
+  await BattleParticipation.destroy({ where: { studentId: { [Op.in]: studentIds } } });
+  await Student.destroy({ where: { familyId: family.id }, force: true });
+  await family.destroy({ force: true });
+
+  console.log(`🧹 ${studentIds.length} élèves de banc d'essai supprimés`);
+}
+
+async function seed(models, args) {
+  const { Family, Student, Lesson, Progress, Battle, BattleParticipation } = models;
+  const random = createRandom(args.seed);
+
+  const lessons = await Lesson.findAll({ attributes: ['id'], order: [['id', 'ASC']] });
+  if (lessons.length === 0) {
+    throw new Error('Aucune leçon en base: importez d\'abord le contenu');
+  }
+  const battles = await Battle.findAll({ attributes: ['id'], order: [['id', 'ASC']] });
+
+  const [family] = await Family.findOrCreate({
+    where: { name: BENCH_FAMILY_NAME },
+    defaults: { name: BENCH_FAMILY_NAME }
+  });
+
+  const existing = await Student.count({ where: { familyId: family.id } });
+  const students = [];
+  for (let i = 0; i < args.students; i++) {
+    students.push({
+      firstName: 'Banc',
+      lastName: `Élève ${existing + i + 1}`,
+      dateOfBirth: '2010-01-01',
+      educationLevel: EDUCATION_LEVELS[Math.floor(random() * EDUCATION_LEVELS.length)],
+      studentType: 'CHILD',
+      familyId: family.id
+    });
+  }
+  const created = [];
+  for (let i = 0; i < students.length; i += INSERT_BATCH) {
+    created.push(...await Student.bulkCreate(students.slice(i, i + INSERT_BATCH)));
+  }
+
+  const now = Date.now();
+  const progressRows = [];
+  const participationRows = [];
+  for (const student of created) {
+    const lessonCount = Math.min(lessons.length, Math.floor(random() * args.progress * 2));
+    for (const lesson of sample(random, lessons, lessonCount)) {
+      const status = STATUSES[Math.floor(random() * STATUSES.length)];
+      const createdAt = new Date(now - Math.floor(random() * 90 * 24 * 60 * 60 * 1000));
+      progressRows.push({
+        studentId: student.id,
+        lessonId: lesson.id,
+        status,
+        completionPercentage: status === 'in_progress' ? Math.floor(random() * 100) : 100,
+        lastScore: random() < 0.1 ? null : Math.round(random() * 1000) / 10,
+        createdAt,
+        updatedAt: createdAt,
+        lastActivityAt: createdAt
+      });
+    }
+
+    const battleCount = Math.min(battles.length, Math.floor(random() * args.battles * 2));
+    for (const battle of sample(random, battles, battleCount)) {
+      participationRows.push({
+        battleId: battle.id,
+        studentId: student.id,
+        score: Math.floor(random() * 1000),
+        rank: 1 + Math.floor(random() * 10)
+      });
+    }
+  }
+
+  await insertInBatches(Progress, progressRows);
+  await insertInBatches(BattleParticipation, participationRows);
+
+  console.log(`🌱 ${created.length} élèves, ${progressRows.length} progrès, ${participationRows.length} participations ` +
+    `(${lessons.length} leçons, ${battles.length} battles disponibles)`);
+}
+
+async function main() {
+  const args = parseArgs(process.argv.slice(2));
+
+  try {
+    const models = database.initializeModels();
+    if (args.cleanup) {
+      await cleanup(models);
+    } else {
+      await seed(models, args);
+    }
+    await models.sequelize.close();
+    process.exit(0);
+  } catch (error) {
+    console.error('❌ Erreur banc d\'essai Prix Claudine:', error);
+    process.exit(1);
+  }
+}
+
+main();
@@ -0,0 +1,174 @@
+/**
+ * Cohortes d'essais gratuits pour le banc d'essai de l'expiration des essais
+ * Crée N comptes (emails @trial-bench.claudyne.test) répartis sur tous les plans, y compris
+ * NONE et sans plan, avec des essais expirés, en cours, désactivés ou déjà convertis
+ * (répartition reproductible via --seed). Utilisé par scripts/test/trial-expiry-harness.py.
+ *
+ * Usage:
+ *   node backend/src/scripts/seed-trial-cohorts.js --users 100000 --seed 42
+ *   node backend/src/scripts/seed-trial-cohorts.js --dump      (état des comptes en JSON)
+ *   node backend/src/scripts/seed-trial-cohorts.js --cleanup
+ */
+
+// Load environment variables
+require('dotenv').config({ path: __dirname + '/../../../.env' });
+
+const bcrypt = require('bcryptjs');
+const { Op } = require('sequelize');
+const database = require('../config/database');
+
+const BENCH_EMAIL_DOMAIN = 'trial-bench.claudyne.test';
+const INSERT_BATCH = 1000;
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+// Plan -> rôle et type de compte cohérents
+const PLANS = [
+  { plan: 'INDIVIDUAL_STUDENT', role: 'STUDENT', userType: 'INDIVIDUAL' },
+  { plan: 'INDIVIDUAL_TEACHER', role: 'TEACHER', userType: 'INDIVIDUAL' },
+  { plan: 'FAMILY_MANAGER', role: 'PARENT', userType: 'MANAGER' },
+  { plan: 'NONE', role: 'PARENT', userType: 'MANAGER' },
+  { plan: null, role: 'PARENT', userType: 'MANAGER' }
+];
+
+// Cohortes pondérées: la majorité des comptes est à expirer
+const COHORTS = [
+  { name: 'trial_expired', weight: 6, status: 'TRIAL', isActive: true, trialOffsetDays: [-60, -1] },
+  { name: 'trial_running', weight: 2, status: 'TRIAL', isActive: true, trialOffsetDays: [1, 30] },
+  { name: 'trial_expired_inactive', weight: 1, status: 'TRIAL', isActive: false, trialOffsetDays: [-60, -1] },
+  { name: 'active', weight: 1, status: 'ACTIVE', isActive: true, trialOffsetDays: [-90, -10] }
+];
+const TOTAL_WEIGHT = COHORTS.reduce((sum, cohort) => sum + cohort.weight, 0);
+
+function parseArgs(argv) {
+  const args = { users: 1000, seed: 42, cleanup: false, dump: false };
+  for (let i = 0; i < argv.length; i++) {
+    const name = argv[i].replace(/^--/, '');
+    if (name === 'cleanup' || name === 'dump') {
+      args[name] = true;
+    } else if (name in args) {
+      args[name] = parseInt(argv[++i], 10);
+    }
+  }
+  return args;
+}
+
+// Générateur pseudo-aléatoire déterministe (mulberry32)
+function createRandom(seed) {
+  let state = seed >>> 0;
+  return () => {
+    state = (state + 0x6D2B79F5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+function pickCohort(random) {
+  let roll = random() * TOTAL_WEIGHT;
+  for (const cohort of COHORTS) {
+    roll -= cohort.weight;
+    if (roll < 0) return cohort;
+  }
+  return COHORTS[COHORTS.length - 1];
+}
+
+function benchWhere() {
+  return { email: { [Op.like]: `%@${BENCH_EMAIL_DOMAIN}` } };
+}
+
+async function cleanup(models) {
+  const { User, Notification } = models;
+  const users = await User.findAll({ where: benchWhere(), attributes: ['id'], paranoid: false, raw: true });
+  const userIds = users.map(user => user.id);
+
+  for (let i = 0; i < userIds.length; i += INSERT_BATCH) {
+    const ids = userIds.slice(i, i + INSERT_BATCH);
+    await Notification.destroy({ where: { userId: { [Op.in]: ids } } });
+    await User.destroy({ where: { id: { [Op.in]: ids } }, force: true });
+  }
+
+  console.log(`🧹 ${userIds.length} comptes d'essai de banc d'essai supprimés`);
+}
+
+async function dump(models) {
+  const { User } = models;
+  const users = await User.findAll({
+    where: benchWhere(),
+    attributes: ['email', 'subscriptionStatus', 'subscriptionPlan', 'isActive'],
+    order: [['email', 'ASC']],
+    raw: true
+  });
+  // Dernière ligne de la sortie: la configuration peut journaliser avant
+  process.stdout.write(`\n${JSON.stringify(users)}\n`);
+}
+
+async function seed(models, args) {
+  const { User } = models;
+  const random = createRandom(args.seed);
+
+  // Les hooks ne passent pas par bulkCreate: un seul hachage pour tous les comptes
+  const password = await bcrypt.hash('TrialBench2024!', 4);
+  const existing = await User.count({ where: benchWhere(), paranoid: false });
+  const now = Date.now();
+
+  const counts = {};
+  let rows = [];
+  for (let i = 0; i < args.users; i++) {
+    const { plan, role, userType } = PLANS[Math.floor(random() * PLANS.length)];
+    const cohort = pickCohort(random);
+    const [minDays, maxDays] = cohort.trialOffsetDays;
+    const offsetDays = minDays + random() * (maxDays - minDays);
+
+    rows.push({
+      email: `trial-${existing + i + 1}@${BENCH_EMAIL_DOMAIN}`,
+      password,
+      firstName: 'Banc',
+      lastName: `Essai ${existing + i + 1}`,
+      role,
+      userType,
+      isActive: cohort.isActive,
+      subscriptionStatus: cohort.status,
+      subscriptionPlan: plan,
+      trialEndsAt: new Date(now + offsetDays * DAY_MS)
+    });
+
+    const key = `${cohort.name}/${plan || 'null'}`;
+    counts[key] = (counts[key] || 0) + 1;
+
+    if (rows.length === INSERT_BATCH) {
+      await User.bulkCreate(rows);
+      rows = [];
+    }
+  }
+  if (rows.length > 0) {
+    await User.bulkCreate(rows);
+  }
+
+  console.log(`🌱 ${args.users} comptes d'essai créés`);
+  for (const key of Object.keys(counts).sort()) {
+    console.log(`   ${key}: ${counts[key]}`);
+  }
+}
+
+async function main() {
+  const args = parseArgs(process.argv.slice(2));
+
+  try {
+    const models = database.initializeModels();
+    if (args.cleanup) {
+      await cleanup(models);
+    } else if (args.dump) {
+      await dump(models);
+    } else {
+      await seed(models, args);
+    }
+    await models.sequelize.close();
+    process.exit(0);
+  } catch (error) {
+    console.error('❌ Erreur cohortes d\'essai:', error);
+    process.exit(1);
+  }
+}
+
+main();
@@ -3,6 +3,9 @@
  * La force du savoir en héritage
  */
 
+// Profilage du démarrage (STARTUP_PROFILE=true) - doit précéder tous les autres requires
+const startupProfiler = require('./utils/startupProfiler');
+
 // Load environment variables from root
 const dotenv = require('dotenv');
 const path = require('path');
@@ -20,6 +23,7 @@ if (fs.existsSync(path.join(__dirname, '../../.env.production'))) {
 
 // Then load .env as fallback (for development)
 dotenv.config({ path: path.join(__dirname, '../../.env'), override: false });
+startupProfiler.mark('env');
 
 const express = require('express');
 const cors = require('cors');
@@ -30,16 +34,20 @@ const rateLimit = require('express-rate-limit');
 const slowDown = require('express-slow-down');
 const http = require('http');
 const socketIo = require('socket.io');
+startupProfiler.mark('requires:dependencies');
 
 // Import des modules internes
 const logger = require('./utils/logger');
 const { sequelize, testConnection } = require('./config/database');
 const cacheService = require('./services/cacheService');
+const progressWriteBuffer = require('./services/progressWriteBuffer');
+const notificationQueue = require('./services/notificationQueue');
 const routes = require('./routes');
 const interfaceRoutes = require("./routes/interfaces");
 const { configureSocket } = require('./websockets/socketHandler');
 const { errorHandler, notFoundHandler } = require('./middleware/errorHandlers');
 const { authenticate } = require('./middleware/auth');
+startupProfiler.mark('requires:internal');
 
 const app = express();
 const server = http.createServer(app);
@@ -104,7 +112,10 @@ app.use(helmet({
   crossOriginEmbedderPolicy: false
 }));
 
-app.use(compression());
+app.use(compression({
+  // Les exports en flux (NDJSON) sont aussi compressés si le client accepte gzip
+  filter: (req, res) => /ndjson/.test(res.getHeader('Content-Type') || '') || compression.filter(req, res)
+}));
 app.use(cors(corsOptions));
 
 // Logging des requêtes
@@ -144,6 +155,7 @@ app.use(express.urlencoded({ extended: true, limit: '10mb' }));
 // Fichiers statiques
 app.use('/uploads', express.static('public/uploads'));
 app.use('/parent-interface', express.static(path.join(__dirname, '../../parent-interface')));
+startupProfiler.mark('middleware');
 
 // Health check endpoint
 app.get('/health', async (req, res) => {
@@ -297,15 +309,17 @@ app.get('/api/docs', (req, res) => {
 // Middleware de gestion des erreurs
 app.use(notFoundHandler);
 app.use(errorHandler);
+startupProfiler.mark('routes');
 
 // Initialisation de Socket.IO pour les fonctionnalités temps réel
 configureSocket(io);
+startupProfiler.mark('socket.io');
 
 // Fonction de démarrage du serveur
 async function startServer() {
   try {
     // Test de connexion à la base de données
-    const isConnected = await testConnection();
+    const isConnected = await startupProfiler.measure('database:connect', testConnection);
     if (isConnected) {
       logger.info('✅ Connexion à PostgreSQL établie avec succès');
 
@@ -313,15 +327,15 @@ async function startServer() {
       // En développement: force: false (préserve les données)
       // En production: only sync in development to avoid schema conflicts
       if (process.env.NODE_ENV === 'development') {
-        await sequelize.sync({ force: false });
+        await startupProfiler.measure('database:sync', () => sequelize.sync({ force: false }));
         logger.info('✅ Modèles de base de données synchronisés');
       } else {
         // En production, ajouter manuellement la colonne dialCode si elle n'existe pas
         try {
-          await sequelize.query(`
+          await startupProfiler.measure('database:dialCode', () => sequelize.query(`
             ALTER TABLE "users"
             ADD COLUMN IF NOT EXISTS "dialCode" VARCHAR(10);
-          `);
+          `));
           logger.info('✅ Colonne dialCode ajoutée (si nécessaire)');
         } catch (error) {
           // La colonne existe probablement déjà, ce n'est pas grave
@@ -333,8 +347,13 @@ async function startServer() {
     }
 
     const PORT = process.env.PORT || 3001;
-    
+    startupProfiler.mark('database');
+
     server.listen(PORT, () => {
+      startupProfiler.listening();
+      // PM2 (wait_ready): l'ancienne instance n'est arrêtée qu'une fois celle-ci prête
+      if (process.send) process.send('ready');
+
       logger.info(`🚀 Serveur Claudyne démarré sur le port ${PORT}`);
       logger.info(`🌍 Environnement: ${process.env.NODE_ENV}`);
       logger.info(`📚 Mode développement: ${process.env.NODE_ENV === 'development'}`);
@@ -359,7 +378,21 @@ process.on('SIGINT', gracefulShutdown);
 
 async function gracefulShutdown(signal) {
   logger.info(`🛑 Signal ${signal} reçu. Arrêt gracieux en cours...`);
-  
+
+  // Les progrès fusionnés en mémoire sont écrits avant tout le reste: les sockets
+  // ouverts peuvent retarder server.close indéfiniment
+  try {
+    await progressWriteBuffer.close();
+  } catch (error) {
+    logger.error('Erreur lors de l\'écriture des progrès en attente:', error);
+  }
+
+  try {
+    await notificationQueue.drain();
+  } catch (error) {
+    logger.error('Erreur lors de l\'enregistrement des notifications en attente:', error);
+  }
+
   server.close(async (err) => {
     if (err) {
       logger.error('Erreur lors de l\'arrêt du serveur HTTP:', err);
@@ -4,6 +4,7 @@
  */
 
 const logger = require('../utils/logger');
+const startupProfiler = require('../utils/startupProfiler');
 
 class CacheService {
   constructor() {
@@ -32,7 +33,7 @@ class CacheService {
         db: process.env.REDIS_DB || 0
       });
 
-      await this.redisClient.connect();
+      await startupProfiler.measure('redis:connect', () => this.redisClient.connect());
       logger.info('✅ Connexion Redis établie');
     } catch (error) {
       logger.error('❌ Erreur connexion Redis:', error);
@@ -5,6 +5,7 @@
 
 const nodemailer = require('nodemailer');
 const logger = require('../../utils/logger');
+const startupProfiler = require('../../utils/startupProfiler');
 
 class EmailService {
     constructor() {
@@ -19,6 +20,7 @@ class EmailService {
             return;
         }
 
+        const endProfile = startupProfiler.start('smtp:createTransport');
         try {
             this.transporter = nodemailer.createTransport({
                 host: process.env.SMTP_HOST,
@@ -34,6 +36,7 @@ class EmailService {
         } catch (error) {
             logger.error('❌ Erreur configuration email:', error);
         }
+        endProfile();
     }
 
     async sendWelcomeEmail(user) {
@@ -0,0 +1,149 @@
+/**
+ * Service d'export en flux Claudyne
+ * Lecture par pagination keyset et écriture des lignes au fil de l'eau (NDJSON / CSV)
+ * pour garder une mémoire constante quel que soit le volume exporté
+ */
+
+const { Op } = require('sequelize');
+const logger = require('../utils/logger');
+
+const DEFAULT_BATCH_SIZE = parseInt(process.env.EXPORT_BATCH_SIZE) || 1000;
+
+/**
+ * Parcourt une table par pages successives "WHERE id > dernierId ORDER BY id"
+ * (pas d'OFFSET: chaque page coûte le même prix, même en fin de table)
+ */
+async function* keysetPaginate(Model, { where = {}, attributes, batchSize = DEFAULT_BATCH_SIZE, paranoid = true } = {}) {
+  let lastId = null;
+
+  while (true) {
+    const pageWhere = lastId === null
+      ? where
+      : { [Op.and]: [where, { id: { [Op.gt]: lastId } }] };
+
+    const rows = await Model.findAll({
+      where: pageWhere,
+      attributes,
+      order: [['id', 'ASC']],
+      limit: batchSize,
+      paranoid,
+      raw: true
+    });
+
+    if (rows.length === 0) return;
+
+    for (const row of rows) {
+      yield row;
+    }
+
+    if (rows.length < batchSize) return;
+    lastId = rows[rows.length - 1].id;
+  }
+}
+
+function escapeCsv(value) {
+  if (value === null || value === undefined) return '';
+  if (value instanceof Date) return value.toISOString();
+  if (typeof value === 'object') value = JSON.stringify(value);
+  const text = String(value);
+  return /[",\n\r;]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+}
+
+/**
+ * Écrit un morceau en respectant la contre-pression du socket
+ */
+function write(res, chunk) {
+  if (res.write(chunk)) return Promise.resolve();
+  return new Promise((resolve, reject) => {
+    const onDrain = () => { cleanup(); resolve(); };
+    const onClose = () => { cleanup(); reject(new Error('Client déconnecté')); };
+    const cleanup = () => {
+      res.off('drain', onDrain);
+      res.off('close', onClose);
+    };
+    res.on('drain', onDrain);
+    res.on('close', onClose);
+  });
+}
+
+/**
+ * Envoie en flux les lignes produites par un itérateur asynchrone.
+ *
+ * @param {Response} res - réponse Express
+ * @param {AsyncIterable} rows - lignes à exporter
+ * @param {Object} options - { format: 'ndjson' | 'csv', filename, columns, transform }
+ */
+async function streamRows(res, rows, { format = 'ndjson', filename = 'export', columns, transform } = {}) {
+  const isCsv = format === 'csv';
+  const startedAt = Date.now();
+  let count = 0;
+  let aborted = false;
+
+  res.on('close', () => {
+    if (!res.writableEnded) aborted = true;
+  });
+
+  res.status(200);
+  res.setHeader('Content-Type', isCsv ? 'text/csv; charset=utf-8' : 'application/x-ndjson; charset=utf-8');
+  res.setHeader('Content-Disposition', `attachment; filename=${filename}.${isCsv ? 'csv' : 'ndjson'}`);
+  res.setHeader('Cache-Control', 'no-cache, no-store, must-revalidate');
+  // Désactive le buffering nginx pour que les lignes partent immédiatement
+  res.setHeader('X-Accel-Buffering', 'no');
+
+  try {
+    let header = columns;
+    let buffer = '';
+
+    for await (const raw of rows) {
+      if (aborted) break;
+      const row = transform ? transform(raw) : raw;
+
+      if (isCsv) {
+        if (!header) header = Object.keys(row);
+        if (count === 0) buffer += '\uFEFF' + header.join(';') + '\n';
+        buffer += header.map(column => escapeCsv(row[column])).join(';') + '\n';
+      } else {
+        buffer += JSON.stringify(row) + '\n';
+      }
+      count++;
+
+      // Regroupe les petites lignes pour limiter le nombre d'appels write()
+      if (buffer.length >= 64 * 1024) {
+        await write(res, buffer);
+        buffer = '';
+        if (typeof res.flush === 'function') res.flush();
+      }
+    }
+
+    if (isCsv && count === 0 && header) buffer += '\uFEFF' + header.join(';') + '\n';
+    if (buffer && !aborted) await write(res, buffer);
+    res.end();
+
+    logger.info(`📤 Export ${filename} (${format}) terminé`, {
+      rows: count,
+      durationMs: Date.now() - startedAt,
+      aborted
+    });
+  } catch (error) {
+    logger.error(`Erreur export ${filename}:`, error);
+    // Les en-têtes sont déjà partis: on coupe le flux pour signaler l'erreur au client
+    res.destroy(error);
+  }
+
+  return count;
+}
+
+/**
+ * Concatène plusieurs itérateurs asynchrones
+ */
+async function* concat(...iterables) {
+  for (const iterable of iterables) {
+    yield* iterable;
+  }
+}
+
+module.exports = {
+  keysetPaginate,
+  streamRows,
+  concat
+};
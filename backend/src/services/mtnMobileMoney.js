@@ -40,6 +40,7 @@ class MtnMobileMoneyService {
     // Token d'accès
     this.accessToken = null;
     this.tokenExpiry = null;
+    this.tokenRequest = null;
 
     // Validation de la configuration
     if (!this.subscriptionKey || !this.apiUserId || !this.apiKey) {
@@ -70,11 +71,15 @@ class MtnMobileMoneyService {
         }
 
         if (!this.accessToken || this.isTokenExpired()) {
-          await this.getAccessToken();
+          await this.refreshAccessToken();
         }
 
         config.headers.Authorization = `Bearer ${this.accessToken}`;
-        config.headers['X-Reference-Id'] = uuidv4();
+        // Conserver la référence fournie par l'appelant (requestToPay, transfer):
+        // c'est elle que MTN utilise pour le statut et le callback
+        if (!config.headers['X-Reference-Id']) {
+          config.headers['X-Reference-Id'] = uuidv4();
+        }
 
         logger.info('Requête MTN MoMo:', {
           method: config.method,
@@ -139,6 +144,20 @@ class MtnMobileMoneyService {
     }
   }
 
+  /**
+   * Renouvelle le token une seule fois pour toutes les requêtes concurrentes
+   * (sans cela, un pic de paiements déclenche autant d'appels /token que de
+   * requêtes en vol et atteint la limite de débit de l'opérateur)
+   */
+  refreshAccessToken() {
+    if (!this.tokenRequest) {
+      this.tokenRequest = this.getAccessToken().finally(() => {
+        this.tokenRequest = null;
+      });
+    }
+    return this.tokenRequest;
+  }
+
   isTokenExpired() {
     return !this.tokenExpiry || Date.now() >= (this.tokenExpiry - 60000); // 1 min de marge
   }
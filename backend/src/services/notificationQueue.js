@@ -0,0 +1,92 @@
+/**
+ * File d'attente des notifications in-app Claudyne
+ * Les traitements de masse (expiration des essais...) y déposent leurs notifications au lieu
+ * de les créer une par une: un worker asynchrone les enregistre par lots (bulkCreate) sans
+ * ralentir le traitement qui les a produites.
+ *
+ * - NOTIFICATION_QUEUE_BATCH: notifications par insertion (défaut 500)
+ */
+
+const logger = require('../utils/logger');
+
+class NotificationQueue {
+  constructor() {
+    this.batchSize = parseInt(process.env.NOTIFICATION_QUEUE_BATCH) || 500;
+    this.queue = [];
+    this.worker = null;
+
+    this.stats = {
+      enqueued: 0,
+      delivered: 0,
+      failed: 0,
+      batches: 0,
+      lastError: null
+    };
+  }
+
+  getModels() {
+    if (!this.models) {
+      this.models = require('../config/database').initializeModels();
+    }
+    return this.models;
+  }
+
+  /**
+   * Ajoute des notifications ({ userId, type, title, message, data, priority }) et réveille le worker
+   */
+  enqueue(notifications) {
+    if (notifications.length === 0) return 0;
+
+    this.queue.push(...notifications);
+    this.stats.enqueued += notifications.length;
+    this.wake();
+    return notifications.length;
+  }
+
+  wake() {
+    if (this.worker) return;
+
+    // Le worker démarre au prochain tour de boucle: l'appelant n'attend jamais les insertions
+    this.worker = new Promise(resolve => setImmediate(resolve))
+      .then(() => this.work())
+      .finally(() => {
+        this.worker = null;
+        if (this.queue.length > 0) this.wake();
+      });
+  }
+
+  async work() {
+    const { Notification } = this.getModels();
+
+    while (this.queue.length > 0) {
+      const batch = this.queue.splice(0, this.batchSize);
+      try {
+        await Notification.bulkCreate(batch);
+        this.stats.delivered += batch.length;
+      } catch (error) {
+        this.stats.failed += batch.length;
+        this.stats.lastError = error.message;
+        logger.error(`❌ Enregistrement de ${batch.length} notifications échoué:`, error);
+      }
+      this.stats.batches++;
+    }
+  }
+
+  /**
+   * Attend que toutes les notifications en file soient traitées (fin de job, arrêt du serveur)
+   */
+  async drain() {
+    while (this.worker) {
+      await this.worker;
+    }
+  }
+
+  getStats() {
+    return {
+      pending: this.queue.length,
+      ...this.stats
+    };
+  }
+}
+
+module.exports = new NotificationQueue();
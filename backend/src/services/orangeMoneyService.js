@@ -42,6 +42,7 @@ class OrangeMoneyService {
     // Token d'accès
     this.accessToken = null;
     this.tokenExpiry = null;
+    this.tokenRequest = null;
 
     // Validation de la configuration
     if (!this.clientId || !this.clientSecret || !this.merchantKey) {
@@ -71,7 +72,7 @@ class OrangeMoneyService {
         }
 
         if (!this.accessToken || this.isTokenExpired()) {
-          await this.getAccessToken();
+          await this.refreshAccessToken();
         }
 
         config.headers.Authorization = `Bearer ${this.accessToken}`;
@@ -138,6 +139,18 @@ class OrangeMoneyService {
     }
   }
 
+  /**
+   * Renouvelle le token une seule fois pour toutes les requêtes concurrentes
+   */
+  refreshAccessToken() {
+    if (!this.tokenRequest) {
+      this.tokenRequest = this.getAccessToken().finally(() => {
+        this.tokenRequest = null;
+      });
+    }
+    return this.tokenRequest;
+  }
+
   isTokenExpired() {
     return !this.tokenExpiry || Date.now() >= (this.tokenExpiry - 60000); // 1 min de marge
   }
@@ -0,0 +1,135 @@
+/**
+ * Pool de hachage de mots de passe Claudyne
+ * Exécute bcrypt dans des worker threads pour ne pas bloquer la boucle d'événements
+ * lors des inscriptions en masse
+ */
+
+const { Worker, isMainThread, parentPort } = require('worker_threads');
+const os = require('os');
+const bcrypt = require('bcryptjs');
+
+// Même coût que le hook beforeSave du modèle User
+const SALT_ROUNDS = 12;
+
+if (!isMainThread) {
+  // Code exécuté dans le worker
+  parentPort.on('message', ({ id, password }) => {
+    try {
+      const salt = bcrypt.genSaltSync(SALT_ROUNDS);
+      parentPort.postMessage({ id, hash: bcrypt.hashSync(password, salt) });
+    } catch (error) {
+      parentPort.postMessage({ id, error: error.message });
+    }
+  });
+} else {
+  const logger = require('../utils/logger');
+
+  class PasswordHashPool {
+    constructor() {
+      this.size = parseInt(process.env.PASSWORD_HASH_WORKERS) || Math.max(1, os.cpus().length - 1);
+      this.workers = [];
+      this.idle = [];
+      this.queue = [];
+      this.pending = new Map();
+      this.nextId = 0;
+    }
+
+    // Les workers sont démarrés à la première utilisation seulement
+    start() {
+      if (this.workers.length > 0) return;
+
+      for (let i = 0; i < this.size; i++) {
+        this.spawnWorker();
+      }
+      logger.info(`🔐 Pool de hachage démarré (${this.size} workers)`);
+    }
+
+    spawnWorker() {
+      const worker = new Worker(__filename);
+      worker.unref();
+
+      worker.on('message', ({ id, hash, error }) => {
+        const task = this.pending.get(id);
+        this.pending.delete(id);
+        worker.currentTaskId = null;
+        this.release(worker);
+
+        if (!task) return;
+        if (error) {
+          task.reject(new Error(error));
+        } else {
+          task.resolve(hash);
+        }
+      });
+
+      worker.on('error', (error) => {
+        logger.error('Erreur worker de hachage:', error);
+        const task = this.pending.get(worker.currentTaskId);
+        if (task) {
+          this.pending.delete(worker.currentTaskId);
+          task.reject(error);
+        }
+        this.workers = this.workers.filter(w => w !== worker);
+        this.idle = this.idle.filter(w => w !== worker);
+        this.spawnWorker();
+      });
+
+      this.workers.push(worker);
+      // Un worker de remplacement reprend aussitôt les tâches en attente
+      this.release(worker);
+      return worker;
+    }
+
+    release(worker) {
+      const next = this.queue.shift();
+      if (next) {
+        this.dispatch(worker, next);
+      } else {
+        this.idle.push(worker);
+      }
+    }
+
+    dispatch(worker, task) {
+      worker.currentTaskId = task.id;
+      this.pending.set(task.id, task);
+      worker.postMessage({ id: task.id, password: task.password });
+    }
+
+    /**
+     * Hache un mot de passe dans un worker
+     */
+    hash(password) {
+      this.start();
+
+      return new Promise((resolve, reject) => {
+        const task = { id: this.nextId++, password, resolve, reject };
+        const worker = this.idle.pop();
+        if (worker) {
+          this.dispatch(worker, task);
+        } else {
+          this.queue.push(task);
+        }
+      });
+    }
+
+    /**
+     * Hache une liste de mots de passe en parallèle sur tous les workers
+     */
+    hashMany(passwords) {
+      return Promise.all(passwords.map(password => this.hash(password)));
+    }
+
+    /**
+     * Arrêt propre des workers
+     */
+    async close() {
+      const workers = this.workers;
+      this.workers = [];
+      this.idle = [];
+      await Promise.all(workers.map(worker => worker.terminate()));
+    }
+  }
+
+  // Instance singleton
+  module.exports = new PasswordHashPool();
+}
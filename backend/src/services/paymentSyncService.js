@@ -0,0 +1,82 @@
+/**
+ * Synchronisation du statut des paiements mobiles avec les opérateurs
+ * Utilisé par le polling (GET /api/payments/:transactionId/status) et par les
+ * callbacks MTN / Orange, pour que les deux chemins appliquent la même logique
+ */
+
+const logger = require('../utils/logger');
+const mavianceService = require('./mavianceService');
+const { MtnMobileMoneyService } = require('./mtnMobileMoney');
+const { OrangeMoneyService } = require('./orangeMoneyService');
+
+// Instances partagées: un seul token opérateur par processus
+const mtnService = new MtnMobileMoneyService();
+const orangeService = new OrangeMoneyService();
+
+const FINAL_STATUSES = ['completed', 'failed', 'cancelled', 'refunded', 'expired'];
+
+/**
+ * Interroge le provider qui a réellement initié le paiement
+ * (API directe MTN / Orange, sinon MAVIANCE)
+ */
+async function fetchProviderStatus(payment) {
+  const provider = payment.providerResponse?.provider;
+
+  if (provider === 'mtn_direct') {
+    return mtnService.checkRequestToPayStatus(payment.externalTransactionId);
+  }
+  if (provider === 'orange_direct') {
+    return orangeService.checkWebPaymentStatus(payment.externalTransactionId || payment.transactionId);
+  }
+  if (payment.paymentMethod === 'mtn_momo') {
+    return mavianceService.checkMtnPaymentStatus(payment.transactionId);
+  }
+  if (payment.paymentMethod === 'orange_money') {
+    return mavianceService.checkOrangePaymentStatus(payment.transactionId);
+  }
+  return null;
+}
+
+/**
+ * Met à jour un paiement en cours selon le statut du provider.
+ * Sans effet sur un paiement déjà finalisé (callback en double, polling concurrent).
+ *
+ * @returns {Promise<string>} statut du paiement après synchronisation
+ */
+async function syncPaymentStatus(payment, source = 'polling') {
+  if (FINAL_STATUSES.includes(payment.status) || payment.paymentMethod === 'wallet') {
+    return payment.status;
+  }
+
+  const providerStatus = await fetchProviderStatus(payment);
+  if (!providerStatus) return payment.status;
+
+  if (providerStatus.status === 'completed') {
+    // Pour les API directes MTN et Orange, externalId est notre propre transactionId
+    // (order_id chez Orange): on conserve la référence opérateur, celle renvoyée par
+    // Orange (orange_reference) ou à défaut celle enregistrée à l'initiation
+    const provider = payment.providerResponse?.provider;
+    let externalId = providerStatus.externalId;
+    if (provider === 'mtn_direct') {
+      externalId = payment.externalTransactionId;
+    } else if (provider === 'orange_direct') {
+      externalId = providerStatus.orangeReference || payment.externalTransactionId || providerStatus.externalId;
+    }
+    await payment.markAsCompleted(externalId, { ...providerStatus, source });
+  } else if (['failed', 'cancelled', 'expired'].includes(providerStatus.status)) {
+    await payment.markAsFailed(providerStatus.message, { ...providerStatus, source });
+  }
+
+  if (payment.status !== 'processing') {
+    logger.info(`💳 Paiement ${payment.transactionId} → ${payment.status} (${source})`);
+  }
+
+  return payment.status;
+}
+
+module.exports = {
+  mtnService,
+  orangeService,
+  syncPaymentStatus,
+  FINAL_STATUSES
+};
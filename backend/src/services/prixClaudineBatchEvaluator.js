@@ -0,0 +1,317 @@
+/**
+ * Évaluation Prix Claudine par lots
+ * Les élèves sont parcourus par pages (id croissant) et chaque page est évaluée avec les
+ * requêtes agrégées groupées de PrixClaudineService.loadAggregates. Les pages sont traitées
+ * avec une concurrence bornée (PRIX_EVAL_CONCURRENCY). Quand les prix sont attribués, un point
+ * de reprise est enregistré (AdminSetting) après chaque page terminée: une évaluation
+ * interrompue reprend après le dernier élève dont toutes les pages précédentes sont traitées.
+ */
+
+const logger = require('../utils/logger');
+const { PrixClaudineService } = require('./prixClaudineService');
+
+const CHECKPOINT_KEY = 'prix_claudine_evaluation_checkpoint';
+const STRATEGIES = ['batch', 'per-student'];
+const MAX_CHUNK_SIZE = 1000;
+const MAX_CONCURRENCY = 8;
+
+class PrixClaudineBatchEvaluator {
+  constructor() {
+    this.service = new PrixClaudineService();
+    this.job = null;
+    this.running = null;
+    this.nextJobId = 1;
+    this.checkpointWrite = Promise.resolve();
+  }
+
+  getModels() {
+    if (!this.models) {
+      this.models = require('../config/database').initializeModels();
+    }
+    return this.models;
+  }
+
+  isRunning() {
+    return this.running !== null;
+  }
+
+  /**
+   * État de la dernière évaluation (progression, débit, estimation de fin)
+   */
+  getStatus({ includeResults = false } = {}) {
+    if (!this.job) {
+      return { status: 'idle' };
+    }
+
+    const { results, ...job } = this.job;
+    const elapsedMs = (job.finishedAt || Date.now()) - job.startedAt;
+    const evaluated = job.processedStudents - job.resumedStudents;
+    const rate = elapsedMs > 0 ? evaluated / (elapsedMs / 1000) : 0;
+    const remaining = Math.max(0, job.totalStudents - job.processedStudents);
+
+    const status = {
+      ...job,
+      startedAt: new Date(job.startedAt),
+      finishedAt: job.finishedAt ? new Date(job.finishedAt) : null,
+      elapsedMs,
+      percent: job.totalStudents ? Math.min(100, Math.round((job.processedStudents / job.totalStudents) * 1000) / 10) : 0,
+      studentsPerSecond: Math.round(rate * 10) / 10,
+      etaSeconds: job.status === 'running' && rate > 0 ? Math.round(remaining / rate) : null
+    };
+
+    if (includeResults && results) {
+      status.results = results;
+    }
+    return status;
+  }
+
+  /**
+   * Démarre une évaluation en arrière-plan et retourne son état initial
+   */
+  start(options = {}) {
+    if (this.running) {
+      const error = new Error('Une évaluation Prix Claudine est déjà en cours');
+      error.code = 'EVALUATION_RUNNING';
+      throw error;
+    }
+
+    const settings = {
+      strategy: STRATEGIES.includes(options.strategy) ? options.strategy : 'batch',
+      award: options.award !== false,
+      resume: options.resume !== false,
+      chunkSize: Math.min(MAX_CHUNK_SIZE, Math.max(1,
+        parseInt(options.chunkSize) || parseInt(process.env.PRIX_EVAL_CHUNK_SIZE) || 200)),
+      concurrency: Math.min(MAX_CONCURRENCY, Math.max(1,
+        parseInt(options.concurrency) || parseInt(process.env.PRIX_EVAL_CONCURRENCY) || 2)),
+      collectResults: options.collectResults === true
+    };
+
+    const now = new Date();
+    this.job = {
+      id: this.nextJobId++,
+      status: 'running',
+      ...settings,
+      season: `${now.getFullYear()}-${String(now.getMonth() + 1).padStart(2, '0')}`,
+      startedAt: Date.now(),
+      finishedAt: null,
+      durationMs: null,
+      totalStudents: 0,
+      processedStudents: 0,
+      resumedStudents: 0,
+      resumedFrom: null,
+      lastStudentId: null,
+      chunksDone: 0,
+      eligibleStudents: 0,
+      prizesByCategory: {},
+      prizesAwarded: 0,
+      prizesAlreadyAwarded: 0,
+      awardErrors: 0,
+      lastAwardError: null,
+      error: null,
+      results: settings.collectResults ? [] : undefined
+    };
+
+    const job = this.job;
+    const running = this.execute(job);
+    this.running = running;
+    running.finally(() => {
+      if (this.running === running) this.running = null;
+    });
+
+    return this.getStatus();
+  }
+
+  /**
+   * Démarre une évaluation et attend sa fin (évaluation mensuelle)
+   */
+  async run(options = {}) {
+    this.start(options);
+    const job = this.job;
+    await this.running;
+
+    if (job.status === 'failed') {
+      throw new Error(job.error);
+    }
+    return job;
+  }
+
+  async execute(job) {
+    const { Student } = this.getModels();
+    logger.info(`🏆 Évaluation Prix Claudine #${job.id} (${job.strategy}, pages de ${job.chunkSize}, concurrence ${job.concurrency})`);
+
+    try {
+      let afterId = null;
+      const committed = { students: 0, prizes: 0, alreadyAwarded: 0 };
+
+      if (job.award && job.resume) {
+        const checkpoint = await this.loadCheckpoint();
+        if (checkpoint && checkpoint.season === job.season && !checkpoint.completed && checkpoint.lastStudentId) {
+          afterId = checkpoint.lastStudentId;
+          committed.students = checkpoint.processedStudents || 0;
+          committed.prizes = checkpoint.prizesAwarded || 0;
+          committed.alreadyAwarded = checkpoint.prizesAlreadyAwarded || 0;
+          job.resumedFrom = afterId;
+          job.resumedStudents = committed.students;
+          job.processedStudents = committed.students;
+          job.prizesAwarded = committed.prizes;
+          job.prizesAlreadyAwarded = committed.alreadyAwarded;
+          logger.info(`🏆 Reprise après l'élève ${afterId} (${committed.students} déjà évalués)`);
+        }
+      }
+
+      job.totalStudents = await Student.count();
+
+      // Pages terminées en attente d'enregistrement: le point de reprise n'avance que
+      // sur une suite continue de pages terminées
+      const finished = new Map();
+      let nextToCommit = 0;
+      let pageIndex = 0;
+      const inFlight = new Set();
+      let failure = null;
+
+      const commit = () => {
+        let advanced = false;
+        while (finished.has(nextToCommit)) {
+          const page = finished.get(nextToCommit);
+          finished.delete(nextToCommit);
+          committed.students += page.students;
+          committed.prizes += page.prizes;
+          committed.alreadyAwarded += page.alreadyAwarded;
+          job.lastStudentId = page.lastStudentId;
+          nextToCommit++;
+          advanced = true;
+        }
+        if (advanced && job.award) {
+          this.saveCheckpoint(job, committed, false);
+        }
+      };
+
+      while (!failure) {
+        const students = await this.service.fetchStudentPage(afterId, job.chunkSize);
+        if (students.length === 0) break;
+        const lastStudentId = students[students.length - 1].id;
+        afterId = lastStudentId;
+
+        const index = pageIndex++;
+        const task = this.processPage(job, students)
+          .then(page => {
+            finished.set(index, { ...page, lastStudentId });
+            commit();
+          })
+          .catch(error => {
+            failure = failure || error;
+          })
+          .finally(() => inFlight.delete(task));
+        inFlight.add(task);
+
+        if (inFlight.size >= job.concurrency) {
+          await Promise.race(inFlight);
+        }
+      }
+
+      await Promise.all(inFlight);
+      if (failure) throw failure;
+
+      job.status = 'completed';
+      if (job.award) this.saveCheckpoint(job, committed, true);
+    } catch (error) {
+      job.status = 'failed';
+      job.error = error.message;
+      logger.error(`❌ Évaluation Prix Claudine #${job.id} échouée:`, error);
+    } finally {
+      await this.checkpointWrite;
+      job.finishedAt = Date.now();
+      job.durationMs = job.finishedAt - job.startedAt;
+    }
+
+    if (job.status === 'completed') {
+      logger.info(`✅ Évaluation Prix Claudine #${job.id}: ${job.processedStudents} élèves en ${job.durationMs} ms, ` +
+        `${job.eligibleStudents} éligibles, ${job.prizesAwarded} prix attribués, ${job.prizesAlreadyAwarded} déjà attribués`);
+    }
+  }
+
+  /**
+   * Évalue une page d'élèves puis attribue leurs prix
+   */
+  async processPage(job, students) {
+    let evaluations;
+    if (job.strategy === 'per-student') {
+      evaluations = [];
+      for (const student of students) {
+        evaluations.push(await this.service.evaluateStudent(student.id));
+      }
+    } else {
+      evaluations = await this.service.evaluateStudentsBatch(students);
+    }
+
+    // Un prix déjà attribué ce mois-ci (reprise, second passage) n'est pas recompté
+    let prizes = 0;
+    let alreadyAwarded = 0;
+    for (const evaluation of evaluations) {
+      if (evaluation.eligiblePrizes.length > 0) job.eligibleStudents++;
+
+      for (const prize of evaluation.eligiblePrizes) {
+        job.prizesByCategory[prize.category] = (job.prizesByCategory[prize.category] || 0) + 1;
+        if (!job.award) continue;
+
+        try {
+          const result = await this.service.awardPrize(evaluation.studentId, prize);
+          if (result.type === 'existing') {
+            alreadyAwarded++;
+          } else {
+            prizes++;
+          }
+        } catch (error) {
+          job.awardErrors++;
+          job.lastAwardError = error.message;
+        }
+      }
+
+      if (job.results) {
+        job.results.push({
+          studentId: evaluation.studentId,
+          metrics: evaluation.metrics,
+          eligiblePrizes: evaluation.eligiblePrizes.map(({ category, level, score, points }) => ({ category, level, score, points }))
+        });
+      }
+    }
+
+    job.processedStudents += students.length;
+    job.prizesAwarded += prizes;
+    job.prizesAlreadyAwarded += alreadyAwarded;
+    job.chunksDone++;
+
+    return { students: students.length, prizes, alreadyAwarded };
+  }
+
+  async loadCheckpoint() {
+    const { AdminSetting } = this.getModels();
+    return AdminSetting.get(CHECKPOINT_KEY);
+  }
+
+  /**
+   * Écritures du point de reprise sérialisées (les pages se terminent en parallèle)
+   */
+  saveCheckpoint(job, committed, completed) {
+    const { AdminSetting } = this.getModels();
+    const value = {
+      jobId: job.id,
+      season: job.season,
+      strategy: job.strategy,
+      lastStudentId: job.lastStudentId,
+      processedStudents: committed.students,
+      prizesAwarded: committed.prizes,
+      prizesAlreadyAwarded: committed.alreadyAwarded,
+      completed,
+      updatedAt: new Date()
+    };
+
+    this.checkpointWrite = this.checkpointWrite
+      .then(() => AdminSetting.set(CHECKPOINT_KEY, value, 'features', 'Point de reprise de l\'évaluation Prix Claudine', 'system'))
+      .catch(error => logger.error('Erreur enregistrement point de reprise Prix Claudine:', error));
+    return this.checkpointWrite;
+  }
+}
+
+module.exports = new PrixClaudineBatchEvaluator();
+module.exports.STRATEGIES = STRATEGIES;
@@ -1,8 +1,45 @@
-const { PrixClaudine } = require('../models/PrixClaudine');
-const { Student } = require('../models/Student');
-const { Progress } = require('../models/Progress');
-const { Battle } = require('../models/Battle');
-const { Lesson } = require('../models/Lesson');
+const { Op, QueryTypes } = require('sequelize');
+
+// Statuts de progrès comptés comme leçon terminée
+const COMPLETED_STATUSES = ['completed', 'mastered'];
+// Catégorie de matière utilisée pour le score de résolution de problèmes
+const PROBLEM_SOLVING_CATEGORY = 'Mathématiques';
+// Valeur neutre tant que l'originalité n'est pas mesurée (l'ancien tirage aléatoire
+// rendait deux évaluations du même élève différentes)
+const ORIGINALITY_INDEX = 0.7;
+const STUDENT_ATTRIBUTES = ['id', 'firstName', 'lastName', 'educationLevel', 'schoolName'];
+
+let models;
+
+function getModels() {
+  if (!models) {
+    models = require('../config/database').initializeModels();
+  }
+  return models;
+}
+
+const EMPTY_AGGREGATE = {
+  progressCount: 0,
+  averageScore: 0,
+  lessonsCompleted: 0,
+  recentCompleted: 0,
+  streak: 0,
+  weeklyActivity: 0,
+  firstAverage: 0,
+  lastAverage: 0,
+  subjects: [],
+  battleParticipation: 0,
+  battleWins: 0,
+  helpedStudents: 0,
+  forumParticipation: 0,
+  sharedResources: 0,
+  mentoringSessions: 0,
+  uniqueAnswers: 0,
+  communityContribution: 0,
+  inspirationalImpact: false,
+  leadershipScore: 0
+};
+
 
 class PrixClaudineService {
   constructor() {
@@ -93,20 +130,28 @@ class PrixClaudineService {
     };
   }
 
-  async evaluateAllStudents() {
+  /**
+   * Évalue tous les élèves par pages. strategy 'batch' (défaut): métriques calculées par
+   * requêtes agrégées groupées pour toute la page; 'per-student': une évaluation par élève.
+   * L'évaluation mensuelle passe par prixClaudineBatchEvaluator (concurrence, reprise, progression).
+   */
+  async evaluateAllStudents({ strategy = 'batch', chunkSize = 200 } = {}) {
     try {
-      const students = await Student.findAll({
-        include: [
-          { model: Progress, as: 'progress' },
-          { model: Battle, as: 'battles' }
-        ]
-      });
-
       const evaluationResults = [];
+      let afterId = null;
+
+      for (;;) {
+        const students = await this.fetchStudentPage(afterId, chunkSize);
+        if (students.length === 0) break;
 
-      for (const student of students) {
-        const evaluation = await this.evaluateStudent(student.id);
-        evaluationResults.push(evaluation);
+        if (strategy === 'per-student') {
+          for (const student of students) {
+            evaluationResults.push(await this.evaluateStudent(student.id));
+          }
+        } else {
+          evaluationResults.push(...await this.evaluateStudentsBatch(students));
+        }
+        afterId = students[students.length - 1].id;
       }
 
       return evaluationResults;
@@ -116,86 +161,298 @@ class PrixClaudineService {
     }
   }
 
+  /**
+   * Page d'élèves par clé croissante (reprise possible après le dernier id traité)
+   */
+  async fetchStudentPage(afterId, limit) {
+    const { Student } = getModels();
+    return Student.findAll({
+      attributes: STUDENT_ATTRIBUTES,
+      where: afterId ? { id: { [Op.gt]: afterId } } : {},
+      order: [['id', 'ASC']],
+      limit
+    });
+  }
+
   async evaluateStudent(studentId) {
     try {
-      const student = await Student.findByPk(studentId, {
-        include: [
-          { model: Progress, as: 'progress' },
-          { model: Battle, as: 'battles' }
-        ]
-      });
+      const { Student } = getModels();
+      const student = await Student.findByPk(studentId, { attributes: STUDENT_ATTRIBUTES });
 
       if (!student) {
         throw new Error('Étudiant non trouvé');
       }
 
       const metrics = await this.calculateStudentMetrics(student);
-      const eligiblePrizes = this.determineEligiblePrizes(metrics);
-      const recommendations = this.generateRecommendations(metrics, eligiblePrizes);
-
-      return {
-        studentId,
-        student: {
-          name: student.name,
-          educationLevel: student.educationLevel,
-          school: student.school
-        },
-        metrics,
-        eligiblePrizes,
-        recommendations,
-        evaluatedAt: new Date()
-      };
+      return this.buildEvaluation(student, metrics);
     } catch (error) {
       console.error(`Erreur lors de l'évaluation de l'étudiant ${studentId}:`, error);
       throw error;
     }
   }
 
+  /**
+   * Évalue une page d'élèves avec 3 requêtes agrégées au total
+   */
+  async evaluateStudentsBatch(students) {
+    const aggregates = await this.loadAggregates(students.map(student => student.id));
+    return students.map(student =>
+      this.buildEvaluation(student, this.buildMetrics(aggregates.get(student.id)))
+    );
+  }
+
+  buildEvaluation(student, metrics) {
+    const eligiblePrizes = this.determineEligiblePrizes(metrics);
+    const recommendations = this.generateRecommendations(metrics, eligiblePrizes);
+
+    return {
+      studentId: student.id,
+      student: {
+        name: `${student.firstName || ''} ${student.lastName || ''}`.trim(),
+        educationLevel: student.educationLevel,
+        school: student.schoolName
+      },
+      metrics,
+      eligiblePrizes,
+      recommendations,
+      evaluatedAt: new Date()
+    };
+  }
+
+  /**
+   * Métriques d'un seul élève (évaluation individuelle): lecture de ses lignes de progrès
+   * et de ses participations, agrégées en mémoire avec la même définition que loadAggregates
+   */
   async calculateStudentMetrics(student) {
-    const now = new Date();
-    const lastMonth = new Date(now.getFullYear(), now.getMonth() - 1, now.getDate());
-    const lastThreeMonths = new Date(now.getFullYear(), now.getMonth() - 3, now.getDate());
+    const { Progress, Lesson, Subject, BattleParticipation } = getModels();
+
+    const progress = await Progress.findAll({
+      where: { studentId: student.id },
+      attributes: ['id', 'status', 'lastScore', 'createdAt'],
+      include: [{
+        model: Lesson,
+        as: 'lesson',
+        attributes: ['id', 'subjectId'],
+        include: [{ model: Subject, as: 'subject', attributes: ['id', 'category'] }]
+      }],
+      order: [['createdAt', 'ASC'], ['id', 'ASC']]
+    });
 
-    const lessons = await Lesson.findAll({
-      where: { studentId: student.id }
+    const battles = await BattleParticipation.findAll({
+      where: { studentId: student.id },
+      attributes: ['rank']
     });
 
-    const battles = await Battle.findAll({
-      where: { winnerId: student.id }
+    const community = await this.loadCommunityAggregates([student.id]);
+
+    return this.buildMetrics({
+      ...this.aggregateProgressRows(progress),
+      battleParticipation: battles.length,
+      battleWins: battles.filter(battle => battle.rank === 1).length,
+      ...community.get(student.id)
     });
+  }
+
+  /**
+   * Agrégats de progrès calculés en mémoire (lignes triées par date de création)
+   */
+  aggregateProgressRows(progress, now = new Date()) {
+    const weekAgo = new Date(now.getTime() - 7 * 24 * 60 * 60 * 1000);
+    const scores = progress.map(p => p.lastScore || 0);
+    const done = progress.map(p => COMPLETED_STATUSES.includes(p.status));
+    const average = values => values.length ? values.reduce((sum, value) => sum + value, 0) / values.length : 0;
+
+    let streak = 0;
+    for (let i = done.length - 1; i >= 0 && done[i]; i--) {
+      streak++;
+    }
+
+    const subjects = new Map();
+    progress.forEach((p, i) => {
+      if (!p.lesson) return;
+      const entry = subjects.get(p.lesson.subjectId) || {
+        subjectId: p.lesson.subjectId,
+        category: p.lesson.subject ? p.lesson.subject.category : null,
+        total: 0,
+        count: 0
+      };
+      entry.total += scores[i];
+      entry.count++;
+      subjects.set(p.lesson.subjectId, entry);
+    });
+
+    return {
+      progressCount: progress.length,
+      averageScore: average(scores),
+      lessonsCompleted: done.filter(Boolean).length,
+      recentCompleted: done.slice(-7).filter(Boolean).length,
+      streak,
+      weeklyActivity: progress.filter(p => new Date(p.createdAt) >= weekAgo).length,
+      firstAverage: average(scores.slice(0, 5)),
+      lastAverage: average(scores.slice(-5)),
+      subjects: [...subjects.values()].map(({ subjectId, category, total, count }) => ({
+        subjectId,
+        category,
+        averageScore: total / count,
+        count
+      }))
+    };
+  }
+
+  /**
+   * Agrégats de tous les élèves d'une page en requêtes groupées: progrès (fonctions de
+   * fenêtre pour les 7/5 dernières lignes et la série en cours), moyennes par matière,
+   * participations aux battles. Même définition que aggregateProgressRows: comme les
+   * inclusions paranoïdes de calculateStudentMetrics, les leçons et matières supprimées
+   * (soft delete) sont exclues des moyennes par matière.
+   */
+  async loadAggregates(studentIds, now = new Date()) {
+    const { sequelize } = getModels();
+    const aggregates = new Map();
+    if (studentIds.length === 0) return aggregates;
+
+    const weekAgo = new Date(now.getTime() - 7 * 24 * 60 * 60 * 1000);
+    const replacements = { studentIds, completedStatuses: COMPLETED_STATUSES, weekAgo };
+
+    const progressRows = await sequelize.query(`
+      WITH ranked AS (
+        SELECT p."studentId",
+               COALESCE(p."lastScore", 0) AS score,
+               CASE WHEN p.status IN (:completedStatuses) THEN 1 ELSE 0 END AS done,
+               p."createdAt",
+               ROW_NUMBER() OVER (PARTITION BY p."studentId" ORDER BY p."createdAt" ASC, p.id ASC) AS "rankAsc",
+               ROW_NUMBER() OVER (PARTITION BY p."studentId" ORDER BY p."createdAt" DESC, p.id DESC) AS "rankDesc"
+        FROM progress p
+        WHERE p."studentId" IN (:studentIds)
+      )
+      SELECT "studentId",
+             COUNT(*) AS "progressCount",
+             AVG(score) AS "averageScore",
+             SUM(done) AS "lessonsCompleted",
+             SUM(CASE WHEN "rankDesc" <= 7 THEN done ELSE 0 END) AS "recentCompleted",
+             MIN(CASE WHEN done = 0 THEN "rankDesc" END) AS "firstPendingFromEnd",
+             SUM(CASE WHEN "createdAt" >= :weekAgo THEN 1 ELSE 0 END) AS "weeklyActivity",
+             AVG(CASE WHEN "rankAsc" <= 5 THEN score END) AS "firstAverage",
+             AVG(CASE WHEN "rankDesc" <= 5 THEN score END) AS "lastAverage"
+      FROM ranked
+      GROUP BY "studentId"
+    `, { replacements, type: QueryTypes.SELECT });
+
+    progressRows.forEach(row => {
+      const progressCount = Number(row.progressCount);
+      aggregates.set(row.studentId, {
+        progressCount,
+        averageScore: Number(row.averageScore) || 0,
+        lessonsCompleted: Number(row.lessonsCompleted) || 0,
+        recentCompleted: Number(row.recentCompleted) || 0,
+        // Série en cours: lignes terminées depuis la plus récente non terminée
+        streak: row.firstPendingFromEnd === null ? progressCount : Number(row.firstPendingFromEnd) - 1,
+        weeklyActivity: Number(row.weeklyActivity) || 0,
+        firstAverage: Number(row.firstAverage) || 0,
+        lastAverage: Number(row.lastAverage) || 0,
+        subjects: []
+      });
+    });
+
+    const subjectRows = await sequelize.query(`
+      SELECT p."studentId", l."subjectId", s.category,
+             AVG(COALESCE(p."lastScore", 0)) AS "averageScore",
+             COUNT(*) AS "count"
+      FROM progress p
+      JOIN lessons l ON l.id = p."lessonId" AND l."deletedAt" IS NULL
+      LEFT JOIN subjects s ON s.id = l."subjectId" AND s."deletedAt" IS NULL
+      WHERE p."studentId" IN (:studentIds)
+      GROUP BY p."studentId", l."subjectId", s.category
+    `, { replacements, type: QueryTypes.SELECT });
+
+    subjectRows.forEach(row => {
+      const aggregate = aggregates.get(row.studentId);
+      if (!aggregate) return;
+      aggregate.subjects.push({
+        subjectId: row.subjectId,
+        category: row.category,
+        averageScore: Number(row.averageScore) || 0,
+        count: Number(row.count)
+      });
+    });
+
+    const battleRows = await sequelize.query(`
+      SELECT "studentId",
+             COUNT(*) AS "participations",
+             SUM(CASE WHEN "rank" = 1 THEN 1 ELSE 0 END) AS "wins"
+      FROM battle_participations
+      WHERE "studentId" IN (:studentIds)
+      GROUP BY "studentId"
+    `, { replacements, type: QueryTypes.SELECT });
+
+    battleRows.forEach(row => {
+      const aggregate = aggregates.get(row.studentId) || { ...EMPTY_AGGREGATE, subjects: [] };
+      aggregate.battleParticipation = Number(row.participations);
+      aggregate.battleWins = Number(row.wins) || 0;
+      aggregates.set(row.studentId, aggregate);
+    });
+
+    const community = await this.loadCommunityAggregates(studentIds);
+    community.forEach((values, studentId) => {
+      aggregates.set(studentId, { ...aggregates.get(studentId), ...values });
+    });
+
+    return aggregates;
+  }
+
+  /**
+   * Entraide, forum, ressources partagées, mentorat, leadership: pas encore suivis en base.
+   * Point d'extension unique (requêtes groupées par élève) pour les deux chemins d'évaluation.
+   */
+  async loadCommunityAggregates(studentIds) {
+    return new Map();
+  }
 
-    const progress = student.progress || [];
+  buildMetrics(aggregate) {
+    const values = { ...EMPTY_AGGREGATE, ...aggregate };
+    const round = value => Math.round(value * 100) / 100;
+
+    const subjectMastery = {};
+    let problemSolvingTotal = 0;
+    let problemSolvingCount = 0;
+    values.subjects.forEach(subject => {
+      subjectMastery[subject.subjectId] = round(subject.averageScore);
+      if (subject.category === PROBLEM_SOLVING_CATEGORY) {
+        problemSolvingTotal += subject.averageScore * subject.count;
+        problemSolvingCount += subject.count;
+      }
+    });
 
     return {
       academic: {
-        averageScore: this.calculateAverageScore(progress),
-        lessonsCompleted: lessons.length,
-        consistency: this.calculateConsistency(progress),
-        subjectMastery: this.calculateSubjectMastery(progress),
-        improvementRate: this.calculateImprovementRate(progress)
+        averageScore: round(values.averageScore),
+        lessonsCompleted: values.lessonsCompleted,
+        consistency: values.progressCount >= 7 ? round(values.recentCompleted / 7) : 0,
+        subjectMastery,
+        improvementRate: values.progressCount >= 10 ? round(values.lastAverage - values.firstAverage) : 0
       },
       engagement: {
-        streakDays: this.calculateStreak(progress),
-        weeklyActivity: this.calculateWeeklyActivity(progress),
-        battleParticipation: student.battles?.length || 0,
-        battleWins: battles.length,
-        winRate: battles.length / (student.battles?.length || 1)
+        streakDays: values.streak,
+        weeklyActivity: values.weeklyActivity,
+        battleParticipation: values.battleParticipation,
+        battleWins: values.battleWins,
+        winRate: round(values.battleWins / (values.battleParticipation || 1))
       },
       social: {
-        helpedStudents: await this.countHelpedStudents(student.id),
-        forumParticipation: await this.countForumParticipation(student.id),
-        sharedResources: await this.countSharedResources(student.id),
-        mentoringSessions: await this.countMentoringSessions(student.id)
+        helpedStudents: values.helpedStudents,
+        forumParticipation: values.forumParticipation,
+        sharedResources: values.sharedResources,
+        mentoringSessions: values.mentoringSessions
       },
       innovation: {
-        uniqueAnswers: await this.countUniqueAnswers(student.id),
-        problemSolvingScore: this.calculateProblemSolvingScore(progress),
-        originalityIndex: await this.calculateOriginalityIndex(student.id)
+        uniqueAnswers: values.uniqueAnswers,
+        problemSolvingScore: problemSolvingCount ? round(problemSolvingTotal / problemSolvingCount) : 0,
+        originalityIndex: ORIGINALITY_INDEX
       },
       leadership: {
-        communityContribution: await this.calculateCommunityContribution(student.id),
-        inspirationalImpact: await this.calculateInspirationalImpact(student.id),
-        leadershipScore: await this.calculateLeadershipScore(student.id)
+        communityContribution: values.communityContribution,
+        inspirationalImpact: values.inspirationalImpact,
+        leadershipScore: values.leadershipScore
       }
     };
   }
@@ -304,6 +561,7 @@ class PrixClaudineService {
 
   async awardPrize(studentId, prizeData) {
     try {
+      const { PrixClaudine } = getModels();
       const existingPrize = await PrixClaudine.findOne({
         where: {
           studentId,
@@ -353,6 +611,7 @@ class PrixClaudineService {
   }
 
   async updateStudentPoints(studentId, points) {
+    const { Student } = getModels();
     const student = await Student.findByPk(studentId);
     if (student) {
       const newTotalPoints = (student.totalPoints || 0) + points;
@@ -413,6 +672,7 @@ class PrixClaudineService {
 
   async getLeaderboard(category = null, timeframe = 'month') {
     try {
+      const { PrixClaudine, Student } = getModels();
       const whereClause = {};
 
       if (category) {
@@ -459,148 +719,22 @@ class PrixClaudineService {
     }
   }
 
-  async calculateAverageScore(progress) {
-    if (!progress || progress.length === 0) return 0;
-    const totalScore = progress.reduce((sum, p) => sum + (p.score || 0), 0);
-    return totalScore / progress.length;
-  }
-
-  calculateConsistency(progress) {
-    if (!progress || progress.length < 7) return 0;
-
-    const last7Days = progress.slice(-7);
-    const studyDays = last7Days.filter(p => p.completed).length;
-    return studyDays / 7;
-  }
-
-  calculateStreak(progress) {
-    if (!progress || progress.length === 0) return 0;
-
-    let streak = 0;
-    for (let i = progress.length - 1; i >= 0; i--) {
-      if (progress[i].completed) {
-        streak++;
-      } else {
-        break;
-      }
-    }
-    return streak;
-  }
-
-  calculateWeeklyActivity(progress) {
-    if (!progress || progress.length === 0) return 0;
-
-    const lastWeek = progress.filter(p => {
-      const progressDate = new Date(p.createdAt);
-      const weekAgo = new Date();
-      weekAgo.setDate(weekAgo.getDate() - 7);
-      return progressDate >= weekAgo;
-    });
-
-    return lastWeek.length;
-  }
-
-  calculateSubjectMastery(progress) {
-    const subjects = {};
-    progress.forEach(p => {
-      if (!subjects[p.subject]) {
-        subjects[p.subject] = [];
-      }
-      subjects[p.subject].push(p.score || 0);
-    });
-
-    const mastery = {};
-    Object.keys(subjects).forEach(subject => {
-      const scores = subjects[subject];
-      mastery[subject] = scores.reduce((sum, score) => sum + score, 0) / scores.length;
-    });
-
-    return mastery;
-  }
-
-  calculateImprovementRate(progress) {
-    if (!progress || progress.length < 10) return 0;
-
-    const first5 = progress.slice(0, 5);
-    const last5 = progress.slice(-5);
-
-    const firstAvg = first5.reduce((sum, p) => sum + (p.score || 0), 0) / 5;
-    const lastAvg = last5.reduce((sum, p) => sum + (p.score || 0), 0) / 5;
-
-    return lastAvg - firstAvg;
-  }
-
-  async countHelpedStudents(studentId) {
-    return 0;
-  }
-
-  async countForumParticipation(studentId) {
-    return 0;
-  }
-
-  async countSharedResources(studentId) {
-    return 0;
-  }
-
-  async countMentoringSessions(studentId) {
-    return 0;
-  }
-
-  async countUniqueAnswers(studentId) {
-    return 0;
-  }
-
-  calculateProblemSolvingScore(progress) {
-    if (!progress || progress.length === 0) return 0;
-
-    const problemSolvingLessons = progress.filter(p =>
-      p.type === 'problem_solving' || p.subject === 'mathématiques'
-    );
-
-    if (problemSolvingLessons.length === 0) return 0;
-
-    return problemSolvingLessons.reduce((sum, p) => sum + (p.score || 0), 0) / problemSolvingLessons.length;
-  }
-
-  async calculateOriginalityIndex(studentId) {
-    return Math.random() * 0.3 + 0.7;
-  }
-
-  async calculateCommunityContribution(studentId) {
-    return 0;
-  }
-
-  async calculateInspirationalImpact(studentId) {
-    return false;
-  }
-
-  async calculateLeadershipScore(studentId) {
-    return 0;
-  }
-
-  async runMonthlyEvaluation() {
+  async runMonthlyEvaluation(options = {}) {
     try {
       console.log('🏆 Démarrage de l\'évaluation mensuelle Prix Claudine...');
 
-      const evaluationResults = await this.evaluateAllStudents();
-      const awardedPrizes = [];
-
-      for (const result of evaluationResults) {
-        for (const eligiblePrize of result.eligiblePrizes) {
-          const awardResult = await this.awardPrize(result.studentId, eligiblePrize);
-          awardedPrizes.push({
-            student: result.student,
-            award: awardResult
-          });
-        }
-      }
+      const batchEvaluator = require('./prixClaudineBatchEvaluator');
+      const job = await batchEvaluator.run({ award: true, resume: true, ...options });
 
-      console.log(`✅ Évaluation terminée. ${awardedPrizes.length} prix attribués.`);
+      console.log(`✅ Évaluation terminée. ${job.prizesAwarded} prix attribués, ${job.prizesAlreadyAwarded} déjà attribués.`);
 
       return {
-        totalEvaluated: evaluationResults.length,
-        totalPrizesAwarded: awardedPrizes.length,
-        results: awardedPrizes,
+        totalEvaluated: job.processedStudents,
+        totalPrizesAwarded: job.prizesAwarded,
+        totalPrizesAlreadyAwarded: job.prizesAlreadyAwarded,
+        awardErrors: job.awardErrors,
+        resumedFrom: job.resumedFrom,
+        durationMs: job.durationMs,
         month: new Date().getMonth() + 1,
         year: new Date().getFullYear(),
         theme: this.monthlyThemes[new Date().getMonth() + 1]
@@ -612,4 +746,4 @@ class PrixClaudineService {
   }
 }
 
-module.exports = { PrixClaudineService };
\ No newline at end of file
+module.exports = { PrixClaudineService };
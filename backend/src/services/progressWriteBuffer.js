@@ -0,0 +1,333 @@
+/**
+ * Tampon d'écriture différée des progrès Claudyne
+ * Les événements progress:update arrivent par rafales (plusieurs par seconde et par élève
+ * pendant une leçon). Ils sont fusionnés par (élève, leçon) pendant une courte fenêtre puis
+ * écrits en une seule lecture + un seul upsert groupé, au lieu de 3 allers-retours par événement.
+ *
+ * - PROGRESS_FLUSH_MS: fenêtre de fusion (défaut 500 ms, 0 = écriture à chaque événement)
+ * - PROGRESS_BUFFER_MAX: nombre d'entrées en attente qui déclenche une écriture immédiate
+ * Une leçon terminée (100%) est écrite sans attendre la fin de la fenêtre.
+ * Si l'écriture groupée échoue, le lot est scindé jusqu'à isoler les entrées fautives:
+ * seules celles-ci sont remises en attente puis abandonnées, pas les progrès des autres élèves.
+ * L'upsert groupé ne déclenche pas les hooks de Progress: lastActivityAt est fixé ici et les
+ * statistiques des leçons (vues, complétions, scores) sont mises à jour dans la même transaction.
+ */
+
+const { Op } = require('sequelize');
+const logger = require('../utils/logger');
+
+const UPSERT_FIELDS = [
+  'status', 'completionPercentage', 'lastScore', 'bestScore',
+  'lastActivityAt', 'completedAt', 'updatedAt'
+];
+const MAX_RETRIES = 3;
+// Limite du nombre de couples (élève, leçon) par requête de lecture
+const READ_CHUNK_SIZE = 500;
+
+class ProgressWriteBuffer {
+  constructor() {
+    const windowMs = parseInt(process.env.PROGRESS_FLUSH_MS, 10);
+    this.windowMs = Number.isNaN(windowMs) ? 500 : Math.max(0, windowMs);
+    this.maxPending = parseInt(process.env.PROGRESS_BUFFER_MAX, 10) || 1000;
+
+    this.pending = new Map();
+    this.timer = null;
+    this.flushing = Promise.resolve();
+    this.closed = false;
+
+    this.stats = {
+      events: 0,
+      merged: 0,
+      flushes: 0,
+      rowsWritten: 0,
+      dbStatements: 0,
+      failures: 0,
+      lastFlushMs: 0
+    };
+  }
+
+  getModels() {
+    if (!this.models) {
+      this.models = require('../config/database').initializeModels();
+    }
+    return this.models;
+  }
+
+  /**
+   * Ajoute une mise à jour de progrès; la promesse est résolue avec l'enregistrement
+   * persisté (valeurs fusionnées) une fois écrit
+   */
+  add({ studentId, lessonId, progress, score }) {
+    const key = `${studentId}:${lessonId}`;
+    const now = new Date();
+    const percentage = Math.min(100, Math.max(0, Number(progress) || 0));
+    const hasScore = score !== undefined && score !== null && !Number.isNaN(Number(score));
+
+    this.stats.events++;
+
+    let entry = this.pending.get(key);
+    if (entry) {
+      this.stats.merged++;
+    } else {
+      entry = {
+        studentId,
+        lessonId,
+        completionPercentage: 0,
+        lastScore: null,
+        bestScore: null,
+        firstAt: now,
+        waiters: [],
+        retries: 0
+      };
+      this.pending.set(key, entry);
+    }
+
+    // Le pourcentage ne recule jamais; le dernier score est conservé, ainsi que le meilleur
+    entry.completionPercentage = Math.max(entry.completionPercentage, percentage);
+    if (hasScore) {
+      entry.lastScore = Number(score);
+      entry.bestScore = entry.bestScore === null ? Number(score) : Math.max(entry.bestScore, Number(score));
+    }
+    entry.lastActivityAt = now;
+
+    const persisted = new Promise((resolve, reject) => entry.waiters.push({ resolve, reject }));
+
+    if (this.closed || this.windowMs === 0 || percentage >= 100 || this.pending.size >= this.maxPending) {
+      this.flush();
+    } else {
+      this.schedule();
+    }
+
+    return persisted;
+  }
+
+  schedule() {
+    if (this.timer) return;
+    this.timer = setTimeout(() => {
+      this.timer = null;
+      this.flush();
+    }, this.windowMs);
+    this.timer.unref();
+  }
+
+  hasPending(studentId) {
+    for (const entry of this.pending.values()) {
+      if (String(entry.studentId) === String(studentId)) return true;
+    }
+    return false;
+  }
+
+  /**
+   * Lecture de ses propres écritures: force l'écriture si l'élève a des progrès en attente
+   */
+  async flushStudent(studentId) {
+    if (this.hasPending(studentId)) {
+      await this.flush();
+    } else {
+      // Une écriture en cours peut concerner cet élève
+      await this.flushing;
+    }
+  }
+
+  /**
+   * Écrit toutes les entrées en attente. Les écritures sont sérialisées pour qu'un upsert
+   * ne s'appuie jamais sur une lecture antérieure à l'upsert précédent.
+   */
+  flush() {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+
+    this.flushing = this.flushing.then(() => this.writePending());
+    return this.flushing;
+  }
+
+  async writePending() {
+    if (this.pending.size === 0) return;
+
+    const entries = [...this.pending.values()];
+    this.pending = new Map();
+    const started = Date.now();
+
+    await this.writeIsolated(entries);
+
+    this.stats.flushes++;
+    this.stats.lastFlushMs = Date.now() - started;
+  }
+
+  /**
+   * Écrit un lot; en cas d'échec, le scinde en deux et réessaie chaque moitié pour que
+   * seule une entrée fautive (leçon inexistante...) soit remise en attente
+   */
+  async writeIsolated(entries) {
+    try {
+      const records = await this.writeEntries(entries);
+
+      this.stats.rowsWritten += entries.length;
+      entries.forEach((entry, index) => entry.waiters.forEach(waiter => waiter.resolve(records[index])));
+    } catch (error) {
+      if (entries.length > 1) {
+        const middle = Math.ceil(entries.length / 2);
+        await this.writeIsolated(entries.slice(0, middle));
+        await this.writeIsolated(entries.slice(middle));
+        return;
+      }
+
+      this.stats.failures++;
+      logger.error(`❌ Écriture du progrès échouée (élève ${entries[0].studentId}, leçon ${entries[0].lessonId}):`, error);
+      this.requeue(entries, error);
+    }
+  }
+
+  async writeEntries(entries) {
+    const { Progress, Lesson, sequelize } = this.getModels();
+
+    return sequelize.transaction(async (transaction) => {
+      // Une seule lecture pour conserver les valeurs monotones (pourcentage, meilleur score, dates)
+      const existing = new Map();
+      for (let i = 0; i < entries.length; i += READ_CHUNK_SIZE) {
+        const chunk = entries.slice(i, i + READ_CHUNK_SIZE);
+        const rows = await Progress.findAll({
+          where: {
+            [Op.or]: chunk.map(entry => ({ studentId: entry.studentId, lessonId: entry.lessonId }))
+          },
+          attributes: ['studentId', 'lessonId', 'status', 'completionPercentage', 'bestScore', 'startedAt', 'completedAt'],
+          transaction,
+          raw: true
+        });
+        this.stats.dbStatements++;
+        rows.forEach(row => existing.set(`${row.studentId}:${row.lessonId}`, row));
+      }
+
+      const now = new Date();
+      const records = entries.map(entry => {
+        const current = existing.get(`${entry.studentId}:${entry.lessonId}`);
+        const completionPercentage = Math.max(entry.completionPercentage, current ? current.completionPercentage : 0);
+        const bestScores = [entry.bestScore, current && current.bestScore].filter(score => score !== null && score !== undefined);
+        const alreadyDone = current && ['completed', 'mastered'].includes(current.status);
+
+        return {
+          studentId: entry.studentId,
+          lessonId: entry.lessonId,
+          status: alreadyDone ? current.status : (completionPercentage >= 100 ? 'completed' : 'in_progress'),
+          completionPercentage,
+          lastScore: entry.lastScore,
+          bestScore: bestScores.length ? Math.max(...bestScores) : null,
+          startedAt: (current && current.startedAt) || entry.firstAt,
+          lastActivityAt: entry.lastActivityAt,
+          completedAt: (current && current.completedAt) || (completionPercentage >= 100 ? now : null),
+          updatedAt: now
+        };
+      });
+
+      await Progress.bulkCreate(records, {
+        transaction,
+        conflictAttributes: ['studentId', 'lessonId'],
+        updateOnDuplicate: UPSERT_FIELDS
+      });
+      this.stats.dbStatements++;
+
+      await this.applyLessonStats(Lesson, records, existing, transaction);
+
+      return records;
+    });
+  }
+
+  /**
+   * Équivalent groupé des hooks afterCreate / afterUpdate de Progress: une vue par nouveau
+   * couple (élève, leçon), une complétion et son score par passage au statut "completed"
+   */
+  async applyLessonStats(Lesson, records, existing, transaction) {
+    const changes = new Map();
+    records.forEach(record => {
+      const current = existing.get(`${record.studentId}:${record.lessonId}`);
+      const change = changes.get(record.lessonId) || { views: 0, completions: [] };
+      if (!current) {
+        change.views++;
+      } else if (current.status !== 'completed' && record.status === 'completed') {
+        change.completions.push(record.lastScore);
+      } else {
+        return;
+      }
+      changes.set(record.lessonId, change);
+    });
+    if (changes.size === 0) return;
+
+    const lessons = await Lesson.findAll({ where: { id: [...changes.keys()] }, transaction });
+    this.stats.dbStatements++;
+
+    for (const lesson of lessons) {
+      const change = changes.get(lesson.id);
+      const stats = { ...(lesson.stats || {}) };
+      stats.viewCount = (stats.viewCount || 0) + change.views;
+      change.completions.forEach(score => {
+        stats.completionCount = (stats.completionCount || 0) + 1;
+        if (score) {
+          // Même moyenne que Lesson.updateStats('score') appelé après updateStats('complete')
+          stats.averageScore = Math.round(((stats.averageScore || 0) * stats.completionCount + score) / (stats.completionCount + 1));
+        }
+      });
+      await lesson.update({ stats }, { transaction });
+      this.stats.dbStatements++;
+    }
+  }
+
+  /**
+   * Remet en attente les entrées d'une écriture échouée (fusionnées avec les plus récentes)
+   */
+  requeue(entries, error) {
+    for (const entry of entries) {
+      entry.retries++;
+      if (entry.retries > MAX_RETRIES) {
+        logger.error(`❌ Progrès abandonné après ${MAX_RETRIES} tentatives: élève ${entry.studentId}, leçon ${entry.lessonId}`);
+        entry.waiters.forEach(waiter => waiter.reject(error));
+        continue;
+      }
+
+      const key = `${entry.studentId}:${entry.lessonId}`;
+      const newer = this.pending.get(key);
+      if (newer) {
+        newer.completionPercentage = Math.max(newer.completionPercentage, entry.completionPercentage);
+        if (newer.lastScore === null) newer.lastScore = entry.lastScore;
+        if (entry.bestScore !== null) {
+          newer.bestScore = newer.bestScore === null ? entry.bestScore : Math.max(newer.bestScore, entry.bestScore);
+        }
+        newer.firstAt = entry.firstAt;
+        newer.waiters.unshift(...entry.waiters);
+        newer.retries = Math.max(newer.retries, entry.retries);
+      } else {
+        this.pending.set(key, entry);
+      }
+    }
+
+    if (this.pending.size > 0 && !this.closed) this.schedule();
+  }
+
+  /**
+   * Arrêt du serveur: plus de fenêtre de fusion, tout ce qui est en attente est écrit
+   */
+  async close() {
+    this.closed = true;
+    for (let attempt = 0; attempt <= MAX_RETRIES && this.pending.size > 0; attempt++) {
+      await this.flush();
+    }
+    await this.flushing;
+
+    if (this.pending.size > 0) {
+      logger.error(`❌ ${this.pending.size} progrès non écrits à l'arrêt`);
+    } else {
+      logger.info('✅ Progrès en attente écrits');
+    }
+  }
+
+  getStats() {
+    return {
+      windowMs: this.windowMs,
+      pending: this.pending.size,
+      ...this.stats
+    };
+  }
+}
+
+module.exports = new ProgressWriteBuffer();
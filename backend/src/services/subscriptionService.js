@@ -5,6 +5,41 @@
 
 const { Op } = require('sequelize');
 const logger = require('../utils/logger');
+const notificationQueue = require('./notificationQueue');
+
+// Plans payants: un essai expiré suspend le compte jusqu'au paiement
+const SUSPENDED_ON_TRIAL_END = ['INDIVIDUAL_STUDENT', 'FAMILY_MANAGER'];
+const TRIAL_EXPIRY_BATCH_SIZE = parseInt(process.env.TRIAL_EXPIRY_BATCH_SIZE) || 1000;
+
+// Groupes de plans traités par UPDATE groupé (mêmes règles que le traitement ligne par ligne)
+const TRIAL_EXPIRY_GROUPS = [
+  {
+    name: 'suspended',
+    planWhere: { subscriptionPlan: { [Op.in]: SUSPENDED_ON_TRIAL_END } },
+    values: { subscriptionStatus: 'SUSPENDED', isActive: false },
+    notification: {
+      title: 'Essai gratuit terminé',
+      message: 'Votre essai gratuit est terminé. Votre compte est suspendu jusqu\'au paiement de votre abonnement.',
+      priority: 'high'
+    }
+  },
+  {
+    name: 'expired',
+    // subscriptionPlan NULL compris: NOT IN l'exclurait
+    planWhere: {
+      [Op.or]: [
+        { subscriptionPlan: { [Op.notIn]: SUSPENDED_ON_TRIAL_END } },
+        { subscriptionPlan: null }
+      ]
+    },
+    values: { subscriptionStatus: 'EXPIRED' },
+    notification: {
+      title: 'Essai gratuit terminé',
+      message: 'Votre essai gratuit est terminé. Abonnez-vous pour continuer à profiter de Claudyne.',
+      priority: 'normal'
+    }
+  }
+];
 
 class SubscriptionService {
   constructor(models) {
@@ -14,8 +49,163 @@ class SubscriptionService {
   /**
    * Vérifier et expirer les essais gratuits
    * Exécuté quotidiennement à minuit
+   * mode 'bulk' (défaut, TRIAL_EXPIRY_MODE): UPDATE groupés par plan et par lots
+   * mode 'row': ancien traitement compte par compte
+   */
+  async checkExpiredTrials({ mode = process.env.TRIAL_EXPIRY_MODE || 'bulk', batchSize } = {}) {
+    if (mode === 'row') {
+      return this.checkExpiredTrialsRowByRow();
+    }
+    return this.expireTrialsInBulk({ batchSize });
+  }
+
+  /**
+   * Expiration des essais par lots: pour chaque groupe de plans, pages de comptes par id
+   * croissant verrouillées puis mises à jour en un seul UPDATE. Les notifications partent
+   * dans la file asynchrone; les métriques (lignes, durée par lot, attente de verrous)
+   * sont journalisées et retournées.
+   */
+  async expireTrialsInBulk({ batchSize = TRIAL_EXPIRY_BATCH_SIZE } = {}) {
+    try {
+      const { User, sequelize } = this.models;
+      const now = new Date();
+      const started = Date.now();
+
+      logger.info('🔍 Vérification des essais expirés (par lots)...', {
+        service: 'subscription-service',
+        action: 'check_expired_trials',
+        batchSize,
+        timestamp: now
+      });
+
+      const counts = { suspended: 0, expired: 0 };
+      const batchDurations = [];
+      const lockWaits = [];
+      let notificationsQueued = 0;
+
+      for (const group of TRIAL_EXPIRY_GROUPS) {
+        let lastId = null;
+
+        for (;;) {
+          const batchStarted = Date.now();
+
+          const batch = await sequelize.transaction(async (transaction) => {
+            // Lecture + verrouillage des lignes du lot (FOR UPDATE sous PostgreSQL):
+            // sa durée mesure l'attente de verrous face aux écritures concurrentes
+            const lockStarted = Date.now();
+            const users = await User.findAll({
+              attributes: ['id', 'subscriptionPlan', 'trialEndsAt'],
+              where: {
+                subscriptionStatus: 'TRIAL',
+                trialEndsAt: { [Op.lte]: now },
+                isActive: true,
+                ...(lastId ? { id: { [Op.gt]: lastId } } : {}),
+                [Op.and]: [group.planWhere]
+              },
+              order: [['id', 'ASC']],
+              limit: batchSize,
+              lock: transaction.LOCK.UPDATE,
+              raw: true,
+              transaction
+            });
+            const lockWaitMs = Date.now() - lockStarted;
+
+            if (users.length === 0) {
+              return { users, updated: 0, lockWaitMs };
+            }
+
+            const [updated] = await User.update(group.values, {
+              where: {
+                id: { [Op.in]: users.map(user => user.id) },
+                subscriptionStatus: 'TRIAL'
+              },
+              hooks: false,
+              transaction
+            });
+
+            return { users, updated, lockWaitMs };
+          });
+
+          if (batch.users.length === 0) break;
+
+          lastId = batch.users[batch.users.length - 1].id;
+          counts[group.name] += batch.updated;
+
+          const batchMs = Date.now() - batchStarted;
+          batchDurations.push(batchMs);
+          lockWaits.push(batch.lockWaitMs);
+
+          notificationsQueued += notificationQueue.enqueue(batch.users.map(user => ({
+            userId: user.id,
+            type: 'subscription_expired',
+            title: group.notification.title,
+            message: group.notification.message,
+            priority: group.notification.priority,
+            data: {
+              reason: 'trial_ended',
+              status: group.values.subscriptionStatus,
+              plan: user.subscriptionPlan,
+              trialEndedAt: user.trialEndsAt
+            }
+          })));
+
+          logger.info(`📦 Lot essais expirés (${group.name}): ${batch.updated} comptes en ${batchMs} ms`, {
+            service: 'subscription-service',
+            metric: 'trial_expiry_batch',
+            group: group.name,
+            rows: batch.updated,
+            batchMs,
+            lockWaitMs: batch.lockWaitMs
+          });
+
+          if (batch.users.length < batchSize) break;
+        }
+      }
+
+      const sortedDurations = [...batchDurations].sort((a, b) => a - b);
+      const percentile = p => sortedDurations.length
+        ? sortedDurations[Math.min(sortedDurations.length - 1, Math.floor(sortedDurations.length * p))]
+        : 0;
+
+      const result = {
+        mode: 'bulk',
+        total: counts.suspended + counts.expired,
+        expired: counts.expired,
+        suspended: counts.suspended,
+        notificationsQueued,
+        metrics: {
+          durationMs: Date.now() - started,
+          batches: batchDurations.length,
+          batchMs: {
+            p50: percentile(0.5),
+            p95: percentile(0.95),
+            max: sortedDurations.length ? sortedDurations[sortedDurations.length - 1] : 0
+          },
+          lockWaitMs: {
+            total: lockWaits.reduce((sum, ms) => sum + ms, 0),
+            max: lockWaits.length ? Math.max(...lockWaits) : 0
+          }
+        }
+      };
+
+      logger.info(`✅ Vérification essais terminée: ${result.expired} expirés, ${result.suspended} suspendus`, {
+        service: 'subscription-service',
+        metric: 'trial_expiry_run',
+        ...result
+      });
+
+      return result;
+
+    } catch (error) {
+      logger.error('❌ Erreur vérification essais expirés:', error);
+      throw error;
+    }
+  }
+
+  /**
+   * Ancien traitement compte par compte (comparaison avec le mode par lots)
    */
-  async checkExpiredTrials() {
+  async checkExpiredTrialsRowByRow() {
     try {
       const { User } = this.models;
       const now = new Date();
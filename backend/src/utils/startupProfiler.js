@@ -0,0 +1,178 @@
+/**
+ * Profilage du démarrage du backend Claudyne
+ * Activé avec STARTUP_PROFILE=true: mesure le temps de chaque require (inclusif et propre),
+ * les étapes du démarrage (routes, base de données, Redis, écoute HTTP) et les premières
+ * initialisations paresseuses (modèles). Le rapport est journalisé à l'écoute du serveur et
+ * écrit en JSON dans STARTUP_PROFILE_FILE (lu par scripts/test/benchmark-cold-start.py).
+ *
+ * Doit être chargé avant tout autre module pour que les requires soient mesurés.
+ */
+
+const Module = require('module');
+const fs = require('fs');
+const path = require('path');
+const { performance } = require('perf_hooks');
+
+const enabled = process.env.STARTUP_PROFILE === 'true';
+const outputFile = process.env.STARTUP_PROFILE_FILE;
+const backendRoot = path.join(__dirname, '..', '..');
+
+// Temps écoulé depuis le lancement du processus (inclut le démarrage de Node)
+const now = () => performance.now();
+
+const requires = new Map();
+const phases = [];
+const spans = [];
+let lastMark = now();
+let listenedAt = null;
+
+/**
+ * Nom lisible d'un module: paquet npm ou chemin relatif au backend
+ */
+function moduleLabel(filename) {
+  const marker = `node_modules${path.sep}`;
+  const index = filename.lastIndexOf(marker);
+  if (index !== -1) {
+    const parts = filename.slice(index + marker.length).split(path.sep);
+    return parts[0].startsWith('@') ? `${parts[0]}/${parts[1]}` : parts[0];
+  }
+  return path.relative(backendRoot, filename);
+}
+
+if (enabled) {
+  // Amorçage de Node avant le chargement de ce module
+  phases.push({ phase: 'node', ms: lastMark, atMs: lastMark });
+
+  const originalLoad = Module._load;
+  const stack = [];
+
+  Module._load = function profiledLoad(request, parent, isMain) {
+    let filename;
+    try {
+      filename = Module._resolveFilename(request, parent, isMain);
+    } catch (error) {
+      return originalLoad.apply(this, arguments);
+    }
+
+    // Modules internes et modules déjà en cache: coût négligeable
+    if (!path.isAbsolute(filename) || Module._cache[filename]) {
+      return originalLoad.apply(this, arguments);
+    }
+
+    const frame = { start: now(), children: 0 };
+    stack.push(frame);
+    try {
+      return originalLoad.apply(this, arguments);
+    } finally {
+      stack.pop();
+      const inclusive = now() - frame.start;
+      if (stack.length) stack[stack.length - 1].children += inclusive;
+
+      // Les fichiers d'un même paquet npm sont regroupés sous le nom du paquet
+      const label = moduleLabel(filename);
+      const entry = requires.get(label) || { module: label, files: 0, selfMs: 0, inclusiveMs: 0 };
+      entry.files++;
+      entry.selfMs += inclusive - frame.children;
+      // Inclusif: seulement le premier fichier chargé du paquet (celui qui tire les autres)
+      if (entry.files === 1) entry.inclusiveMs = inclusive;
+      requires.set(label, entry);
+    }
+  };
+}
+
+/**
+ * Clôt l'étape courante du démarrage (temps écoulé depuis la marque précédente)
+ */
+function mark(label) {
+  if (!enabled) return;
+  const current = now();
+  phases.push({ phase: label, ms: current - lastMark, atMs: current });
+  lastMark = current;
+}
+
+/**
+ * Mesure une opération asynchrone (connexion BDD, Redis...) sans changer son résultat
+ */
+async function measure(label, fn) {
+  if (!enabled) return fn();
+  const start = now();
+  try {
+    return await fn();
+  } finally {
+    recordSpan(label, start);
+  }
+}
+
+/**
+ * Démarre la mesure d'une opération synchrone; retourne la fonction qui la termine
+ */
+function start(label) {
+  if (!enabled) return () => {};
+  const begin = now();
+  return () => recordSpan(label, begin);
+}
+
+function recordSpan(label, begin) {
+  spans.push({ span: label, ms: now() - begin, atMs: begin, afterListen: listenedAt !== null });
+  // Les spans paresseux (1ère requête) arrivent après l'écoute: on met le rapport à jour
+  if (listenedAt !== null) writeReport();
+}
+
+function buildReport() {
+  const round = (value) => Math.round(value * 10) / 10;
+  const modules = [...requires.values()];
+
+  return {
+    pid: process.pid,
+    node: process.version,
+    listenMs: listenedAt !== null ? round(listenedAt) : null,
+    requireTotalMs: round(modules.reduce((sum, entry) => sum + entry.selfMs, 0)),
+    phases: phases.map(entry => ({ ...entry, ms: round(entry.ms), atMs: round(entry.atMs) })),
+    spans: spans.map(entry => ({ ...entry, ms: round(entry.ms), atMs: round(entry.atMs) })),
+    requires: modules
+      .sort((a, b) => b.selfMs - a.selfMs)
+      .map(entry => ({ ...entry, selfMs: round(entry.selfMs), inclusiveMs: round(entry.inclusiveMs) }))
+  };
+}
+
+function writeReport() {
+  if (!outputFile) return;
+  try {
+    fs.writeFileSync(outputFile, JSON.stringify(buildReport(), null, 2));
+  } catch (error) {
+    // Le profilage ne doit jamais empêcher le démarrage
+  }
+}
+
+/**
+ * À appeler quand le serveur écoute: journalise le résumé et écrit le rapport
+ */
+function listening() {
+  if (!enabled) return;
+  listenedAt = now();
+  mark('listen');
+
+  const report = buildReport();
+  writeReport();
+
+  const logger = require('./logger');
+  logger.info(`⏱️ Démarrage en ${report.listenMs} ms (requires: ${report.requireTotalMs} ms)`);
+  for (const entry of report.phases) {
+    logger.info(`⏱️   étape ${entry.phase}: ${entry.ms} ms`);
+  }
+  for (const entry of report.spans) {
+    logger.info(`⏱️   ${entry.span}: ${entry.ms} ms`);
+  }
+  for (const entry of report.requires.slice(0, 15)) {
+    logger.info(`⏱️   require ${entry.module}: ${entry.selfMs} ms propre / ${entry.inclusiveMs} ms inclusif`);
+  }
+}
+
+module.exports = {
+  enabled,
+  mark,
+  measure,
+  start,
+  listening,
+  buildReport
+};
@@ -5,6 +5,7 @@
 
 const logger = require('../utils/logger');
 const jwt = require('jsonwebtoken');
+const progressWriteBuffer = require('../services/progressWriteBuffer');
 
 // Initialisation des modèles
 let User, Family, Student, Battle, ChatMessage, Notification, Progress;
@@ -386,46 +387,43 @@ function configureSocket(io) {
     // ================================
 
     // Mettre à jour le progrès en temps réel
-    socket.on('progress:update', async (data) => {
+    // Les écritures passent par le tampon d'écriture différée (fusion par élève/leçon)
+    socket.on('progress:update', async (data, ack) => {
       try {
-        const { studentId, lessonId, progress, score } = data;
+        const { studentId } = data || {};
 
-        // Vérifier l'autorisation
-        const student = await Student.findOne({
-          where: { id: studentId, familyId: familyId }
-        });
+        // Un événement invalide est rejeté ici: il ne doit pas faire échouer l'écriture groupée
+        const update = validateProgressUpdate(data);
+        if (update.error) {
+          if (typeof ack === 'function') ack({ success: false, message: update.error });
+          return socket.emit('progress:error', { message: update.error });
+        }
+        const { lessonId, progress, score } = update;
+
+        // Vérifier l'autorisation (mise en cache pour la durée de la connexion)
+        const student = await getAuthorizedStudent(socket, studentId);
 
         if (!student) {
           return socket.emit('progress:error', { message: 'Étudiant non autorisé' });
         }
 
-        // Mettre à jour le progrès
-        const [progressRecord] = await Progress.findOrCreate({
-          where: { studentId: studentId, lessonId: lessonId },
-          defaults: {
-            status: 'IN_PROGRESS',
-            progress: progress,
-            score: score,
-            startedAt: new Date(),
-            lastActivityAt: new Date()
-          }
-        });
+        // Résolu une fois le progrès persisté: la famille ne voit que des données écrites
+        const persisted = progressWriteBuffer.add({ studentId: student.id, lessonId, progress, score });
 
-        await progressRecord.update({
-          progress: progress,
-          score: score,
-          lastActivityAt: new Date(),
-          status: progress >= 100 ? 'COMPLETED' : 'IN_PROGRESS',
-          completedAt: progress >= 100 ? new Date() : null
-        });
+        // Accusé de réception optionnel dès la mise en tampon
+        if (typeof ack === 'function') ack({ success: true, queued: true });
+
+        // Valeurs réellement écrites (fusionnées avec les événements proches et l'existant)
+        const record = await persisted;
 
         // Notifier la famille en temps réel
         io.to(`family_${familyId}`).emit('progress:updated', {
-          studentId: studentId,
+          studentId: student.id,
           lessonId: lessonId,
-          progress: progress,
-          score: score,
-          status: progressRecord.status
+          progress: record.completionPercentage,
+          score: record.lastScore,
+          bestScore: record.bestScore,
+          status: record.status
         });
 
         // Notifier les parents si milestone atteint
@@ -437,12 +435,12 @@ function configureSocket(io) {
               lastName: student.lastName
             },
             lessonId: lessonId,
-            finalScore: score,
+            finalScore: record.lastScore,
             completedAt: new Date()
           });
         }
 
-        logger.info(`Progress updated: Student ${studentId}, Lesson ${lessonId}, Progress ${progress}%`);
+        logger.debug(`Progress updated: Student ${studentId}, Lesson ${lessonId}, Progress ${progress}%`);
 
       } catch (error) {
         logger.error('Progress update error:', error);
@@ -610,6 +608,65 @@ function configureSocket(io) {
   logger.info(`   • Progress tracking`);
 }
 
+/**
+ * Valide un événement progress:update; retourne { lessonId, progress, score } ou { error }
+ */
+function validateProgressUpdate(data) {
+  if (!data || typeof data !== 'object') {
+    return { error: 'Données de progrès manquantes' };
+  }
+
+  const lessonId = Number(data.lessonId);
+  if (!Number.isInteger(lessonId) || lessonId <= 0) {
+    return { error: 'Leçon invalide' };
+  }
+
+  const progress = Number(data.progress);
+  if (data.progress === null || data.progress === undefined || data.progress === '' ||
+      !Number.isFinite(progress) || progress < 0 || progress > 100) {
+    return { error: 'Progrès invalide (0 à 100)' };
+  }
+
+  let score = null;
+  if (data.score !== null && data.score !== undefined && data.score !== '') {
+    score = Number(data.score);
+    if (!Number.isFinite(score) || score < 0 || score > 100) {
+      return { error: 'Score invalide (0 à 100)' };
+    }
+  }
+
+  return { lessonId, progress, score };
+}
+
+/**
+ * Élève autorisé pour la famille du socket; mis en cache sur le socket pour éviter
+ * une requête à chaque événement de progrès
+ */
+async function getAuthorizedStudent(socket, studentId) {
+  if (!socket.authorizedStudents) socket.authorizedStudents = new Map();
+
+  const key = String(studentId);
+  if (socket.authorizedStudents.has(key)) {
+    return socket.authorizedStudents.get(key);
+  }
+
+  const student = await Student.findOne({
+    where: { id: studentId, familyId: socket.familyId },
+    attributes: ['id', 'firstName', 'lastName']
+  });
+
+  // Les refus ne sont pas mis en cache: l'élève peut être ajouté à la famille entre-temps
+  if (student) {
+    socket.authorizedStudents.set(key, {
+      id: student.id,
+      firstName: student.firstName,
+      lastName: student.lastName
+    });
+  }
+
+  return student ? socket.authorizedStudents.get(key) : null;
+}
+
 // ================================
 // FONCTIONS PUBLIQUES
 // ================================
@@ -647,8 +704,27 @@ async function broadcastSystemEvent(event, data) {
   }
 }
 
+/**
+ * Taille de l'état global WebSocket (suivi des fuites en test d'endurance)
+ */
+function getSocketStats() {
+  let battleParticipants = 0;
+  for (const room of battleRooms.values()) {
+    battleParticipants += room.participants.size;
+  }
+
+  return {
+    activeConnections: activeConnections.size,
+    battleRooms: battleRooms.size,
+    battleParticipants,
+    mentorSessions: mentorSessions.size,
+    analyticsSubscribers: analyticsSubscribers.size
+  };
+}
+
 module.exports = {
   configureSocket,
+  getSocketStats,
   sendNotificationToUser,
   sendNotificationToFamily,
   broadcastSystemEvent
@@ -41,6 +41,11 @@ module.exports = {
         PORT: 3001
         // Secrets loaded from .env.production via dotenv in server.js
       },
+      // Rechargement sans trou de service: PM2 attend process.send('ready') (server.listen)
+      // avant d'arrêter l'ancienne instance
+      wait_ready: true,
+      listen_timeout: 30000,
+      kill_timeout: 10000,
       error_file: '/var/log/claudyne/backend-error.log',
       out_file: '/var/log/claudyne/backend-out.log',
       log_file: '/var/log/claudyne/backend-combined.log',
@@ -0,0 +1,21 @@
+// Généré par scripts/utils/asset-budget.py manifest - ne pas modifier à la main
+self.__PRECACHE_MANIFEST = {
+  "version": "dce66aa51281",
+  "assets": [
+    {
+      "url": "/index.html",
+      "revision": "97939ca79fbe53ae8e92c015127aeaefd0200e511395653c2f8d2381d130c2c4",
+      "size": 205581
+    },
+    {
+      "url": "/student-interface-modern.html",
+      "revision": "d270d22673724e75e3e4483708ed7e69b3cfff50bda172874de66ef2ca698836",
+      "size": 381315
+    },
+    {
+      "url": "/manifest.json",
+      "revision": "b833f3cd9a2410fe7647686cbd8acfd2b0c04c76aac75a142e686dce0c87724b",
+      "size": 6915
+    }
+  ]
+};
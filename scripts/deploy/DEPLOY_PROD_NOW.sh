@@ -124,6 +124,13 @@ log_success "Pulled latest changes"
 NEW_COMMIT=$(git rev-parse HEAD)
 log_info "Current commit: $NEW_COMMIT"
 
+# Un manifeste de précache périmé figerait les appareils sur d'anciennes pages
+if ! python3 scripts/utils/asset-budget.py manifest --check; then
+    log_error "precache-manifest.js n'est pas à jour: lancez npm run assets:manifest et committez"
+    exit 1
+fi
+log_success "Manifeste de précache à jour"
+
 echo ""
 
 #############################################################################
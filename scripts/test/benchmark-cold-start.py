@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark du démarrage à froid du backend Claudyne
+
+Lance plusieurs fois backend/src/server.js en local (comme après un
+redémarrage PM2) et mesure pour chaque lancement:
+- le temps jusqu'au premier /api/health en 200
+- le temps jusqu'au premier /api/public/content réussi (modèles initialisés,
+  requêtes BDD exécutées)
+- le détail du démarrage fourni par le mode STARTUP_PROFILE du serveur:
+  étapes, requires les plus lents, connexions BDD/Redis, initialisation des modèles
+
+Le résultat est comparé à un budget pour suivre les régressions en local.
+
+Usage:
+    python3 scripts/test/benchmark-cold-start.py --runs 5
+    python3 scripts/test/benchmark-cold-start.py --runs 10 --budget-health 3000 \\
+        --budget-content 5000 --json demarrage.json
+    NODE_ENV=production python3 scripts/test/benchmark-cold-start.py --runs 3 --top 25
+"""
+
+import argparse
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+SERVER_PATH = os.path.join(REPO_ROOT, 'backend', 'src', 'server.js')
+
+
+def print_section(title):
+    print(f"\n{'='*60}")
+    print(f"  {title}")
+    print('='*60)
+
+
+def wait_for(url, deadline, accept):
+    """Interroge l'URL en boucle serrée jusqu'à une réponse acceptée; retourne l'instant ou None"""
+    while time.monotonic() < deadline:
+        try:
+            response = requests.get(url, timeout=5)
+            if accept(response):
+                return time.monotonic()
+        except requests.RequestException:
+            pass
+        time.sleep(0.02)
+    return None
+
+
+def content_ok(response):
+    if response.status_code != 200:
+        return False
+    try:
+        return response.json().get('success', False)
+    except ValueError:
+        return False
+
+
+def stop_server(process):
+    if process.poll() is not None:
+        return
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def run_once(args, index):
+    """Un démarrage à froid complet; retourne les mesures du lancement"""
+    profile_fd, profile_path = tempfile.mkstemp(prefix='claudyne-startup-', suffix='.json')
+    os.close(profile_fd)
+    log_path = os.path.join(args.log_dir, f"cold-start-{index}.log") if args.log_dir else os.devnull
+
+    env = dict(os.environ)
+    env.update({
+        'PORT': str(args.port),
+        'STARTUP_PROFILE': 'true',
+        'STARTUP_PROFILE_FILE': profile_path
+    })
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    result = {'run': index, 'healthMs': None, 'contentMs': None, 'exitCode': None}
+
+    with open(log_path, 'w') as log:
+        started = time.monotonic()
+        process = subprocess.Popen([args.node, args.server], cwd=REPO_ROOT, env=env,
+                                   stdout=log, stderr=subprocess.STDOUT)
+        try:
+            deadline = started + args.timeout
+            healthy_at = wait_for(f"{base_url}{args.health_path}", deadline,
+                                  lambda response: response.status_code == 200)
+            if healthy_at is not None:
+                result['healthMs'] = round((healthy_at - started) * 1000, 1)
+                content_at = wait_for(f"{base_url}{args.content_path}", deadline, content_ok)
+                if content_at is not None:
+                    result['contentMs'] = round((content_at - started) * 1000, 1)
+            result['exitCode'] = process.poll()
+        finally:
+            stop_server(process)
+
+    try:
+        with open(profile_path, 'r', encoding='utf-8') as f:
+            result['profile'] = json.load(f)
+    except (OSError, ValueError):
+        result['profile'] = None
+    finally:
+        os.remove(profile_path)
+
+    return result
+
+
+def median(values):
+    values = [value for value in values if value is not None]
+    return round(statistics.median(values), 1) if values else None
+
+
+def summarize(results, top):
+    profiles = [result['profile'] for result in results if result.get('profile')]
+
+    phases = {}
+    spans = {}
+    modules = {}
+    for profile in profiles:
+        for entry in profile['phases']:
+            phases.setdefault(entry['phase'], []).append(entry['ms'])
+        for entry in profile['spans']:
+            # Un même span peut apparaître plusieurs fois (plusieurs instances): on additionne
+            per_run = spans.setdefault(entry['span'], {})
+            per_run[profile['pid']] = per_run.get(profile['pid'], 0) + entry['ms']
+        for entry in profile['requires']:
+            modules.setdefault(entry['module'], []).append(entry)
+
+    slow_modules = sorted(
+        (
+            {
+                'module': name,
+                'selfMs': median([entry['selfMs'] for entry in entries]),
+                'inclusiveMs': median([entry['inclusiveMs'] for entry in entries]),
+                'files': entries[0]['files']
+            }
+            for name, entries in modules.items()
+        ),
+        key=lambda entry: entry['selfMs'] or 0,
+        reverse=True
+    )
+
+    return {
+        'runs': len(results),
+        'healthMs': {
+            'median': median([result['healthMs'] for result in results]),
+            'max': max((result['healthMs'] for result in results if result['healthMs'] is not None), default=None)
+        },
+        'contentMs': {
+            'median': median([result['contentMs'] for result in results]),
+            'max': max((result['contentMs'] for result in results if result['contentMs'] is not None), default=None)
+        },
+        'listenMs': median([profile['listenMs'] for profile in profiles]),
+        'requireTotalMs': median([profile['requireTotalMs'] for profile in profiles]),
+        'phases': {name: median(values) for name, values in phases.items()},
+        'spans': {name: median(list(per_run.values())) for name, per_run in spans.items()},
+        'slowestRequires': slow_modules[:top]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du démarrage à froid du backend")
+    parser.add_argument('--runs', type=int, default=5, help="Nombre de démarrages (défaut: 5)")
+    parser.add_argument('--port', type=int, default=3099, help="Port utilisé par le serveur testé (défaut: 3099)")
+    parser.add_argument('--node', default='node', help="Exécutable Node.js (défaut: node)")
+    parser.add_argument('--server', default=SERVER_PATH, help="Script serveur (défaut: backend/src/server.js)")
+    parser.add_argument('--health-path', default='/api/health', help="Endpoint de santé (défaut: /api/health)")
+    parser.add_argument('--content-path', default='/api/public/content',
+                        help="Première requête applicative (défaut: /api/public/content)")
+    parser.add_argument('--timeout', type=float, default=90, help="Abandon d'un démarrage après N s (défaut: 90)")
+    parser.add_argument('--budget-health', type=float, default=5000,
+                        help="Budget médian jusqu'au health en ms (défaut: 5000)")
+    parser.add_argument('--budget-content', type=float, default=8000,
+                        help="Budget médian jusqu'au premier contenu en ms (défaut: 8000)")
+    parser.add_argument('--top', type=int, default=15, help="Nombre de requires les plus lents affichés (défaut: 15)")
+    parser.add_argument('--log-dir', help="Conserve la sortie du serveur de chaque lancement dans ce dossier")
+    parser.add_argument('--json', help="Écrit le rapport complet en JSON")
+    args = parser.parse_args()
+
+    if args.log_dir:
+        os.makedirs(args.log_dir, exist_ok=True)
+
+    print_section("🚀 BENCHMARK DÉMARRAGE À FROID")
+    print(f"   {args.server} | {args.runs} lancements | port {args.port}")
+
+    results = []
+    for index in range(1, args.runs + 1):
+        result = run_once(args, index)
+        results.append(result)
+        listen = result['profile']['listenMs'] if result.get('profile') else None
+        status = "✅" if result['contentMs'] is not None else "❌"
+        print(f"   {status} Lancement {index}: listen {listen} ms | health {result['healthMs']} ms"
+              f" | contenu {result['contentMs']} ms"
+              + (f" | sortie prématurée (code {result['exitCode']})" if result['exitCode'] is not None else ""))
+
+    summary = summarize(results, args.top)
+
+    print_section("📊 RÉSULTATS (médianes)")
+    print(f"   Premier health:   {summary['healthMs']['median']} ms (max {summary['healthMs']['max']})")
+    print(f"   Premier contenu:  {summary['contentMs']['median']} ms (max {summary['contentMs']['max']})")
+    print(f"   Écoute HTTP:      {summary['listenMs']} ms (requires: {summary['requireTotalMs']} ms)")
+
+    if summary['phases']:
+        print("\n   Étapes:")
+        for name, value in summary['phases'].items():
+            print(f"      {name:<24} {value:>8} ms")
+    if summary['spans']:
+        print("\n   Opérations:")
+        for name, value in sorted(summary['spans'].items(), key=lambda item: -(item[1] or 0)):
+            print(f"      {name:<24} {value:>8} ms")
+    if summary['slowestRequires']:
+        print("\n   Requires les plus lents (temps propre / inclusif):")
+        for entry in summary['slowestRequires']:
+            print(f"      {entry['module']:<40} {entry['selfMs']:>8} ms / {entry['inclusiveMs']:>8} ms")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'summary': summary, 'runs': results}, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Rapport écrit dans {args.json}")
+
+    problems = []
+    if any(result['contentMs'] is None for result in results):
+        failed = sum(1 for result in results if result['contentMs'] is None)
+        problems.append(f"{failed} lancement(s) sans réponse dans les {args.timeout:.0f}s")
+    if summary['healthMs']['median'] and summary['healthMs']['median'] > args.budget_health:
+        problems.append(f"health médian {summary['healthMs']['median']} ms > budget {args.budget_health:.0f} ms")
+    if summary['contentMs']['median'] and summary['contentMs']['median'] > args.budget_content:
+        problems.append(f"contenu médian {summary['contentMs']['median']} ms > budget {args.budget_content:.0f} ms")
+
+    if problems:
+        print("\n❌ Budget de démarrage dépassé:")
+        for problem in problems:
+            print(f"   - {problem}")
+        sys.exit(1)
+    print("\n✅ Démarrage dans le budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de l'évaluation Prix Claudine: moteur par lots vs évaluation élève par élève
+
+1. Peuple (optionnellement) la base avec un jeu de données reproductible via
+   backend/src/scripts/seed-prix-claudine-bench.js (élèves, progrès, participations)
+2. Lance POST /api/admin/prix-claudine/evaluate à blanc (sans attribution de prix) avec
+   chaque stratégie, suit la progression sur GET /api/admin/prix-claudine/evaluate
+3. Compare durées et débits, puis vérifie que les deux chemins produisent les mêmes
+   métriques et les mêmes prix éligibles pour chaque élève
+
+Le serveur doit utiliser la même base que le script de peuplement (même .env).
+
+Usage:
+    python3 scripts/test/benchmark-prix-claudine.py --seed-students 2000 --progress 40
+    python3 scripts/test/benchmark-prix-claudine.py --runs 3 --chunk-size 500 --concurrency 4 \\
+        --min-speedup 5 --json prix-bench.json
+    python3 scripts/test/benchmark-prix-claudine.py --cleanup-only
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import requests
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+SEED_SCRIPT = os.path.join(REPO_ROOT, 'backend', 'src', 'scripts', 'seed-prix-claudine-bench.js')
+TARGET_URL = "http://localhost:3001"
+ADMIN_KEY = os.environ.get("CLAUDYNE_ADMIN_KEY", "claudyne-admin-2024")
+
+
+def print_section(title):
+    print(f"\n{'='*60}")
+    print(f"  {title}")
+    print('='*60)
+
+
+def get_admin_token(api_url, admin_key):
+    response = requests.post(f"{api_url}/admin/generate-token", json={"adminKey": admin_key}, timeout=15)
+    data = response.json()
+    if not data.get('success'):
+        print("❌ Échec génération token")
+        sys.exit(1)
+    return data['token']
+
+
+def run_seed(args, *extra):
+    command = [args.node, SEED_SCRIPT, *extra]
+    result = subprocess.run(command, cwd=REPO_ROOT, capture_output=True, text=True)
+    output = (result.stdout + result.stderr).strip()
+    if output:
+        print(f"   {output}")
+    if result.returncode != 0:
+        print("❌ Échec du script de peuplement")
+        sys.exit(1)
+
+
+def evaluate(api_url, headers, payload, poll_interval, timeout):
+    """Démarre une évaluation et suit sa progression jusqu'à la fin; retourne l'état final"""
+    response = requests.post(f"{api_url}/admin/prix-claudine/evaluate", json=payload, headers=headers, timeout=30)
+    data = response.json()
+    if response.status_code not in (200, 202) or not data.get('success'):
+        raise RuntimeError(f"démarrage refusé: HTTP {response.status_code} {data.get('message')}")
+
+    deadline = time.monotonic() + timeout
+    last_percent = None
+    while time.monotonic() < deadline:
+        time.sleep(poll_interval)
+        response = requests.get(f"{api_url}/admin/prix-claudine/evaluate", headers=headers, timeout=30)
+        status = response.json()['data']
+        if status['status'] != 'running':
+            return status
+        if status['percent'] != last_percent:
+            last_percent = status['percent']
+            print(f"      … {status['percent']:5.1f}% ({status['processedStudents']}/{status['totalStudents']}, "
+                  f"{status['studentsPerSecond']} élèves/s, fin dans ~{status['etaSeconds'] or '?'}s)", end='\r')
+    raise RuntimeError(f"évaluation non terminée après {timeout:.0f}s")
+
+
+def fetch_results(api_url, headers):
+    response = requests.get(f"{api_url}/admin/prix-claudine/evaluate", params={'includeResults': 'true'},
+                            headers=headers, timeout=120)
+    return {entry['studentId']: entry for entry in response.json()['data'].get('results', [])}
+
+
+def diff_values(left, right, tolerance, path=''):
+    """Différences entre deux structures JSON (nombres comparés avec une tolérance)"""
+    if isinstance(left, dict) and isinstance(right, dict):
+        differences = []
+        for key in sorted(set(left) | set(right)):
+            differences += diff_values(left.get(key), right.get(key), tolerance, f"{path}.{key}" if path else key)
+        return differences
+    if isinstance(left, list) and isinstance(right, list):
+        if len(left) != len(right):
+            return [f"{path}: {len(left)} éléments vs {len(right)}"]
+        differences = []
+        for index, (a, b) in enumerate(zip(left, right)):
+            differences += diff_values(a, b, tolerance, f"{path}[{index}]")
+        return differences
+    if isinstance(left, (int, float)) and isinstance(right, (int, float)) \
+            and not isinstance(left, bool) and not isinstance(right, bool):
+        return [] if abs(left - right) <= tolerance else [f"{path}: {left} vs {right}"]
+    return [] if left == right else [f"{path}: {left!r} vs {right!r}"]
+
+
+def compare_results(reference, candidate, tolerance):
+    mismatches = []
+    for student_id in sorted(set(reference) | set(candidate)):
+        if student_id not in reference or student_id not in candidate:
+            mismatches.append((student_id, ["élève absent d'une des évaluations"]))
+            continue
+        differences = diff_values(
+            {'metrics': reference[student_id]['metrics'], 'prizes': reference[student_id]['eligiblePrizes']},
+            {'metrics': candidate[student_id]['metrics'], 'prizes': candidate[student_id]['eligiblePrizes']},
+            tolerance
+        )
+        if differences:
+            mismatches.append((student_id, differences))
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de l'évaluation Prix Claudine")
+    parser.add_argument('--target', default=TARGET_URL, help=f"URL du backend (défaut: {TARGET_URL})")
+    parser.add_argument('--admin-token', help="Token admin (sinon généré)")
+    parser.add_argument('--node', default='node', help="Exécutable Node.js pour le peuplement (défaut: node)")
+    parser.add_argument('--seed-students', type=int, default=0,
+                        help="Élèves de banc d'essai à créer avant le benchmark (défaut: 0 = données existantes)")
+    parser.add_argument('--progress', type=int, default=30, help="Progrès moyens par élève créé (défaut: 30)")
+    parser.add_argument('--battles', type=int, default=5, help="Participations moyennes par élève créé (défaut: 5)")
+    parser.add_argument('--seed', type=int, default=42, help="Graine du jeu de données (défaut: 42)")
+    parser.add_argument('--cleanup', action='store_true', help="Supprime le jeu de données de banc d'essai à la fin")
+    parser.add_argument('--cleanup-only', action='store_true', help="Supprime le jeu de données et quitte")
+    parser.add_argument('--runs', type=int, default=1, help="Évaluations par stratégie (défaut: 1)")
+    parser.add_argument('--chunk-size', type=int, default=200, help="Élèves par page (défaut: 200)")
+    parser.add_argument('--concurrency', type=int, default=2, help="Pages en parallèle du moteur par lots (défaut: 2)")
+    parser.add_argument('--poll-interval', type=float, default=0.5, help="Intervalle de suivi en s (défaut: 0.5)")
+    parser.add_argument('--timeout', type=float, default=3600, help="Durée max d'une évaluation en s (défaut: 3600)")
+    parser.add_argument('--tolerance', type=float, default=0.01,
+                        help="Écart numérique toléré entre les deux chemins (défaut: 0.01)")
+    parser.add_argument('--min-speedup', type=float, default=2.0,
+                        help="Accélération minimale attendue du moteur par lots (défaut: 2.0)")
+    parser.add_argument('--json', help="Écrit le rapport en JSON")
+    args = parser.parse_args()
+
+    if args.cleanup_only:
+        print_section("🧹 NETTOYAGE")
+        run_seed(args, '--cleanup')
+        return
+
+    if args.seed_students:
+        print_section("🌱 PEUPLEMENT")
+        run_seed(args, '--students', str(args.seed_students), '--progress', str(args.progress),
+                 '--battles', str(args.battles), '--seed', str(args.seed))
+
+    api_url = f"{args.target}/api"
+    admin_token = args.admin_token or get_admin_token(api_url, ADMIN_KEY)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    # Le chemin élève par élève est celui de l'ancienne boucle: séquentiel
+    strategies = {
+        'per-student': {'strategy': 'per-student', 'concurrency': 1},
+        'batch': {'strategy': 'batch', 'concurrency': args.concurrency}
+    }
+
+    runs = {name: [] for name in strategies}
+    results = {}
+    try:
+        for name, settings in strategies.items():
+            print_section(f"🏆 STRATÉGIE {name}")
+            for index in range(1, args.runs + 1):
+                payload = {**settings, 'award': False, 'chunkSize': args.chunk_size,
+                           'collectResults': index == args.runs}
+                status = evaluate(api_url, headers, payload, args.poll_interval, args.timeout)
+                if status['status'] != 'completed':
+                    raise RuntimeError(f"évaluation {name} en échec: {status.get('error')}")
+                runs[name].append(status)
+                print(f"   ✅ Run {index}: {status['processedStudents']} élèves en {status['durationMs']} ms "
+                      f"({status['studentsPerSecond']} élèves/s, {status['eligibleStudents']} éligibles)" + " " * 20)
+            results[name] = fetch_results(api_url, headers)
+    except (RuntimeError, requests.RequestException, ValueError) as error:
+        print(f"\n❌ {error}")
+        sys.exit(1)
+    finally:
+        if args.cleanup:
+            print_section("🧹 NETTOYAGE")
+            run_seed(args, '--cleanup')
+
+    durations = {name: statistics.median(run['durationMs'] for run in entries) for name, entries in runs.items()}
+    speedup = durations['per-student'] / durations['batch'] if durations['batch'] else None
+    mismatches = compare_results(results['per-student'], results['batch'], args.tolerance)
+
+    print_section("📊 RÉSULTATS")
+    students = runs['batch'][-1]['processedStudents']
+    for name, duration in durations.items():
+        print(f"   {name:<12} {duration:>10.0f} ms (médiane) | {students / (duration / 1000):8.1f} élèves/s")
+    if speedup:
+        print(f"   Accélération: x{speedup:.1f}")
+    print(f"   Élèves comparés: {len(results['batch'])} | différences: {len(mismatches)}")
+    for student_id, differences in mismatches[:10]:
+        print(f"      {student_id}: {'; '.join(differences[:3])}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'students': students,
+                'durationsMs': durations,
+                'speedup': speedup,
+                'runs': runs,
+                'mismatches': [{'studentId': student_id, 'differences': differences}
+                               for student_id, differences in mismatches]
+            }, f, indent=2, ensure_ascii=False, default=str)
+        print(f"\n💾 Rapport écrit dans {args.json}")
+
+    problems = []
+    if mismatches:
+        problems.append(f"{len(mismatches)} élève(s) évalué(s) différemment par les deux chemins")
+    if speedup is not None and speedup < args.min_speedup:
+        problems.append(f"accélération x{speedup:.1f} < x{args.min_speedup}")
+
+    if problems:
+        print("\n❌ Benchmark en échec:")
+        for problem in problems:
+            print(f"   - {problem}")
+        sys.exit(1)
+    print("\n✅ Moteur par lots conforme et plus rapide")
+
+
+if __name__ == "__main__":
+    main()
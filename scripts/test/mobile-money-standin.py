@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Simulateur local des API MTN MoMo et Orange Money
+
+Remplace les sandbox opérateurs pendant les tests de charge des paiements:
+latence et taux d'échec configurables, limite de débit (HTTP 429) par
+opérateur et callbacks asynchrones vers le backend après "confirmation"
+du paiement par l'abonné.
+
+Endpoints simulés (ceux utilisés par mtnMobileMoney.js / orangeMoneyService.js):
+    MTN     POST /collection/token/
+            POST /collection/v1_0/requesttopay          (X-Reference-Id, X-Callback-Url)
+            GET  /collection/v1_0/requesttopay/{referenceId}
+    Orange  POST /orange/oauth/token
+            POST /orange/webpayment                     (notif_url dans le corps)
+            GET  /orange/transactions/{transactionId}
+    Stats   GET  /_stats   (compteurs lus par payment-load-harness.py)
+            POST /_reset
+
+Configuration du backend:
+    MTN_MOMO_API_URL=http://localhost:8700
+    MTN_MOMO_SUBSCRIPTION_KEY=local MTN_MOMO_API_USER_ID=local MTN_MOMO_API_KEY=local
+    ORANGE_MONEY_API_URL=http://localhost:8700/orange
+    ORANGE_MONEY_CLIENT_ID=local ORANGE_MONEY_CLIENT_SECRET=local ORANGE_MONEY_MERCHANT_KEY=local
+
+Usage:
+    python3 scripts/test/mobile-money-standin.py --port 8700 \\
+        --latency-ms 300 --fail-rate 0.05 --rate-limit 50 \\
+        --confirm-delay 5 30 --callback-base http://localhost:3001
+"""
+
+import argparse
+import heapq
+import json
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+MTN_STATUS_PATH = re.compile(r'^/collection/v1_0/requesttopay/([^/]+)$')
+ORANGE_STATUS_PATH = re.compile(r'^/orange/transactions/([^/]+)$')
+
+TOKEN_TTL = 3600
+
+
+class TokenBucket:
+    """Limite de débit d'un opérateur (requêtes par seconde, rafale = 1 seconde)"""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def allow(self):
+        if not self.rate:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class Stats:
+    """Compteurs exposés sur /_stats"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.started = time.time()
+            self.requests = {}
+            self.rate_limited = {'mtn': 0, 'orange': 0}
+            self.injected_errors = 0
+            self.payments = {'created': 0, 'successful': 0, 'failed': 0, 'duplicates': 0}
+            self.callbacks = {'scheduled': 0, 'sent': 0, 'delivered': 0, 'rejected': 0,
+                              'errors': 0, 'dropped': 0}
+            self.callback_latency_ms = []
+            self.polls_before_final = []
+            self.polls_after_final = 0
+
+    def hit(self, endpoint):
+        with self.lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+
+    def add(self, group, key, value=1):
+        with self.lock:
+            group[key] = group.get(key, 0) + value
+
+    def snapshot(self):
+        with self.lock:
+            elapsed = max(time.time() - self.started, 0.001)
+            latencies = sorted(self.callback_latency_ms)
+            return {
+                'elapsedSeconds': round(elapsed, 1),
+                'requests': dict(self.requests),
+                'rateLimited': dict(self.rate_limited),
+                'injectedErrors': self.injected_errors,
+                'payments': dict(self.payments),
+                'callbacks': {
+                    **self.callbacks,
+                    'deliveredPerSecond': round(self.callbacks['delivered'] / elapsed, 2),
+                    'p50Ms': percentile(latencies, 50),
+                    'p95Ms': percentile(latencies, 95),
+                    'maxMs': latencies[-1] if latencies else None
+                },
+                'statusPolls': {
+                    'beforeFinal': sum(self.polls_before_final),
+                    'afterFinal': self.polls_after_final
+                }
+            }
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return round(sorted_values[index], 1)
+
+
+class PaymentSimulator:
+    """État des paiements simulés et ordonnancement des confirmations / callbacks"""
+
+    def __init__(self, args, stats):
+        self.args = args
+        self.stats = stats
+        self.lock = threading.Lock()
+        self.payments = {}
+        self.tokens = set()
+        self.schedule = []
+        self.schedule_cond = threading.Condition()
+        self.callback_pool = ThreadPoolExecutor(max_workers=args.callback_workers)
+        threading.Thread(target=self._scheduler, daemon=True).start()
+
+    def issue_token(self):
+        token = uuid.uuid4().hex
+        with self.lock:
+            self.tokens.add(token)
+        return token
+
+    def valid_token(self, header):
+        return header.startswith('Bearer ') and header[7:] in self.tokens
+
+    def create(self, provider, reference, external_id, amount, currency, callback_url):
+        with self.lock:
+            if reference in self.payments:
+                self.stats.add(self.stats.payments, 'duplicates')
+                return None
+            confirm_after = random.uniform(*self.args.confirm_delay)
+            payment = {
+                'provider': provider,
+                'reference': reference,
+                'externalId': external_id,
+                'amount': str(amount),
+                'currency': currency,
+                'status': 'PENDING',
+                'outcome': 'FAILED' if random.random() < self.args.fail_rate else 'SUCCESSFUL',
+                'createdAt': time.time(),
+                'finalAt': None,
+                'callbackUrl': self._rewrite_callback(callback_url),
+                'polls': 0
+            }
+            self.payments[reference] = payment
+        self.stats.add(self.stats.payments, 'created')
+        self._enqueue(time.time() + confirm_after, reference)
+        return payment
+
+    def poll(self, reference):
+        with self.lock:
+            payment = self.payments.get(reference)
+            if payment is None:
+                return None
+            if payment['status'] == 'PENDING':
+                payment['polls'] += 1
+            else:
+                self.stats.polls_after_final += 1
+            return dict(payment)
+
+    def _rewrite_callback(self, url):
+        """Redirige les callbacks (construits sur FRONTEND_URL) vers le backend local"""
+        if not url or not self.args.callback_base:
+            return url
+        parts = urlsplit(url)
+        return self.args.callback_base.rstrip('/') + parts.path + (f"?{parts.query}" if parts.query else '')
+
+    def _enqueue(self, due, reference):
+        with self.schedule_cond:
+            heapq.heappush(self.schedule, (due, reference))
+            self.schedule_cond.notify()
+
+    def _scheduler(self):
+        while True:
+            with self.schedule_cond:
+                while not self.schedule or self.schedule[0][0] > time.time():
+                    timeout = self.schedule[0][0] - time.time() if self.schedule else None
+                    self.schedule_cond.wait(timeout)
+                _, reference = heapq.heappop(self.schedule)
+            self._finalize(reference)
+
+    def _finalize(self, reference):
+        with self.lock:
+            payment = self.payments[reference]
+            payment['status'] = payment['outcome']
+            payment['finalAt'] = time.time()
+            self.stats.polls_before_final.append(payment['polls'])
+            payment = dict(payment)
+
+        self.stats.add(self.stats.payments, 'successful' if payment['status'] == 'SUCCESSFUL' else 'failed')
+
+        if not payment['callbackUrl'] or self.args.no_callbacks:
+            return
+        if random.random() < self.args.callback_loss:
+            self.stats.add(self.stats.callbacks, 'dropped')
+            return
+        self.stats.add(self.stats.callbacks, 'scheduled')
+        self.callback_pool.submit(self._send_callback, payment)
+
+    def _callback_body(self, payment):
+        if payment['provider'] == 'mtn':
+            return {
+                'financialTransactionId': str(random.randint(10**8, 10**9)),
+                'externalId': payment['externalId'],
+                'referenceId': payment['reference'],
+                'amount': payment['amount'],
+                'currency': payment['currency'],
+                'status': payment['status'],
+                'reason': None if payment['status'] == 'SUCCESSFUL' else 'APPROVAL_REJECTED'
+            }
+        return {
+            'order_id': payment['externalId'],
+            'txnid': payment['reference'],
+            'status': 'SUCCESS' if payment['status'] == 'SUCCESSFUL' else 'FAILED',
+            'amount': payment['amount']
+        }
+
+    def _send_callback(self, payment):
+        time.sleep(random.uniform(*self.args.callback_delay))
+        body = json.dumps(self._callback_body(payment)).encode('utf-8')
+        headers = {'Content-Type': 'application/json'}
+        if payment['provider'] == 'mtn':
+            headers['X-Reference-Id'] = payment['reference']
+
+        # Les opérateurs renvoient le callback tant qu'il n'est pas acquitté
+        for attempt in range(self.args.callback_retries + 1):
+            self.stats.add(self.stats.callbacks, 'sent')
+            request = urllib.request.Request(payment['callbackUrl'], data=body, headers=headers, method='POST')
+            try:
+                with urllib.request.urlopen(request, timeout=30):
+                    pass
+                with self.stats.lock:
+                    self.stats.callbacks['delivered'] += 1
+                    self.stats.callback_latency_ms.append((time.time() - payment['finalAt']) * 1000)
+                return
+            except urllib.error.HTTPError as error:
+                self.stats.add(self.stats.callbacks, 'rejected')
+                if error.code < 500:
+                    return
+            except (urllib.error.URLError, OSError):
+                self.stats.add(self.stats.callbacks, 'errors')
+            time.sleep(min(2 ** attempt, 30))
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    simulator = None
+    stats = None
+    limits = None
+    args = None
+
+    def log_message(self, format, *args):
+        if self.args.verbose:
+            super().log_message(format, *args)
+
+    # ---------- utilitaires ----------
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        if not raw:
+            return {}
+        if 'json' in (self.headers.get('Content-Type') or ''):
+            try:
+                return json.loads(raw)
+            except ValueError:
+                return {}
+        return {'raw': raw.decode('utf-8', 'replace')}
+
+    def _send(self, status, payload=None, headers=None):
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _gate(self, provider, endpoint):
+        """Latence, limite de débit et erreurs injectées communes à tous les endpoints"""
+        self.stats.hit(endpoint)
+        if not self.limits[provider].allow():
+            self.stats.add(self.stats.rate_limited, provider)
+            self._send(429, {'message': 'Too many requests'}, {'Retry-After': '1'})
+            return False
+        delay = max(0.0, random.gauss(self.args.latency_ms, self.args.jitter_ms)) / 1000.0
+        time.sleep(delay)
+        if random.random() < self.args.error_rate:
+            with self.stats.lock:
+                self.stats.injected_errors += 1
+            self._send(500, {'message': 'Internal error (injected)'})
+            return False
+        return True
+
+    def _authorized(self):
+        if self.simulator.valid_token(self.headers.get('Authorization', '')):
+            return True
+        self._send(401, {'message': 'Access token invalid'})
+        return False
+
+    # ---------- routes ----------
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+
+        if path == '/_stats':
+            return self._send(200, self.stats.snapshot())
+
+        match = MTN_STATUS_PATH.match(path)
+        if match:
+            if not self._gate('mtn', 'mtn.status') or not self._authorized():
+                return
+            payment = self.simulator.poll(match.group(1))
+            if payment is None:
+                return self._send(404, {'code': 'RESOURCE_NOT_FOUND'})
+            return self._send(200, {
+                'externalId': payment['externalId'],
+                'amount': payment['amount'],
+                'currency': payment['currency'],
+                'status': payment['status'],
+                'reason': 'APPROVAL_REJECTED' if payment['status'] == 'FAILED' else None
+            })
+
+        match = ORANGE_STATUS_PATH.match(path)
+        if match:
+            if not self._gate('orange', 'orange.status') or not self._authorized():
+                return
+            payment = self.simulator.poll(match.group(1))
+            if payment is None:
+                return self._send(404, {'message': 'Transaction not found'})
+            status = {'PENDING': 'PENDING', 'SUCCESSFUL': 'SUCCESS', 'FAILED': 'FAILED'}[payment['status']]
+            return self._send(200, {
+                'order_id': payment['externalId'],
+                'status': status,
+                'amount': payment['amount'],
+                'currency': payment['currency'],
+                'fees': 0,
+                'completed_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(payment['finalAt']))
+                if payment['finalAt'] else None,
+                'orange_reference': payment['reference']
+            })
+
+        self._send(404, {'message': 'Unknown endpoint'})
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        body = self._read_body()
+
+        if path == '/_reset':
+            self.stats.reset()
+            return self._send(200, {'success': True})
+
+        if path == '/collection/token/':
+            if not self._gate('mtn', 'mtn.token'):
+                return
+            return self._send(200, {'access_token': self.simulator.issue_token(),
+                                    'token_type': 'access_token', 'expires_in': TOKEN_TTL})
+
+        if path == '/collection/v1_0/requesttopay':
+            if not self._gate('mtn', 'mtn.requestToPay') or not self._authorized():
+                return
+            reference = self.headers.get('X-Reference-Id')
+            if not reference:
+                return self._send(400, {'code': 'INVALID_REFERENCE_ID'})
+            payment = self.simulator.create('mtn', reference, body.get('externalId'), body.get('amount'),
+                                            body.get('currency', 'XAF'), self.headers.get('X-Callback-Url'))
+            if payment is None:
+                return self._send(409, {'code': 'RESOURCE_ALREADY_EXIST'})
+            return self._send(202)
+
+        if path == '/orange/oauth/token':
+            if not self._gate('orange', 'orange.token'):
+                return
+            return self._send(200, {'access_token': self.simulator.issue_token(),
+                                    'token_type': 'Bearer', 'expires_in': TOKEN_TTL})
+
+        if path == '/orange/webpayment':
+            if not self._gate('orange', 'orange.webPayment') or not self._authorized():
+                return
+            reference = f"MP{uuid.uuid4().hex[:16].upper()}"
+            payment = self.simulator.create('orange', reference, body.get('order_id'), body.get('amount'),
+                                            body.get('currency', 'XAF'), body.get('notif_url'))
+            return self._send(201, {
+                'status': 'SUCCESS',
+                'transaction_id': reference,
+                'payment_token': uuid.uuid4().hex,
+                'payment_url': f"http://localhost:{self.args.port}/orange/pay/{reference}"
+            })
+
+        self._send(404, {'message': 'Unknown endpoint'})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulateur local MTN MoMo / Orange Money")
+    parser.add_argument('--host', default='127.0.0.1', help="Adresse d'écoute (défaut: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8700, help="Port d'écoute (défaut: 8700)")
+    parser.add_argument('--latency-ms', type=float, default=250, help="Latence moyenne des API en ms (défaut: 250)")
+    parser.add_argument('--jitter-ms', type=float, default=100, help="Écart-type de la latence en ms (défaut: 100)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Proportion de réponses 500 injectées (défaut: 0)")
+    parser.add_argument('--fail-rate', type=float, default=0.05, help="Proportion de paiements refusés (défaut: 0.05)")
+    parser.add_argument('--rate-limit', type=float, default=0,
+                        help="Requêtes/s autorisées par opérateur avant 429 (défaut: illimité)")
+    parser.add_argument('--confirm-delay', type=float, nargs=2, default=[5, 30], metavar=('MIN', 'MAX'),
+                        help="Délai de confirmation par l'abonné en secondes (défaut: 5 30)")
+    parser.add_argument('--callback-delay', type=float, nargs=2, default=[0.1, 2], metavar=('MIN', 'MAX'),
+                        help="Délai d'envoi du callback après confirmation (défaut: 0.1 2)")
+    parser.add_argument('--callback-loss', type=float, default=0.0,
+                        help="Proportion de callbacks jamais envoyés (défaut: 0)")
+    parser.add_argument('--callback-retries', type=int, default=3, help="Renvois d'un callback en erreur (défaut: 3)")
+    parser.add_argument('--callback-workers', type=int, default=32, help="Envois de callbacks simultanés (défaut: 32)")
+    parser.add_argument('--callback-base', help="Remplace le schéma/hôte des URLs de callback (ex: http://localhost:3001)")
+    parser.add_argument('--no-callbacks', action='store_true', help="Désactive les callbacks (polling seul)")
+    parser.add_argument('--seed', type=int, help="Graine aléatoire pour des runs reproductibles")
+    parser.add_argument('--verbose', action='store_true', help="Journalise chaque requête")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    stats = Stats()
+    StandinHandler.args = args
+    StandinHandler.stats = stats
+    StandinHandler.simulator = PaymentSimulator(args, stats)
+    StandinHandler.limits = {'mtn': TokenBucket(args.rate_limit), 'orange': TokenBucket(args.rate_limit)}
+
+    server = ThreadingHTTPServer((args.host, args.port), StandinHandler)
+    server.daemon_threads = True
+
+    print("\n📡 SIMULATEUR MTN MoMo / ORANGE MONEY")
+    print("=" * 60)
+    print(f"   MTN_MOMO_API_URL=http://{args.host}:{args.port}")
+    print(f"   ORANGE_MONEY_API_URL=http://{args.host}:{args.port}/orange")
+    print(f"   Latence: {args.latency_ms:.0f}±{args.jitter_ms:.0f} ms | Refus: {args.fail_rate:.0%}"
+          f" | Erreurs: {args.error_rate:.0%} | Limite: {args.rate_limit or '∞'} req/s")
+    print(f"   Confirmation: {args.confirm_delay[0]:.0f}-{args.confirm_delay[1]:.0f}s"
+          f" | Callbacks: {'désactivés' if args.no_callbacks else args.callback_base or 'URL du backend'}")
+    print(f"   Statistiques: http://{args.host}:{args.port}/_stats")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️  Arrêt du simulateur")
+        print(json.dumps(stats.snapshot(), indent=2, ensure_ascii=False))
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de charge des paiements d'abonnement Mobile Money (bout en bout)
+
+Simule le pic de renouvellements de fin de mois: des paiements MTN / Orange
+sont lancés à débit contrôlé via POST /api/payments/initialize, puis chaque
+client interroge GET /api/payments/{transactionId}/status jusqu'au statut
+final, comme le fait l'interface.
+
+À utiliser avec scripts/test/mobile-money-standin.py à la place des API
+opérateurs (configuration du backend décrite dans son en-tête).
+
+Mesures:
+- latence d'initialisation et de confirmation (lancement → statut final)
+- charge de polling (requêtes de statut par paiement, par seconde)
+- débit des callbacks opérateur, requêtes 429 et tokens demandés (via /_stats)
+- réactivité du backend pendant le pic (sonde sur /api/health)
+
+Usage:
+    python3 scripts/test/payment-load-harness.py --accounts comptes-test.json \\
+        --payments 500 --rate 20 --standin http://localhost:8700
+    python3 scripts/test/payment-load-harness.py --tokens tokens.txt --payments 2000 --rate 50 \\
+        --orange-ratio 0.4 --poll-interval 3 --max-p95-confirm 45 --json rapport.json
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+TARGET_URL = "http://localhost:3001"
+STANDIN_URL = "http://localhost:8700"
+
+PLANS = {
+    'plan_student_monthly': 8000,
+    'plan_family_monthly': 15000
+}
+FINAL_STATUSES = ('completed', 'failed', 'cancelled', 'expired', 'refunded')
+
+# Réutilise les histogrammes de latence de l'analyseur de logs nginx
+_ANALYZER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              '..', 'utils', 'analyze-nginx-logs.py')
+_spec = importlib.util.spec_from_file_location('analyze_nginx_logs', _ANALYZER_PATH)
+nginx_logs = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(nginx_logs)
+
+
+def print_section(title):
+    print(f"\n{'='*60}")
+    print(f"  {title}")
+    print('='*60)
+
+
+def load_tokens(target, accounts_file, tokens_file):
+    tokens = []
+    if tokens_file:
+        with open(tokens_file, 'r', encoding='utf-8') as f:
+            tokens = [line.strip() for line in f if line.strip()]
+    if accounts_file:
+        with open(accounts_file, 'r', encoding='utf-8') as f:
+            accounts = json.load(f)
+        for account in accounts:
+            response = requests.post(
+                f"{target}/api/auth/login",
+                json={
+                    "credential": account.get('credential') or account.get('email'),
+                    "password": account['password']
+                },
+                timeout=15
+            )
+            data = response.json() if response.content else {}
+            token = data.get('data', {}).get('tokens', {}).get('accessToken') if data.get('success') else None
+            if token:
+                tokens.append(token)
+            else:
+                print(f"⚠️  Connexion impossible pour {account.get('email')}: {data.get('message')}")
+    return tokens
+
+
+def random_phone(method):
+    # Préfixes MTN (67x, 650-654, 680-684) et Orange (69x, 655-659)
+    prefix = random.choice(['67', '68', '65']) if method == 'mtn_momo' else random.choice(['69', '65'])
+    return f"+237{prefix}{random.randint(0, 9999999):07d}"
+
+
+class PaymentStats:
+    """Agrégats thread-safe du test de charge"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.init_latency = nginx_logs.LatencyHistogram()
+        self.poll_latency = nginx_logs.LatencyHistogram()
+        self.confirm_latency = {'completed': nginx_logs.LatencyHistogram(),
+                                'failed': nginx_logs.LatencyHistogram()}
+        self.health_latency = nginx_logs.LatencyHistogram()
+        self.outcomes = {}
+        self.http_errors = {}
+        self.polls = 0
+        self.polls_per_payment = []
+        self.health_failures = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def count(self, group, key):
+        with self.lock:
+            group[key] = group.get(key, 0) + 1
+
+    def record(self, histogram, value_ms):
+        with self.lock:
+            histogram.add(value_ms / 1000.0)
+
+    def enter(self):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def leave(self):
+        with self.lock:
+            self.in_flight -= 1
+
+
+class PaymentClient:
+    """Un parent qui paie son abonnement puis attend la confirmation"""
+
+    def __init__(self, args, stats, session):
+        self.args = args
+        self.stats = stats
+        self.session = session
+
+    def _request(self, method, path, token, **kwargs):
+        started = time.time()
+        try:
+            response = self.session.request(
+                method, f"{self.args.target}{path}",
+                headers={"Authorization": f"Bearer {token}"},
+                timeout=self.args.request_timeout, **kwargs
+            )
+        except requests.RequestException as error:
+            self.stats.count(self.stats.http_errors, type(error).__name__)
+            return None, (time.time() - started) * 1000
+        if response.status_code >= 400:
+            self.stats.count(self.stats.http_errors, f"HTTP {response.status_code}")
+        return response, (time.time() - started) * 1000
+
+    def run(self, token):
+        self.stats.enter()
+        try:
+            self._pay(token)
+        finally:
+            self.stats.leave()
+
+    def _pay(self, token):
+        method = 'orange_money' if random.random() < self.args.orange_ratio else 'mtn_momo'
+        plan_id = random.choice(list(PLANS))
+        started = time.time()
+
+        response, elapsed = self._request('POST', '/api/payments/initialize', token, json={
+            'amount': PLANS[plan_id],
+            'paymentMethod': method,
+            'type': 'subscription',
+            'planId': plan_id,
+            'phone': random_phone(method)
+        })
+        self.stats.record(self.stats.init_latency, elapsed)
+        if response is None or response.status_code != 200:
+            self.stats.count(self.stats.outcomes, 'init_error')
+            return
+
+        data = response.json().get('data', {})
+        transaction_id = data.get('transactionId')
+        if data.get('status') in FINAL_STATUSES:
+            self.stats.count(self.stats.outcomes, f"init_{data.get('status')}")
+            return
+
+        # Polling comme l'interface, jusqu'au statut final ou au timeout
+        polls = 0
+        status = data.get('status')
+        deadline = started + self.args.timeout
+        while time.time() < deadline:
+            time.sleep(self.args.poll_interval * random.uniform(0.8, 1.2))
+            response, elapsed = self._request('GET', f"/api/payments/{transaction_id}/status", token)
+            polls += 1
+            self.stats.record(self.stats.poll_latency, elapsed)
+            if response is None or response.status_code != 200:
+                continue
+            status = response.json().get('data', {}).get('status')
+            if status in FINAL_STATUSES:
+                break
+
+        with self.stats.lock:
+            self.stats.polls += polls
+            self.stats.polls_per_payment.append(polls)
+
+        if status in FINAL_STATUSES:
+            bucket = 'completed' if status == 'completed' else 'failed'
+            self.stats.record(self.stats.confirm_latency[bucket], (time.time() - started) * 1000)
+            self.stats.count(self.stats.outcomes, status)
+        else:
+            self.stats.count(self.stats.outcomes, 'timeout')
+
+
+def probe_health(args, stats, stop):
+    """Vérifie que le backend reste réactif pendant le pic"""
+    while not stop.is_set():
+        started = time.time()
+        try:
+            response = requests.get(f"{args.target}/api/health", timeout=5)
+            if response.status_code != 200:
+                stats.health_failures += 1
+        except requests.RequestException:
+            stats.health_failures += 1
+        stats.record(stats.health_latency, (time.time() - started) * 1000)
+        stop.wait(0.5)
+
+
+def standin_call(args, method, path):
+    if not args.standin:
+        return None
+    try:
+        response = requests.request(method, f"{args.standin}{path}", timeout=5)
+        return response.json()
+    except (requests.RequestException, ValueError):
+        print(f"⚠️  Simulateur injoignable sur {args.standin}")
+        return None
+
+
+def format_histogram(histogram):
+    if not histogram.count:
+        return "-"
+    return (f"p50 {histogram.percentile(50):.0f} ms | p95 {histogram.percentile(95):.0f} ms"
+            f" | p99 {histogram.percentile(99):.0f} ms | n={histogram.count}")
+
+
+def build_report(args, stats, duration, standin):
+    polls_per_payment = sorted(stats.polls_per_payment)
+    confirmed = stats.confirm_latency['completed']
+    report = {
+        'config': {
+            'payments': args.payments,
+            'rate': args.rate,
+            'concurrency': args.concurrency,
+            'pollInterval': args.poll_interval,
+            'orangeRatio': args.orange_ratio
+        },
+        'durationSeconds': round(duration, 1),
+        'outcomes': dict(stats.outcomes),
+        'httpErrors': dict(stats.http_errors),
+        'maxInFlight': stats.max_in_flight,
+        'initializeMs': histogram_summary(stats.init_latency),
+        'confirmationMs': histogram_summary(confirmed),
+        'failureMs': histogram_summary(stats.confirm_latency['failed']),
+        'statusPolling': {
+            'requests': stats.polls,
+            'perSecond': round(stats.polls / max(duration, 0.001), 1),
+            'perPaymentP50': polls_per_payment[len(polls_per_payment) // 2] if polls_per_payment else None,
+            'perPaymentMax': polls_per_payment[-1] if polls_per_payment else None,
+            'latencyMs': histogram_summary(stats.poll_latency)
+        },
+        'health': {
+            'latencyMs': histogram_summary(stats.health_latency),
+            'failures': stats.health_failures
+        },
+        'operators': standin
+    }
+    return report
+
+
+def histogram_summary(histogram):
+    if not histogram.count:
+        return None
+    return {
+        'count': histogram.count,
+        'p50': round(histogram.percentile(50), 1),
+        'p95': round(histogram.percentile(95), 1),
+        'p99': round(histogram.percentile(99), 1)
+    }
+
+
+def check_budgets(args, stats, standin):
+    """Critères du pic de renouvellement: pas de 429 opérateur, backend réactif, confirmations dans les temps"""
+    problems = []
+    confirmed = stats.confirm_latency['completed']
+    if confirmed.count and confirmed.percentile(95) > args.max_p95_confirm * 1000:
+        problems.append(f"p95 confirmation {confirmed.percentile(95) / 1000:.1f}s > {args.max_p95_confirm}s")
+    if stats.health_latency.count and stats.health_latency.percentile(95) > args.max_health_p95:
+        problems.append(f"p95 /api/health {stats.health_latency.percentile(95):.0f} ms > {args.max_health_p95} ms")
+    if stats.health_failures:
+        problems.append(f"{stats.health_failures} sondes /api/health en échec")
+    if stats.outcomes.get('timeout'):
+        problems.append(f"{stats.outcomes['timeout']} paiements sans statut final après {args.timeout}s")
+    server_errors = sum(count for key, count in stats.http_errors.items() if key.startswith('HTTP 5'))
+    if server_errors:
+        problems.append(f"{server_errors} réponses 5xx du backend")
+    if standin:
+        limited = sum(standin.get('rateLimited', {}).values())
+        if limited:
+            problems.append(f"{limited} requêtes refusées (429) par les opérateurs")
+        tokens = standin['requests'].get('mtn.token', 0) + standin['requests'].get('orange.token', 0)
+        if tokens > args.max_token_requests:
+            problems.append(f"{tokens} demandes de token opérateur (> {args.max_token_requests})")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge des paiements Mobile Money")
+    parser.add_argument('--target', default=TARGET_URL, help=f"URL du backend (défaut: {TARGET_URL})")
+    parser.add_argument('--standin', default=STANDIN_URL,
+                        help=f"URL du simulateur opérateurs, '' pour ignorer (défaut: {STANDIN_URL})")
+    parser.add_argument('--accounts', help="Fichier JSON de comptes parents [{email, password}]")
+    parser.add_argument('--tokens', help="Fichier de tokens d'accès (un par ligne)")
+    parser.add_argument('--payments', type=int, default=200, help="Nombre de paiements (défaut: 200)")
+    parser.add_argument('--rate', type=float, default=10, help="Paiements lancés par seconde (défaut: 10)")
+    parser.add_argument('--concurrency', type=int, default=200,
+                        help="Clients simultanés maximum, polling inclus (défaut: 200)")
+    parser.add_argument('--orange-ratio', type=float, default=0.4, help="Part des paiements Orange (défaut: 0.4)")
+    parser.add_argument('--poll-interval', type=float, default=3, help="Intervalle de polling en s (défaut: 3)")
+    parser.add_argument('--timeout', type=float, default=120, help="Abandon d'un paiement après N s (défaut: 120)")
+    parser.add_argument('--request-timeout', type=float, default=30, help="Timeout HTTP en s (défaut: 30)")
+    parser.add_argument('--max-p95-confirm', type=float, default=60,
+                        help="Budget p95 de confirmation en s (défaut: 60)")
+    parser.add_argument('--max-health-p95', type=float, default=500,
+                        help="Budget p95 de /api/health pendant le pic en ms (défaut: 500)")
+    parser.add_argument('--max-token-requests', type=int, default=10,
+                        help="Demandes de token opérateur tolérées (défaut: 10)")
+    parser.add_argument('--seed', type=int, help="Graine aléatoire")
+    parser.add_argument('--json', help="Écrit le rapport complet en JSON")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    print_section("💳 TEST DE CHARGE PAIEMENTS MOBILE MONEY")
+    tokens = load_tokens(args.target, args.accounts, args.tokens)
+    if not tokens:
+        print("❌ Aucun token disponible (--accounts ou --tokens)")
+        sys.exit(1)
+    print(f"🔑 {len(tokens)} comptes | {args.payments} paiements à {args.rate}/s"
+          f" | polling {args.poll_interval}s | {args.orange_ratio:.0%} Orange")
+
+    standin_call(args, 'POST', '/_reset')
+
+    stats = PaymentStats()
+    stop = threading.Event()
+    prober = threading.Thread(target=probe_health, args=(args, stats, stop), daemon=True)
+    prober.start()
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=args.concurrency)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    client = PaymentClient(args, stats, session)
+    slots = threading.BoundedSemaphore(args.concurrency)
+
+    def run_payment(token):
+        try:
+            client.run(token)
+        finally:
+            slots.release()
+
+    started = time.time()
+    last_report = started
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        # Arrivées à débit fixe (modèle ouvert): le débit ne ralentit pas si le backend sature
+        for index in range(args.payments):
+            due = started + index / args.rate
+            delay = due - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            slots.acquire()
+            executor.submit(run_payment, tokens[index % len(tokens)])
+
+            now = time.time()
+            if now - last_report >= 5:
+                print(f"   📤 {index + 1}/{args.payments} lancés | en vol: {stats.in_flight}"
+                      f" | {stats.outcomes}")
+                last_report = now
+
+        print(f"   ⏳ Attente des confirmations ({stats.in_flight} paiements en vol)...")
+
+    stop.set()
+    duration = time.time() - started
+    # Laisse aux derniers callbacks le temps d'arriver avant de lire les compteurs
+    time.sleep(2)
+    standin = standin_call(args, 'GET', '/_stats')
+    report = build_report(args, stats, duration, standin)
+
+    print_section("📊 RÉSULTATS")
+    print(f"   Durée: {duration:.1f}s | en vol max: {stats.max_in_flight}")
+    print(f"   Issues: {stats.outcomes}")
+    if stats.http_errors:
+        print(f"   Erreurs HTTP: {stats.http_errors}")
+    print(f"   Initialisation: {format_histogram(stats.init_latency)}")
+    print(f"   Confirmation:   {format_histogram(stats.confirm_latency['completed'])}")
+    print(f"   Refus:          {format_histogram(stats.confirm_latency['failed'])}")
+    polling = report['statusPolling']
+    print(f"   Polling: {polling['requests']} requêtes ({polling['perSecond']}/s),"
+          f" {polling['perPaymentP50']} par paiement (médiane), max {polling['perPaymentMax']}")
+    print(f"   Statut: {format_histogram(stats.poll_latency)}")
+    print(f"   /api/health: {format_histogram(stats.health_latency)} | échecs: {stats.health_failures}")
+
+    if standin:
+        callbacks = standin['callbacks']
+        print(f"\n   Opérateurs: {standin['requests']}")
+        print(f"   429: {standin['rateLimited']} | erreurs injectées: {standin['injectedErrors']}")
+        print(f"   Callbacks: {callbacks['delivered']} acquittés / {callbacks['sent']} envoyés"
+              f" ({callbacks['deliveredPerSecond']}/s), rejetés: {callbacks['rejected']},"
+              f" erreurs: {callbacks['errors']}, p95 {callbacks['p95Ms']} ms")
+        print(f"   Polls opérateur: {standin['statusPolls']['beforeFinal']} avant statut final,"
+              f" {standin['statusPolls']['afterFinal']} après")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Rapport écrit dans {args.json}")
+
+    problems = check_budgets(args, stats, standin)
+    if problems:
+        print("\n❌ Budgets dépassés:")
+        for problem in problems:
+            print(f"   - {problem}")
+        sys.exit(1)
+    print("\n✅ Pic de paiements absorbé dans les budgets")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Générateur de rafales progress:update (WebSocket) pour le tampon d'écriture des progrès
+
+Chaque élève ouvre un socket et envoie des mises à jour de progrès rapprochées sur
+plusieurs leçons d'une matière encore vierge (0 leçon terminée), comme un lecteur de
+leçon qui remonte sa position plusieurs fois par seconde. Une partie des leçons est
+menée à 100%.
+
+Vérifications:
+- taux d'écriture BDD: requêtes SQL du tampon par événement, lues sur
+  GET /api/monitoring/process/metrics (progressBuffer), comparées aux 3 allers-retours
+  par événement de l'ancien gestionnaire (findOne + findOrCreate + update)
+- lecture de ses propres écritures: juste après l'accusé de mise en tampon d'une leçon
+  terminée (avant persistance), GET /api/students/subjects doit déjà la compter
+- état final: completedLessons de la matière = leçons menées à 100%
+
+Lancer deux fois (PROGRESS_FLUSH_MS=0 puis la valeur par défaut) pour comparer
+avec et sans fusion. Nécessite python-socketio (pip install "python-socketio[client]").
+
+Usage:
+    python3 scripts/test/progress-burst.py --accounts comptes-eleves.json
+    python3 scripts/test/progress-burst.py --tokens tokens-eleves.txt --lessons 4 \\
+        --updates 30 --rate 10 --max-statements-per-event 0.5
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+import requests
+
+try:
+    import socketio
+except ImportError:
+    socketio = None
+
+TARGET_URL = "http://localhost:3001"
+ADMIN_KEY = os.environ.get("CLAUDYNE_ADMIN_KEY", "claudyne-admin-2024")
+# Ancien gestionnaire: Student.findOne + Progress.findOrCreate + progressRecord.update
+LEGACY_STATEMENTS_PER_EVENT = 3
+
+
+def print_section(title):
+    print(f"\n{'='*60}")
+    print(f"  {title}")
+    print('='*60)
+
+
+def get_admin_token(api_url, admin_key):
+    response = requests.post(f"{api_url}/admin/generate-token", json={"adminKey": admin_key}, timeout=15)
+    data = response.json()
+    if not data.get('success'):
+        print("❌ Échec génération token")
+        sys.exit(1)
+    return data['token']
+
+
+def load_tokens(api_url, accounts_file, tokens_file):
+    tokens = []
+    if tokens_file:
+        with open(tokens_file, 'r', encoding='utf-8') as f:
+            tokens = [line.strip() for line in f if line.strip()]
+    if accounts_file:
+        with open(accounts_file, 'r', encoding='utf-8') as f:
+            accounts = json.load(f)
+        for account in accounts:
+            response = requests.post(
+                f"{api_url}/auth/login",
+                json={"credential": account.get('credential') or account.get('email'),
+                      "password": account['password']},
+                timeout=15
+            )
+            data = response.json() if response.content else {}
+            token = data.get('data', {}).get('tokens', {}).get('accessToken') if data.get('success') else None
+            if token:
+                tokens.append(token)
+            else:
+                print(f"⚠️  Connexion impossible pour {account.get('email')}: {data.get('message')}")
+    return tokens
+
+
+def api_get(api_url, path, token):
+    response = requests.get(f"{api_url}{path}", headers={"Authorization": f"Bearer {token}"}, timeout=30)
+    data = response.json() if response.content else {}
+    if response.status_code != 200 or not data.get('success'):
+        raise RuntimeError(f"{path}: HTTP {response.status_code} {data.get('message', '')}")
+    return data['data']
+
+
+def buffer_stats(api_url, admin_token):
+    data = api_get(api_url, "/monitoring/process/metrics", admin_token)
+    stats = data.get('progressBuffer')
+    if stats is None:
+        print("❌ progressBuffer absent des métriques (backend sans tampon d'écriture ?)")
+        sys.exit(1)
+    return stats
+
+
+def subject_completed(api_url, token, subject_id):
+    subjects = api_get(api_url, "/students/subjects", token)['subjects']
+    for subject in subjects:
+        if subject['id'] == subject_id:
+            return subject['completedLessons']
+    raise RuntimeError(f"matière {subject_id} absente de /students/subjects")
+
+
+def prepare_student(api_url, token, lessons_per_student):
+    """Élève, matière vierge et leçons utilisées pour la rafale"""
+    profile = api_get(api_url, "/students/profile", token)
+    if not profile.get('studentId'):
+        raise RuntimeError("compte sans profil élève")
+
+    subjects = api_get(api_url, "/students/subjects", token)['subjects']
+    fresh = [subject for subject in subjects if subject['totalLessons'] > 0 and subject['completedLessons'] == 0]
+    if not fresh:
+        raise RuntimeError("aucune matière sans leçon terminée (compte de test déjà utilisé ?)")
+
+    subject = fresh[0]
+    lessons = api_get(api_url, f"/subjects/{subject['id']}/lessons", token)['lessons']
+    return {
+        'token': token,
+        'studentId': profile['studentId'],
+        'subjectId': subject['id'],
+        'lessonIds': [lesson['id'] for lesson in lessons[:lessons_per_student]]
+    }
+
+
+class BurstState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sent = 0
+        self.acked = 0
+        self.persisted = 0
+        self.errors = []
+        self.ryw_checks = 0
+        self.ryw_failures = []
+        self.final_failures = []
+
+
+def run_student(args, api_url, student, state):
+    """Rafale d'un élève: mises à jour croissantes entrelacées sur ses leçons"""
+    client = socketio.Client(reconnection=False)
+    persisted = threading.Semaphore(0)
+
+    @client.on('progress:updated')
+    def on_updated(data):
+        if data.get('studentId') == student['studentId']:
+            with state.lock:
+                state.persisted += 1
+            persisted.release()
+
+    @client.on('progress:error')
+    def on_error(data):
+        with state.lock:
+            state.errors.append(data.get('message'))
+        persisted.release()
+
+    lesson_ids = student['lessonIds']
+    completing = set(lesson_ids[:max(0, round(len(lesson_ids) * args.complete_ratio))])
+    interval = 1.0 / args.rate
+    completed = 0
+
+    try:
+        client.connect(args.target, auth={'token': student['token']}, transports=['websocket'], wait_timeout=15)
+
+        # Positions croissantes avec un peu de gigue; la dernière atteint 100% pour les leçons à terminer
+        plans = {}
+        for lesson_id in lesson_ids:
+            final = 100 if lesson_id in completing else random.randint(40, 95)
+            steps = sorted(random.randint(1, final - 1) for _ in range(args.updates - 1)) + [final]
+            plans[lesson_id] = steps
+
+        for step in range(args.updates):
+            for lesson_id in lesson_ids:
+                progress = plans[lesson_id][step]
+                payload = {'studentId': student['studentId'], 'lessonId': lesson_id,
+                           'progress': progress, 'score': random.randint(40, 100)}
+                ack = client.call('progress:update', payload, timeout=30)
+                with state.lock:
+                    state.sent += 1
+                    if ack and ack.get('queued'):
+                        state.acked += 1
+
+                if progress >= 100 and step == args.updates - 1:
+                    # Mise en tampon confirmée, persistance pas forcément faite: la lecture doit la voir
+                    completed += 1
+                    seen = subject_completed(api_url, student['token'], student['subjectId'])
+                    with state.lock:
+                        state.ryw_checks += 1
+                        if seen != completed:
+                            state.ryw_failures.append(
+                                f"élève {student['studentId']}: {seen} leçon(s) terminée(s) lue(s), {completed} attendue(s)")
+                time.sleep(interval)
+
+        # Attendre la persistance de toutes les mises à jour envoyées
+        deadline = time.monotonic() + args.settle
+        for _ in range(args.updates * len(lesson_ids)):
+            if not persisted.acquire(timeout=max(0.0, deadline - time.monotonic())):
+                break
+
+        final = subject_completed(api_url, student['token'], student['subjectId'])
+        if final != len(completing):
+            with state.lock:
+                state.final_failures.append(
+                    f"élève {student['studentId']}: {final} leçon(s) terminée(s), {len(completing)} attendue(s)")
+    except Exception as exc:
+        with state.lock:
+            state.errors.append(f"élève {student['studentId']}: {type(exc).__name__}: {exc}")
+    finally:
+        try:
+            client.disconnect()
+        except Exception:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rafales progress:update et vérification du tampon d'écriture")
+    parser.add_argument('--target', default=TARGET_URL, help=f"URL du backend (défaut: {TARGET_URL})")
+    parser.add_argument('--accounts', help="Fichier JSON de comptes élèves [{email, password}]")
+    parser.add_argument('--tokens', help="Fichier de tokens élèves (un par ligne)")
+    parser.add_argument('--admin-token', help="Token admin pour les métriques (sinon généré)")
+    parser.add_argument('--students', type=int, default=0, help="Nombre max d'élèves (défaut: tous)")
+    parser.add_argument('--lessons', type=int, default=3, help="Leçons par élève (défaut: 3)")
+    parser.add_argument('--updates', type=int, default=20, help="Mises à jour par leçon (défaut: 20)")
+    parser.add_argument('--rate', type=float, default=10, help="Événements par seconde et par élève (défaut: 10)")
+    parser.add_argument('--complete-ratio', type=float, default=0.5,
+                        help="Part des leçons menées à 100%% (défaut: 0.5)")
+    parser.add_argument('--settle', type=float, default=15,
+                        help="Attente max de la persistance en fin de rafale, en s (défaut: 15)")
+    parser.add_argument('--max-statements-per-event', type=float, default=1.0,
+                        help="Seuil de requêtes SQL par événement (défaut: 1.0)")
+    parser.add_argument('--json', help="Écrit le rapport en JSON")
+    args = parser.parse_args()
+
+    if socketio is None:
+        print("❌ python-socketio requis: pip install \"python-socketio[client]\"")
+        sys.exit(1)
+
+    api_url = f"{args.target}/api"
+    tokens = load_tokens(api_url, args.accounts, args.tokens)
+    if args.students:
+        tokens = tokens[:args.students]
+    if not tokens:
+        print("❌ Aucun token élève (--accounts ou --tokens)")
+        sys.exit(1)
+
+    admin_token = args.admin_token or get_admin_token(api_url, ADMIN_KEY)
+
+    print_section("📝 PRÉPARATION")
+    students = []
+    for token in tokens:
+        try:
+            student = prepare_student(api_url, token, args.lessons)
+            students.append(student)
+            print(f"   ✅ Élève {student['studentId']}: matière {student['subjectId']}, "
+                  f"{len(student['lessonIds'])} leçon(s)")
+        except (RuntimeError, requests.RequestException, ValueError) as error:
+            print(f"   ⚠️  Élève ignoré: {error}")
+    if not students:
+        print("❌ Aucun élève utilisable")
+        sys.exit(1)
+
+    before = buffer_stats(api_url, admin_token)
+    print(f"   Fenêtre de fusion du serveur: {before['windowMs']} ms")
+
+    print_section("💥 RAFALE")
+    state = BurstState()
+    started = time.monotonic()
+    threads = [threading.Thread(target=run_student, args=(args, api_url, student, state), daemon=True)
+               for student in students]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    after = buffer_stats(api_url, admin_token)
+    delta = {key: after[key] - before[key]
+             for key in ('events', 'merged', 'flushes', 'rowsWritten', 'dbStatements', 'failures')}
+    per_event = delta['dbStatements'] / delta['events'] if delta['events'] else None
+
+    print(f"   Événements envoyés:  {state.sent} en {elapsed:.1f}s ({state.sent / elapsed:.0f}/s)")
+    print(f"   Accusés de tampon:   {state.acked}")
+    print(f"   Persistés (échos):   {state.persisted}")
+
+    print_section("🗄️ ÉCRITURES BDD")
+    print(f"   Événements reçus:    {delta['events']} (fusionnés: {delta['merged']})")
+    print(f"   Écritures groupées:  {delta['flushes']} ({delta['rowsWritten']} lignes)")
+    print(f"   Requêtes SQL:        {delta['dbStatements']}")
+    if per_event is not None:
+        legacy = delta['events'] * LEGACY_STATEMENTS_PER_EVENT
+        print(f"   Requêtes/événement:  {per_event:.3f} (ancien gestionnaire: {LEGACY_STATEMENTS_PER_EVENT}, "
+              f"soit {legacy} requêtes, réduction x{legacy / max(1, delta['dbStatements']):.1f})")
+    if delta['failures']:
+        print(f"   ⚠️  Écritures échouées: {delta['failures']}")
+
+    print_section("🔁 COHÉRENCE")
+    print(f"   Lectures de ses écritures: {state.ryw_checks - len(state.ryw_failures)}/{state.ryw_checks} correctes")
+    print(f"   États finaux:              {len(students) - len(state.final_failures)}/{len(students)} corrects")
+
+    problems = state.ryw_failures + state.final_failures + state.errors
+    if per_event is None:
+        problems.append("aucun événement compté par le serveur")
+    elif per_event > args.max_statements_per_event:
+        problems.append(f"{per_event:.3f} requêtes/événement > seuil {args.max_statements_per_event}")
+    if delta['failures']:
+        problems.append(f"{delta['failures']} écriture(s) groupée(s) échouée(s)")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'students': len(students),
+                'sent': state.sent,
+                'elapsedSeconds': round(elapsed, 2),
+                'buffer': delta,
+                'windowMs': after['windowMs'],
+                'statementsPerEvent': per_event,
+                'readYourWrites': {'checks': state.ryw_checks, 'failures': state.ryw_failures},
+                'finalFailures': state.final_failures,
+                'errors': state.errors
+            }, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Rapport écrit dans {args.json}")
+
+    if problems:
+        print("\n❌ Problèmes détectés:")
+        for problem in problems[:20]:
+            print(f"   - {problem}")
+        sys.exit(1)
+    print("\n✅ Écritures fusionnées et progrès cohérents")
+
+
+if __name__ == "__main__":
+    main()
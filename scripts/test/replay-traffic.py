@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rejeu du trafic de production contre un backend local
+
+Sources acceptées:
+- logs d'accès nginx (format main_ext ou combined, .gz inclus) - seules les
+  requêtes GET/HEAD sont rejouées car les logs ne contiennent pas les corps
+- fichier de capture NDJSON, une requête par ligne:
+  {"ts": 1760000000.123, "method": "POST", "path": "/api/progress/...",
+   "body": {...}, "status": 200, "latencyMs": 85.2, "client": "1.2.3.4"}
+
+Le trafic est réémis avec les intervalles d'arrivée d'origine divisés par
+--speed (1, 5, 20...). Les tokens d'authentification sont remplacés par ceux
+d'un pool de comptes de test (un client d'origine = un compte, stable).
+
+Usage:
+    python3 scripts/test/replay-traffic.py access.log.1.gz --speed 5 \\
+        --accounts comptes-test.json --target http://localhost:3001
+    python3 scripts/test/replay-traffic.py capture.ndjson --speed 20 --json rapport.json
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+
+TARGET_URL = "http://localhost:3001"
+
+# Réutilise le parseur et les histogrammes de l'analyseur de logs nginx
+_ANALYZER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              '..', 'utils', 'analyze-nginx-logs.py')
+_spec = importlib.util.spec_from_file_location('analyze_nginx_logs', _ANALYZER_PATH)
+nginx_logs = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(nginx_logs)
+
+REPLAYABLE_LOG_METHODS = ('GET', 'HEAD')
+# Routes jamais rejouées (effets de bord ou authentification gérée par le pool)
+SKIPPED_PREFIXES = ('/api/auth/', '/api/payments/callback', '/api/payments/webhook', '/socket.io')
+
+
+def print_section(title):
+    print(f"\n{'='*60}")
+    print(f"  {title}")
+    print('='*60)
+
+
+def iter_log_requests(path):
+    """Extrait les requêtes rejouables d'un log nginx"""
+    for line in nginx_logs.iter_lines(path):
+        match = nginx_logs.LOG_PATTERN.match(line)
+        if not match:
+            continue
+        method = match.group('method').decode('ascii', 'replace')
+        if method not in REPLAYABLE_LOG_METHODS:
+            continue
+        try:
+            timestamp = datetime.strptime(match.group('time').decode('ascii'), nginx_logs.TIME_FORMAT)
+        except ValueError:
+            continue
+        raw_rt = match.group('rt')
+        yield {
+            'ts': timestamp.timestamp(),
+            'method': method,
+            'path': match.group('path').decode('utf-8', 'replace'),
+            'status': int(match.group('status')),
+            'latencyMs': float(raw_rt) * 1000 if raw_rt and raw_rt != b'-' else None,
+            'client': match.group('ip').decode('ascii', 'replace'),
+        }
+
+
+def iter_capture_requests(path):
+    """Lit un fichier de capture NDJSON"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def iter_requests(path):
+    if path.endswith(('.ndjson', '.jsonl')):
+        return iter_capture_requests(path)
+    return iter_log_requests(path)
+
+
+class TokenPool:
+    """Pool de tokens de comptes de test seedés"""
+
+    def __init__(self, target, accounts_file=None, tokens_file=None):
+        self.tokens = []
+        if tokens_file:
+            with open(tokens_file, 'r', encoding='utf-8') as f:
+                self.tokens = [line.strip() for line in f if line.strip()]
+        if accounts_file:
+            with open(accounts_file, 'r', encoding='utf-8') as f:
+                accounts = json.load(f)
+            for account in accounts:
+                token = self._login(target, account)
+                if token:
+                    self.tokens.append(token)
+        print(f"🔑 {len(self.tokens)} tokens disponibles dans le pool")
+
+    @staticmethod
+    def _login(target, account):
+        response = requests.post(
+            f"{target}/api/auth/login",
+            json={
+                "credential": account.get('credential') or account.get('email'),
+                "password": account['password']
+            },
+            timeout=15
+        )
+        data = response.json() if response.content else {}
+        if not data.get('success'):
+            print(f"⚠️  Connexion impossible pour {account.get('email')}: {data.get('message')}")
+            return None
+        return data.get('data', {}).get('tokens', {}).get('accessToken')
+
+    def token_for(self, client):
+        """Associe de façon stable un client d'origine à un compte du pool"""
+        if not self.tokens:
+            return None
+        digest = hashlib.sha1((client or '').encode('utf-8')).digest()
+        return self.tokens[int.from_bytes(digest[:4], 'big') % len(self.tokens)]
+
+
+class ReplayStats:
+    """Comparaison par route entre l'enregistrement et le rejeu"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {}
+        self.sent = 0
+        self.max_lag_ms = 0.0
+
+    def _route(self, key):
+        route = self.routes.get(key)
+        if route is None:
+            route = self.routes[key] = {
+                'recorded': nginx_logs.LatencyHistogram(),
+                'replayed': nginx_logs.LatencyHistogram(),
+                'recordedErrors': 0,
+                'replayedErrors': 0,
+                'statusMismatch': 0,
+                'transportErrors': 0,
+                'requests': 0,
+            }
+        return route
+
+    def record(self, request, status, latency_seconds, lag_ms):
+        key = f"{request['method']} {nginx_logs.normalize_route(request['path'])}"
+        with self.lock:
+            self.sent += 1
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+            route = self._route(key)
+            route['requests'] += 1
+            if request.get('latencyMs') is not None:
+                route['recorded'].add(request['latencyMs'] / 1000.0)
+            if (request.get('status') or 0) >= 500:
+                route['recordedErrors'] += 1
+            if status is None:
+                route['transportErrors'] += 1
+                return
+            route['replayed'].add(latency_seconds)
+            if status >= 500:
+                route['replayedErrors'] += 1
+            if request.get('status') and status != request['status']:
+                route['statusMismatch'] += 1
+
+    def report(self):
+        routes = {}
+        for key, route in sorted(self.routes.items(), key=lambda item: -item[1]['requests']):
+            recorded_p95 = route['recorded'].percentile(95)
+            replayed_p95 = route['replayed'].percentile(95)
+            routes[key] = {
+                'requests': route['requests'],
+                'recordedP50Ms': _round(route['recorded'].percentile(50)),
+                'recordedP95Ms': _round(recorded_p95),
+                'replayedP50Ms': _round(route['replayed'].percentile(50)),
+                'replayedP95Ms': _round(replayed_p95),
+                'p95Ratio': round(replayed_p95 / recorded_p95, 2) if recorded_p95 and replayed_p95 else None,
+                'recordedErrors': route['recordedErrors'],
+                'replayedErrors': route['replayedErrors'],
+                'transportErrors': route['transportErrors'],
+                'statusMismatch': route['statusMismatch'],
+            }
+        return {'sent': self.sent, 'maxSchedulingLagMs': round(self.max_lag_ms, 1), 'routes': routes}
+
+
+def _round(value):
+    return round(value, 1) if value is not None else None
+
+
+def send_request(session_local, target, request, token, timeout):
+    session = getattr(session_local, 'session', None)
+    if session is None:
+        session = session_local.session = requests.Session()
+
+    headers = dict(request.get('headers') or {})
+    headers.pop('Authorization', None)
+    if token and request['path'].startswith('/api/'):
+        headers['Authorization'] = f"Bearer {token}"
+
+    started = time.perf_counter()
+    try:
+        response = session.request(
+            request['method'],
+            f"{target}{request['path']}",
+            json=request.get('body'),
+            headers=headers,
+            timeout=timeout,
+            allow_redirects=False
+        )
+        return response.status_code, time.perf_counter() - started
+    except requests.RequestException:
+        return None, time.perf_counter() - started
+
+
+def replay(sources, target, speed, token_pool, workers, timeout, limit=None, include_writes=False):
+    stats = ReplayStats()
+    session_local = threading.local()
+    # Borne le nombre de requêtes en vol pour garder une mémoire constante
+    in_flight = threading.BoundedSemaphore(workers * 4)
+
+    def run(request, scheduled_at):
+        try:
+            lag_ms = max(0.0, (time.perf_counter() - scheduled_at) * 1000)
+            token = token_pool.token_for(request.get('client')) if token_pool else None
+            status, latency = send_request(session_local, target, request, token, timeout)
+            stats.record(request, status, latency, lag_ms)
+        finally:
+            in_flight.release()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        origin_ts = None
+        start = time.perf_counter()
+        count = 0
+        for source in sources:
+            for request in iter_requests(source):
+                if request['path'].startswith(SKIPPED_PREFIXES):
+                    continue
+                if not include_writes and request['method'] not in REPLAYABLE_LOG_METHODS \
+                        and 'body' not in request:
+                    continue
+                if origin_ts is None:
+                    origin_ts = request['ts']
+
+                scheduled_at = start + max(0.0, request['ts'] - origin_ts) / speed
+                delay = scheduled_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+                in_flight.acquire()
+                executor.submit(run, request, scheduled_at)
+                count += 1
+                if count % 1000 == 0:
+                    print(f"   ... {count} requêtes émises ({time.perf_counter() - start:.0f}s)")
+                if limit and count >= limit:
+                    break
+            if limit and count >= limit:
+                break
+
+    return stats.report()
+
+
+def print_report(report, speed):
+    print_section(f"DIVERGENCE REJEU ×{speed} vs ENREGISTREMENT")
+    print(f"Requêtes rejouées: {report['sent']} | Retard max d'ordonnancement: {report['maxSchedulingLagMs']} ms")
+    print(f"\n{'Route':<42} {'Req':>6} {'p95 enr.':>9} {'p95 rejeu':>10} {'ratio':>6} "
+          f"{'5xx enr.':>8} {'5xx rejeu':>9} {'≠statut':>8}")
+    print('-' * 104)
+    for key, route in list(report['routes'].items())[:40]:
+        print(f"{key[:42]:<42} {route['requests']:>6} {str(route['recordedP95Ms']):>9} "
+              f"{str(route['replayedP95Ms']):>10} {str(route['p95Ratio']):>6} "
+              f"{route['recordedErrors']:>8} {route['replayedErrors'] + route['transportErrors']:>9} "
+              f"{route['statusMismatch']:>8}")
+
+    regressions = [
+        key for key, route in report['routes'].items()
+        if (route['p95Ratio'] or 0) > 2 or route['replayedErrors'] + route['transportErrors'] > route['recordedErrors']
+    ]
+    if regressions:
+        print(f"\n⚠️  {len(regressions)} routes divergent (p95 ×2 ou plus d'erreurs qu'en production):")
+        for key in regressions[:10]:
+            print(f"   → {key}")
+    else:
+        print("\n✅ Aucune divergence significative")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rejeu du trafic de production contre un backend local")
+    parser.add_argument('sources', nargs='+', help="Logs nginx (.log/.gz) ou captures NDJSON, dans l'ordre")
+    parser.add_argument('--target', default=TARGET_URL, help=f"URL du backend (défaut: {TARGET_URL})")
+    parser.add_argument('--speed', type=float, default=1.0, help="Multiplicateur de vitesse (1, 5, 20...)")
+    parser.add_argument('--accounts', help="JSON: liste de comptes de test [{email, password}]")
+    parser.add_argument('--tokens', help="Fichier texte: un token d'accès par ligne")
+    parser.add_argument('--workers', type=int, default=50, help="Requêtes concurrentes maximum (défaut: 50)")
+    parser.add_argument('--timeout', type=float, default=30.0, help="Timeout par requête en secondes")
+    parser.add_argument('--limit', type=int, help="Nombre maximum de requêtes à rejouer")
+    parser.add_argument('--include-writes', action='store_true',
+                        help="Rejouer aussi les méthodes non-GET des captures sans corps")
+    parser.add_argument('--json', metavar='FICHIER', help="Écrire le rapport en JSON")
+    args = parser.parse_args()
+
+    if args.speed <= 0:
+        parser.error("--speed doit être positif")
+
+    print_section(f"REJEU DU TRAFIC ×{args.speed} → {args.target}")
+    token_pool = TokenPool(args.target, args.accounts, args.tokens) if (args.accounts or args.tokens) else None
+
+    report = replay(args.sources, args.target, args.speed, token_pool,
+                    args.workers, args.timeout, args.limit, args.include_writes)
+    print_report(report, args.speed)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n✅ Rapport JSON écrit dans {args.json}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n🛑 Rejeu interrompu")
+        sys.exit(1)
@@ -0,0 +1,581 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test d'endurance (soak) du backend avec suivi des fuites mémoire et de handles
+
+Génère pendant des heures un trafic REST + WebSocket contre un backend local,
+par segments successifs dont chacun privilégie un mélange d'endpoints
+(contenu public, API élève, WebSocket, salles WebSocket, mixte). Les métriques du processus sont
+échantillonnées sur GET /api/monitoring/process/metrics:
+heap, RSS, mémoire externe, retard de la boucle d'événements, handles ouverts,
+pool de connexions BDD, état global WebSocket et cache.
+
+Pour chaque segment, une tendance linéaire (pente par heure, R²) est ajustée
+sur chaque série. Une croissance nette et régulière est signalée comme fuite,
+avec le mélange d'endpoints réellement joué pendant le segment. Le heap est
+ajusté sur son plancher (minimum par fenêtre) pour ignorer les dents de scie du GC.
+
+Le mélange "rooms" fait entrer les clients dans des battles et des sessions mentor
+(élèves de la famille du token, via GET /api/students), abonne le token admin aux
+analytics temps réel et coupe une partie des connexions sans quitter la battle, pour
+que les séries battleRooms et mentorSessions puissent réellement croître en cas de fuite.
+
+Le trafic WebSocket nécessite python-socketio (pip install "python-socketio[client]");
+sans lui, les segments WebSocket ne jouent que du REST.
+
+Usage:
+    python3 scripts/test/soak-test.py --hours 6 --tokens tokens-eleves.txt
+    python3 scripts/test/soak-test.py --hours 2 --segment-minutes 20 --mixes public,websocket \\
+        --accounts comptes-test.json --samples soak.ndjson
+    python3 scripts/test/soak-test.py --hours 3 --mixes rooms --ws-abrupt-ratio 0.5 --tokens tokens-parents.txt
+    python3 scripts/test/soak-test.py --analyze soak.ndjson
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+import requests
+
+try:
+    import socketio
+except ImportError:
+    socketio = None
+
+TARGET_URL = "http://localhost:3001"
+ADMIN_KEY = os.environ.get("CLAUDYNE_ADMIN_KEY", "claudyne-admin-2024")
+
+# Mélanges d'endpoints joués par segment: poids REST, part des clients WebSocket actifs
+# et si ces clients entrent dans des salles (battles, sessions mentor, analytics)
+MIXES = {
+    'public': {
+        'rest': {'GET /api/public/content': 6, 'GET /api/health': 1},
+        'websocket': 0.0,
+        'rooms': False
+    },
+    'student': {
+        'rest': {'GET /api/students/profile': 3, 'GET /api/students/subjects': 3,
+                 'GET /api/subjects': 2, 'GET /api/public/content': 1},
+        'websocket': 0.0,
+        'rooms': False
+    },
+    'websocket': {
+        'rest': {'GET /api/health': 1},
+        'websocket': 1.0,
+        'rooms': False
+    },
+    'rooms': {
+        'rest': {'GET /api/health': 1},
+        'websocket': 1.0,
+        'rooms': True
+    },
+    'mixed': {
+        'rest': {'GET /api/public/content': 3, 'GET /api/students/profile': 2,
+                 'GET /api/students/subjects': 2, 'GET /api/subjects': 1, 'GET /api/health': 1},
+        'websocket': 0.5,
+        'rooms': True
+    }
+}
+AUTHENTICATED_PREFIXES = ('/api/students', '/api/subjects', '/api/progress')
+
+# Séries suivies: (nom, extraction depuis un échantillon, unité, seuil de pente par heure)
+MB = 1024 * 1024
+SERIES = [
+    ('rss', lambda s: s['memory']['rss'] / MB, 'Mo', 32),
+    ('heapFloor', None, 'Mo', 16),
+    ('external', lambda s: s['memory']['external'] / MB, 'Mo', 16),
+    ('handles', lambda s: s['handles']['total'], '', 20),
+    ('dbPoolUsing', lambda s: (s['database'].get('pool') or {}).get('using', 0), '', 2),
+    ('socketConnections', lambda s: s['sockets']['activeConnections'], '', 10),
+    ('battleRooms', lambda s: s['sockets']['battleRooms'], '', 5),
+    ('mentorSessions', lambda s: s['sockets']['mentorSessions'], '', 5),
+    ('cacheEntries', lambda s: s['cache'].get('total', 0), '', 1000),
+    ('eventLoopP99', lambda s: s['eventLoop']['p99Ms'], 'ms', 20)
+]
+HEAP_FLOOR_WINDOW = 6
+
+
+def print_section(title):
+    print(f"\n{'='*60}")
+    print(f"  {title}")
+    print('='*60)
+
+
+def get_admin_token(api_url, admin_key):
+    response = requests.post(f"{api_url}/admin/generate-token", json={"adminKey": admin_key}, timeout=15)
+    data = response.json()
+    if not data.get('success'):
+        print("❌ Échec génération token")
+        sys.exit(1)
+    return data['token']
+
+
+def load_tokens(api_url, accounts_file, tokens_file):
+    tokens = []
+    if tokens_file:
+        with open(tokens_file, 'r', encoding='utf-8') as f:
+            tokens = [line.strip() for line in f if line.strip()]
+    if accounts_file:
+        with open(accounts_file, 'r', encoding='utf-8') as f:
+            accounts = json.load(f)
+        for account in accounts:
+            response = requests.post(
+                f"{api_url}/auth/login",
+                json={"credential": account.get('credential') or account.get('email'),
+                      "password": account['password']},
+                timeout=15
+            )
+            data = response.json() if response.content else {}
+            token = data.get('data', {}).get('tokens', {}).get('accessToken') if data.get('success') else None
+            if token:
+                tokens.append(token)
+            else:
+                print(f"⚠️  Connexion impossible pour {account.get('email')}: {data.get('message')}")
+    return tokens
+
+
+# =============================================================================
+# TENDANCES
+# =============================================================================
+
+def linear_fit(points):
+    """Moindres carrés sur [(t_secondes, valeur)]: (pente par heure, R²)"""
+    n = len(points)
+    if n < 3:
+        return None, None
+    mean_t = sum(t for t, _ in points) / n
+    mean_v = sum(v for _, v in points) / n
+    var_t = sum((t - mean_t) ** 2 for t, _ in points)
+    var_v = sum((v - mean_v) ** 2 for _, v in points)
+    if var_t == 0:
+        return None, None
+    cov = sum((t - mean_t) * (v - mean_v) for t, v in points)
+    slope = cov / var_t
+    r2 = (cov * cov) / (var_t * var_v) if var_v else 0.0
+    return slope * 3600, r2
+
+
+def series_points(samples, name, extract):
+    if name == 'heapFloor':
+        # Plancher du heap: minimum de chaque fenêtre, après passage du GC
+        points = []
+        for start in range(0, len(samples) - HEAP_FLOOR_WINDOW + 1, HEAP_FLOOR_WINDOW):
+            window = samples[start:start + HEAP_FLOOR_WINDOW]
+            lowest = min(window, key=lambda s: s['memory']['heapUsed'])
+            points.append((lowest['t'], lowest['memory']['heapUsed'] / MB))
+        return points
+    points = []
+    for sample in samples:
+        try:
+            points.append((sample['t'], extract(sample)))
+        except (KeyError, TypeError):
+            continue
+    return points
+
+
+def analyze(samples, min_r2, warmup_ratio):
+    """Ajuste les tendances par segment et sur toute la durée; retourne (segments, fuites)"""
+    segments = []
+    by_segment = {}
+    for sample in samples:
+        by_segment.setdefault(sample['segment'], []).append(sample)
+
+    groups = [(index, group) for index, group in sorted(by_segment.items())]
+    groups.append(('total', samples))
+
+    leaks = []
+    for index, group in groups:
+        # On ignore le début du segment (montée en charge, caches qui se remplissent)
+        skip = int(len(group) * warmup_ratio) if index != 'total' else 0
+        group = group[skip:]
+        if len(group) < 3:
+            continue
+
+        last = group[-1]
+        segment = {
+            'segment': index,
+            'mix': last['mix'] if index != 'total' else 'total',
+            'minutes': round((group[-1]['t'] - group[0]['t']) / 60, 1),
+            'requests': last.get('segmentRequests', {}) if index != 'total' else {},
+            'trends': {}
+        }
+        for name, extract, unit, threshold in SERIES:
+            slope, r2 = linear_fit(series_points(group, name, extract))
+            if slope is None:
+                continue
+            segment['trends'][name] = {'perHour': round(slope, 2), 'r2': round(r2, 2), 'unit': unit}
+            if slope > threshold and r2 >= min_r2:
+                leaks.append({
+                    'series': name,
+                    'segment': index,
+                    'mix': segment['mix'],
+                    'perHour': round(slope, 2),
+                    'r2': round(r2, 2),
+                    'unit': unit,
+                    'requests': segment['requests']
+                })
+        segments.append(segment)
+
+    return segments, leaks
+
+
+def format_mix(requests_by_endpoint):
+    total = sum(requests_by_endpoint.values())
+    if not total:
+        return "-"
+    parts = sorted(requests_by_endpoint.items(), key=lambda item: -item[1])
+    return ", ".join(f"{endpoint} {count * 100 / total:.0f}%" for endpoint, count in parts)
+
+
+def print_analysis(segments, leaks):
+    print_section("📈 TENDANCES (pente par heure, R²)")
+    for segment in segments:
+        label = "Durée totale" if segment['segment'] == 'total' else \
+            f"Segment {segment['segment']} [{segment['mix']}]"
+        print(f"\n   {label} - {segment['minutes']} min")
+        if segment['requests']:
+            print(f"      trafic: {format_mix(segment['requests'])}")
+        for name, trend in segment['trends'].items():
+            unit = f" {trend['unit']}" if trend['unit'] else ""
+            print(f"      {name:<18} {trend['perHour']:>+10.2f}{unit}/h  (R² {trend['r2']:.2f})")
+
+    if leaks:
+        print_section("🚨 FUITES PROBABLES")
+        for leak in leaks:
+            unit = f" {leak['unit']}" if leak['unit'] else ""
+            where = "sur toute la durée" if leak['segment'] == 'total' else \
+                f"segment {leak['segment']} [{leak['mix']}]"
+            print(f"   - {leak['series']}: {leak['perHour']:+.2f}{unit}/h (R² {leak['r2']:.2f}) {where}")
+            if leak['requests']:
+                print(f"     trafic: {format_mix(leak['requests'])}")
+
+
+# =============================================================================
+# GÉNÉRATION DU TRAFIC
+# =============================================================================
+
+class SoakState:
+    """Segment courant et compteurs de requêtes (partagés entre threads)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.segment = 0
+        self.mix_name = None
+        self.mix = None
+        self.segment_requests = {}
+        self.errors = {}
+        self.students = {}
+        self.stop = threading.Event()
+
+    def start_segment(self, index, mix_name):
+        with self.lock:
+            self.segment = index
+            self.mix_name = mix_name
+            self.mix = MIXES[mix_name]
+            self.segment_requests = {}
+
+    def count(self, endpoint, error=None):
+        with self.lock:
+            self.segment_requests[endpoint] = self.segment_requests.get(endpoint, 0) + 1
+            if error:
+                key = f"{endpoint} → {error}"
+                self.errors[key] = self.errors.get(key, 0) + 1
+
+
+def rest_worker(args, state, tokens, rate_per_worker):
+    session = requests.Session()
+    interval = 1.0 / rate_per_worker
+    while not state.stop.is_set():
+        started = time.time()
+        with state.lock:
+            weights = state.mix['rest']
+        endpoint = random.choices(list(weights), weights=list(weights.values()))[0]
+        method, path = endpoint.split(' ', 1)
+        headers = {}
+        if path.startswith(AUTHENTICATED_PREFIXES):
+            if not tokens:
+                state.stop.wait(interval)
+                continue
+            headers['Authorization'] = f"Bearer {random.choice(tokens)}"
+
+        error = None
+        try:
+            response = session.request(method, f"{args.target}{path}", headers=headers, timeout=30)
+            if response.status_code >= 400:
+                error = f"HTTP {response.status_code}"
+        except requests.RequestException as exc:
+            error = type(exc).__name__
+        state.count(endpoint, error)
+
+        state.stop.wait(max(0.0, interval - (time.time() - started)))
+
+
+def family_students(args, state, token):
+    """Identifiants des élèves de la famille du token (mis en cache, liste vide si aucun)"""
+    with state.lock:
+        if token in state.students:
+            return state.students[token]
+    students = []
+    try:
+        response = requests.get(f"{args.target}/api/students",
+                                headers={"Authorization": f"Bearer {token}"}, timeout=15)
+        data = response.json() if response.content else {}
+        if data.get('success'):
+            students = [student['id'] for student in data['data']['students']]
+    except (requests.RequestException, ValueError, KeyError):
+        pass
+    with state.lock:
+        state.students[token] = students
+    return students
+
+
+def track_room_events(client, state):
+    """Compte les réponses du serveur aux entrées dans les salles"""
+    client.on('battle:joined', lambda data: state.count('WS battle:join'))
+    client.on('battle:error', lambda data: state.count('WS battle:join', (data or {}).get('message')))
+    client.on('mentor:session_started', lambda data: state.count('WS mentor:start_session'))
+    client.on('mentor:error', lambda data: state.count('WS mentor:start_session', (data or {}).get('message')))
+    client.on('analytics:subscribed', lambda data: state.count('WS analytics:subscribe'))
+    client.on('analytics:error', lambda data: state.count('WS analytics:subscribe', (data or {}).get('message')))
+
+
+def enter_rooms(args, client, state, token, admin):
+    """Rejoint une battle partagée et ouvre une session mentor; retourne True si une battle est rejointe"""
+    if admin:
+        client.emit('analytics:subscribe')
+    students = family_students(args, state, token)
+    if not students:
+        state.count('WS battle:join', 'aucun élève pour ce token')
+        return False
+    student_id = random.choice(students)
+    # Un petit nombre de battles partagées: chaque salle doit disparaître quand son dernier participant part
+    client.emit('battle:join', {'battleId': f"soak-battle-{random.randrange(args.ws_battles)}",
+                                'studentId': student_id})
+    client.emit('mentor:start_session', {'studentId': student_id, 'subject': 'Mathématiques'})
+    return True
+
+
+def websocket_worker(args, state, tokens, slot, admin_token=None):
+    """Client WebSocket qui se connecte, bat le cœur puis se déconnecte, en boucle
+
+    Dans un mélange à salles, le client entre aussi dans une battle et une session mentor
+    (et la place 0 s'abonne aux analytics avec le token admin). Une part --ws-abrupt-ratio
+    des connexions est coupée au niveau du transport sans battle:leave: seul le nettoyage
+    de la déconnexion côté serveur peut alors libérer la battle et la session mentor.
+    """
+    while not state.stop.is_set():
+        with state.lock:
+            share = state.mix['websocket']
+            rooms = state.mix['rooms']
+        # Le client n'est actif que si sa place fait partie de la part WebSocket du mélange
+        if slot >= share * args.ws_clients or not tokens:
+            state.stop.wait(5)
+            continue
+
+        admin = rooms and slot == 0 and admin_token is not None
+        token = admin_token if admin else random.choice(tokens)
+        client = socketio.Client(reconnection=False)
+        in_battle = False
+        abrupt = rooms and random.random() < args.ws_abrupt_ratio
+        try:
+            if rooms:
+                track_room_events(client, state)
+            client.connect(args.target, auth={'token': token},
+                           transports=['websocket'], wait_timeout=15)
+            state.count('WS connect')
+            if rooms:
+                in_battle = enter_rooms(args, client, state, token, admin)
+            for _ in range(args.ws_heartbeats):
+                if state.stop.is_set():
+                    break
+                client.emit('heartbeat')
+                state.count('WS heartbeat')
+                state.stop.wait(args.ws_heartbeat_interval)
+            if in_battle and not abrupt:
+                client.emit('battle:leave')
+                state.count('WS battle:leave')
+        except Exception as exc:
+            state.count('WS connect', type(exc).__name__)
+            state.stop.wait(2)
+        finally:
+            try:
+                if abrupt and client.connected:
+                    # Coupure brutale (réseau perdu): pas de paquet de déconnexion socket.io
+                    client.eio.disconnect(abort=True)
+                    state.count('WS coupure brutale')
+                else:
+                    client.disconnect()
+            except Exception:
+                pass
+
+
+def sample_metrics(args, state, admin_token, started, samples_file):
+    samples = []
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    while not state.stop.is_set():
+        try:
+            response = requests.get(f"{args.target}/api/monitoring/process/metrics", headers=headers, timeout=15)
+            data = response.json()
+            if data.get('success'):
+                sample = data['data']
+                with state.lock:
+                    sample.update({
+                        't': time.time() - started,
+                        'segment': state.segment,
+                        'mix': state.mix_name,
+                        'segmentRequests': dict(state.segment_requests)
+                    })
+                samples.append(sample)
+                if samples_file:
+                    samples_file.write(json.dumps(sample) + '\n')
+                    samples_file.flush()
+            else:
+                print(f"⚠️  Métriques indisponibles: {data.get('message')}")
+        except (requests.RequestException, ValueError) as error:
+            print(f"⚠️  Échantillon manqué: {error}")
+        state.stop.wait(args.sample_interval)
+    return samples
+
+
+def run_soak(args):
+    admin_token = args.admin_token or get_admin_token(f"{args.target}/api", ADMIN_KEY)
+    tokens = load_tokens(f"{args.target}/api", args.accounts, args.tokens)
+    mixes = [name.strip() for name in args.mixes.split(',') if name.strip()]
+    for name in mixes:
+        if name not in MIXES:
+            print(f"❌ Mélange inconnu: {name} (disponibles: {', '.join(MIXES)})")
+            sys.exit(1)
+
+    if not tokens:
+        print("⚠️  Aucun token élève: seuls les endpoints publics seront joués")
+    if socketio is None and any(MIXES[name]['websocket'] for name in mixes):
+        print("⚠️  python-socketio absent: pas de trafic WebSocket")
+
+    total_seconds = args.hours * 3600
+    segment_seconds = args.segment_minutes * 60
+    print(f"⏱️  {args.hours}h en segments de {args.segment_minutes} min: {' → '.join(mixes)} (en boucle)")
+    print(f"   REST: {args.rest_workers} workers à {args.rate} req/s | WS: {args.ws_clients} clients"
+          f" | échantillon toutes les {args.sample_interval}s")
+
+    state = SoakState()
+    state.start_segment(0, mixes[0])
+    started = time.time()
+    samples_file = open(args.samples, 'w', encoding='utf-8') if args.samples else None
+
+    threads = []
+    for _ in range(args.rest_workers):
+        threads.append(threading.Thread(target=rest_worker,
+                                        args=(args, state, tokens, args.rate / args.rest_workers), daemon=True))
+    if socketio is not None:
+        for slot in range(args.ws_clients):
+            threads.append(threading.Thread(target=websocket_worker,
+                                            args=(args, state, tokens, slot, admin_token), daemon=True))
+    for thread in threads:
+        thread.start()
+
+    result = {}
+    sampler = threading.Thread(
+        target=lambda: result.setdefault('samples', sample_metrics(args, state, admin_token, started, samples_file)),
+        daemon=True
+    )
+    sampler.start()
+
+    try:
+        segment = 0
+        while time.time() - started < total_seconds:
+            segment_end = min(started + (segment + 1) * segment_seconds, started + total_seconds)
+            while time.time() < segment_end:
+                time.sleep(min(30, max(0.1, segment_end - time.time())))
+                with state.lock:
+                    done = sum(state.segment_requests.values())
+                print(f"   [{(time.time() - started) / 60:6.1f} min] segment {segment} [{state.mix_name}]"
+                      f" - {done} requêtes")
+            segment += 1
+            if time.time() - started < total_seconds:
+                state.start_segment(segment, mixes[segment % len(mixes)])
+                print(f"\n🔀 Segment {segment}: {state.mix_name}")
+    except KeyboardInterrupt:
+        print("\n⏹️  Interrompu - analyse des échantillons collectés")
+
+    state.stop.set()
+    sampler.join(timeout=args.sample_interval + 20)
+    for thread in threads:
+        thread.join(timeout=5)
+    if samples_file:
+        samples_file.close()
+
+    if state.errors:
+        print_section("⚠️  ERREURS")
+        for key, count in sorted(state.errors.items(), key=lambda item: -item[1])[:20]:
+            print(f"   {key}: {count}")
+
+    return result.get('samples', [])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test d'endurance avec détection de fuites")
+    parser.add_argument('--target', default=TARGET_URL, help=f"URL du backend (défaut: {TARGET_URL})")
+    parser.add_argument('--hours', type=float, default=4, help="Durée totale en heures (défaut: 4)")
+    parser.add_argument('--segment-minutes', type=float, default=30, help="Durée d'un segment (défaut: 30)")
+    parser.add_argument('--mixes', default='public,student,websocket,rooms,mixed',
+                        help=f"Mélanges joués à tour de rôle (disponibles: {', '.join(MIXES)})")
+    parser.add_argument('--rate', type=float, default=20, help="Requêtes REST par seconde (défaut: 20)")
+    parser.add_argument('--rest-workers', type=int, default=8, help="Threads REST (défaut: 8)")
+    parser.add_argument('--ws-clients', type=int, default=20, help="Clients WebSocket simultanés (défaut: 20)")
+    parser.add_argument('--ws-heartbeats', type=int, default=10, help="Heartbeats par connexion (défaut: 10)")
+    parser.add_argument('--ws-heartbeat-interval', type=float, default=3, help="Intervalle des heartbeats en s")
+    parser.add_argument('--ws-battles', type=int, default=5, help="Battles partagées du mélange rooms (défaut: 5)")
+    parser.add_argument('--ws-abrupt-ratio', type=float, default=0.3,
+                        help="Part des connexions à salles coupées sans quitter la battle (défaut: 0.3)")
+    parser.add_argument('--accounts', help="Fichier JSON de comptes élèves [{email, password}]")
+    parser.add_argument('--tokens', help="Fichier de tokens d'accès élèves (un par ligne)")
+    parser.add_argument('--admin-token', help="Token admin pour les métriques (sinon généré)")
+    parser.add_argument('--sample-interval', type=float, default=10, help="Échantillonnage en s (défaut: 10)")
+    parser.add_argument('--samples', default='soak-samples.ndjson', help="Fichier des échantillons bruts")
+    parser.add_argument('--min-r2', type=float, default=0.6, help="R² minimum d'une tendance signalée (défaut: 0.6)")
+    parser.add_argument('--warmup', type=float, default=0.1,
+                        help="Part ignorée au début de chaque segment (défaut: 0.1)")
+    parser.add_argument('--analyze', metavar='NDJSON', help="Analyse seulement un fichier d'échantillons existant")
+    parser.add_argument('--json', help="Écrit l'analyse en JSON")
+    args = parser.parse_args()
+
+    print_section("🧪 TEST D'ENDURANCE (SOAK)")
+
+    if args.analyze:
+        with open(args.analyze, 'r', encoding='utf-8') as f:
+            samples = [json.loads(line) for line in f if line.strip()]
+        print(f"📂 {len(samples)} échantillons chargés depuis {args.analyze}")
+    else:
+        samples = run_soak(args)
+
+    if len(samples) < 3:
+        print("❌ Pas assez d'échantillons pour ajuster des tendances")
+        sys.exit(1)
+
+    segments, leaks = analyze(samples, args.min_r2, args.warmup)
+    print_analysis(segments, leaks)
+
+    last = samples[-1]
+    print_section("📊 DERNIER ÉCHANTILLON")
+    print(f"   RSS {last['memory']['rss'] / MB:.1f} Mo | heap {last['memory']['heapUsed'] / MB:.1f} Mo"
+          f" | handles {last['handles']['total']} | boucle p99 {last['eventLoop']['p99Ms']} ms")
+    print(f"   Pool BDD: {last['database'].get('pool')} | initializeModels: "
+          f"{last['database'].get('initializeModelsCalls')} appels")
+    print(f"   WebSocket: {last['sockets']} | cache: {last['cache'].get('total', last['cache'].get('type'))}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'segments': segments, 'leaks': leaks}, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Analyse écrite dans {args.json}")
+
+    if leaks:
+        sys.exit(1)
+    print("\n✅ Aucune croissance suspecte détectée")
+
+
+if __name__ == "__main__":
+    main()
@@ -24,28 +24,37 @@ if not token_data.get('success'):
 token = token_data['token']
 print(f"✅ Token obtenu\n")
 
-# Get admin content
+# Export NDJSON en flux: seules les matières sont gardées, ligne par ligne
 print("📚 Récupération des subjects...\n")
-admin_content = requests.get(
-    f"{API_URL}/admin/content",
-    headers={"Authorization": f"Bearer {token}"}
-).json()
-
-if not admin_content.get('success'):
-    print(f"❌ Erreur: {admin_content.get('message')}")
-    exit(1)
+by_level = {}
+total = 0
 
-subjects = admin_content.get('data', {}).get('subjects', [])
+with requests.get(
+    f"{API_URL}/admin/content",
+    params={"format": "ndjson"},
+    headers={"Authorization": f"Bearer {token}"},
+    stream=True
+) as response:
+    if response.status_code != 200:
+        print(f"❌ Erreur: HTTP {response.status_code}")
+        exit(1)
 
-print(f"Total: {len(subjects)} subjects\n")
+    for line in response.iter_lines():
+        if not line:
+            continue
+        item = json.loads(line)
+        if item.get('type') != 'subject':
+            # Les lessons suivent les subjects dans le flux
+            break
+        total += 1
+        level = item.get('level', 'N/A')
+        by_level.setdefault(level, []).append({
+            'title': item.get('title'),
+            'category': item.get('category'),
+            'isActive': item.get('isActive')
+        })
 
-# Group by level
-by_level = {}
-for subject in subjects:
-    level = subject.get('level', 'N/A')
-    if level not in by_level:
-        by_level[level] = []
-    by_level[level].append(subject)
+print(f"Total: {total} subjects\n")
 
 # Display by level
 print("📊 SUBJECTS PAR NIVEAU:\n")
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Harnais de l'expiration des essais gratuits: traitement par lots vs compte par compte
+
+1. Conformité: une cohorte de référence (backend/src/scripts/seed-trial-cohorts.js) est
+   expirée avec l'ancien traitement (mode row), son état est relevé, puis la même cohorte
+   (même graine) est recréée et expirée par lots (mode bulk); les deux états doivent être
+   identiques compte par compte
+2. Budget: une cohorte de --users comptes (100k par défaut) est expirée par lots via
+   POST /api/admin/subscriptions/run-job/checkExpiredTrials et la durée du job est
+   comparée à --budget-seconds; les métriques par lot (durée, attente de verrous) sont affichées
+
+Le serveur doit utiliser la même base que le script de peuplement (même .env). Le job traite
+tous les essais expirés de la base, pas seulement ceux du banc d'essai: à lancer sur une base
+de test.
+
+Usage:
+    python3 scripts/test/trial-expiry-harness.py
+    python3 scripts/test/trial-expiry-harness.py --reference-users 2000 --users 100000 --budget-seconds 60
+    python3 scripts/test/trial-expiry-harness.py --skip-budget --batch-size 500
+    python3 scripts/test/trial-expiry-harness.py --cleanup-only
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import requests
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+SEED_SCRIPT = os.path.join(REPO_ROOT, 'backend', 'src', 'scripts', 'seed-trial-cohorts.js')
+TARGET_URL = "http://localhost:3001"
+ADMIN_KEY = os.environ.get("CLAUDYNE_ADMIN_KEY", "claudyne-admin-2024")
+
+
+def print_section(title):
+    print(f"\n{'='*60}")
+    print(f"  {title}")
+    print('='*60)
+
+
+def get_admin_token(api_url, admin_key):
+    response = requests.post(f"{api_url}/admin/generate-token", json={"adminKey": admin_key}, timeout=15)
+    data = response.json()
+    if not data.get('success'):
+        print("❌ Échec génération token")
+        sys.exit(1)
+    return data['token']
+
+
+def run_seed(args, *extra, quiet=False):
+    command = [args.node, SEED_SCRIPT, *extra]
+    result = subprocess.run(command, cwd=REPO_ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"   {(result.stdout + result.stderr).strip()}")
+        print("❌ Échec du script de cohortes")
+        sys.exit(1)
+    if not quiet and result.stdout.strip():
+        print(f"   {result.stdout.strip()}")
+    return result.stdout
+
+
+def dump_state(args):
+    """État des comptes du banc d'essai, indexé par email"""
+    output = run_seed(args, '--dump', quiet=True)
+    users = json.loads(output.strip().splitlines()[-1])
+    return {user['email']: user for user in users}
+
+
+def run_job(api_url, headers, mode, batch_size, timeout):
+    payload = {'mode': mode}
+    if batch_size:
+        payload['batchSize'] = batch_size
+
+    started = time.monotonic()
+    response = requests.post(f"{api_url}/admin/subscriptions/run-job/checkExpiredTrials",
+                             json=payload, headers=headers, timeout=timeout)
+    elapsed = time.monotonic() - started
+
+    data = response.json()
+    if response.status_code != 200 or not data.get('success'):
+        raise RuntimeError(f"job {mode} refusé: HTTP {response.status_code} {data.get('message')}")
+    return data.get('result') or {}, elapsed
+
+
+def compare_states(reference, candidate):
+    mismatches = []
+    for email in sorted(set(reference) | set(candidate)):
+        left, right = reference.get(email), candidate.get(email)
+        if left is None or right is None:
+            mismatches.append(f"{email}: absent d'un des relevés")
+        elif (left['subscriptionStatus'], left['isActive']) != (right['subscriptionStatus'], right['isActive']):
+            mismatches.append(f"{email} ({left['subscriptionPlan']}): "
+                              f"{left['subscriptionStatus']}/{left['isActive']} vs "
+                              f"{right['subscriptionStatus']}/{right['isActive']}")
+    return mismatches
+
+
+def print_metrics(result, elapsed):
+    metrics = result.get('metrics', {})
+    print(f"   Comptes traités: {result.get('total')} "
+          f"({result.get('expired')} expirés, {result.get('suspended')} suspendus)")
+    print(f"   Durée: {elapsed:.2f}s (HTTP) | {metrics.get('durationMs', '?')} ms (job)")
+    if metrics:
+        batch_ms = metrics.get('batchMs', {})
+        lock_ms = metrics.get('lockWaitMs', {})
+        print(f"   Lots: {metrics.get('batches')} | durée p50 {batch_ms.get('p50')} ms, "
+              f"p95 {batch_ms.get('p95')} ms, max {batch_ms.get('max')} ms")
+        print(f"   Attente de verrous: {lock_ms.get('total')} ms au total, max {lock_ms.get('max')} ms")
+    if 'notificationsQueued' in result:
+        notifications = result.get('notifications', {})
+        print(f"   Notifications: {result['notificationsQueued']} en file, "
+              f"{notifications.get('delivered', '?')} enregistrées, {notifications.get('failed', '?')} en échec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Harnais de l'expiration des essais gratuits")
+    parser.add_argument('--target', default=TARGET_URL, help=f"URL du backend (défaut: {TARGET_URL})")
+    parser.add_argument('--admin-token', help="Token admin (sinon généré)")
+    parser.add_argument('--node', default='node', help="Exécutable Node.js pour le peuplement (défaut: node)")
+    parser.add_argument('--seed', type=int, default=42, help="Graine des cohortes (défaut: 42)")
+    parser.add_argument('--reference-users', type=int, default=5000,
+                        help="Comptes de la cohorte de conformité (défaut: 5000)")
+    parser.add_argument('--users', type=int, default=100000, help="Comptes de la cohorte de budget (défaut: 100000)")
+    parser.add_argument('--budget-seconds', type=float, default=120.0,
+                        help="Durée maximale du job par lots sur la cohorte de budget (défaut: 120)")
+    parser.add_argument('--batch-size', type=int, help="Comptes par lot (défaut: TRIAL_EXPIRY_BATCH_SIZE du serveur)")
+    parser.add_argument('--timeout', type=float, default=1800, help="Durée max d'un job en s (défaut: 1800)")
+    parser.add_argument('--skip-reference', action='store_true', help="Ne pas vérifier la conformité")
+    parser.add_argument('--skip-budget', action='store_true', help="Ne pas vérifier le budget de temps")
+    parser.add_argument('--keep', action='store_true', help="Conserve les comptes de banc d'essai à la fin")
+    parser.add_argument('--cleanup-only', action='store_true', help="Supprime les comptes de banc d'essai et quitte")
+    parser.add_argument('--json', help="Écrit le rapport en JSON")
+    args = parser.parse_args()
+
+    print_section("🧹 NETTOYAGE")
+    run_seed(args, '--cleanup')
+    if args.cleanup_only:
+        return
+
+    api_url = f"{args.target}/api"
+    admin_token = args.admin_token or get_admin_token(api_url, ADMIN_KEY)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    report = {}
+    problems = []
+    try:
+        if not args.skip_reference:
+            print_section(f"🔍 CONFORMITÉ ({args.reference_users} comptes)")
+            runs = {}
+            for mode in ('row', 'bulk'):
+                run_seed(args, '--users', str(args.reference_users), '--seed', str(args.seed), quiet=mode == 'bulk')
+                result, elapsed = run_job(api_url, headers, mode, args.batch_size, args.timeout)
+                runs[mode] = {'result': result, 'elapsed': elapsed, 'state': dump_state(args)}
+                print(f"   {mode:<5} {result.get('total')} comptes en {elapsed:.2f}s "
+                      f"({result.get('expired')} expirés, {result.get('suspended')} suspendus)")
+                run_seed(args, '--cleanup', quiet=True)
+
+            mismatches = compare_states(runs['row']['state'], runs['bulk']['state'])
+            counts_match = all(runs['row']['result'].get(key) == runs['bulk']['result'].get(key)
+                               for key in ('total', 'expired', 'suspended'))
+            print(f"   Comptes comparés: {len(runs['bulk']['state'])} | différences: {len(mismatches)}")
+            for mismatch in mismatches[:10]:
+                print(f"      {mismatch}")
+            if runs['bulk']['elapsed']:
+                print(f"   Accélération: x{runs['row']['elapsed'] / runs['bulk']['elapsed']:.1f}")
+
+            report['reference'] = {
+                mode: {'result': run['result'], 'elapsedSeconds': run['elapsed']} for mode, run in runs.items()
+            }
+            report['reference']['mismatches'] = mismatches
+            if mismatches:
+                problems.append(f"{len(mismatches)} compte(s) dans un état différent entre les deux modes")
+            if not counts_match:
+                problems.append("compteurs expirés/suspendus différents entre les deux modes")
+
+        if not args.skip_budget:
+            print_section(f"⏱️ BUDGET ({args.users} comptes, {args.budget_seconds:.0f}s)")
+            run_seed(args, '--users', str(args.users), '--seed', str(args.seed))
+            result, elapsed = run_job(api_url, headers, 'bulk', args.batch_size, args.timeout)
+            print_metrics(result, elapsed)
+
+            job_seconds = result.get('metrics', {}).get('durationMs', elapsed * 1000) / 1000
+            report['budget'] = {'users': args.users, 'result': result, 'elapsedSeconds': elapsed,
+                                'budgetSeconds': args.budget_seconds}
+            if result.get('notifications', {}).get('failed'):
+                problems.append(f"{result['notifications']['failed']} notification(s) d'expiration non enregistrée(s)")
+            if job_seconds > args.budget_seconds:
+                problems.append(f"job par lots en {job_seconds:.1f}s > budget {args.budget_seconds:.0f}s")
+    except (RuntimeError, requests.RequestException, ValueError) as error:
+        print(f"\n❌ {error}")
+        problems.append(str(error))
+    finally:
+        if not args.keep:
+            print_section("🧹 NETTOYAGE")
+            run_seed(args, '--cleanup')
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({**report, 'problems': problems}, f, indent=2, ensure_ascii=False, default=str)
+        print(f"\n💾 Rapport écrit dans {args.json}")
+
+    if problems:
+        print("\n❌ Harnais en échec:")
+        for problem in problems:
+            print(f"   - {problem}")
+        sys.exit(1)
+    print("\n✅ Expiration par lots conforme et dans le budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Analyse en streaming des logs d'accès nginx de Claudyne
+
+Lit les logs au format `main_ext` défini dans nginx/nginx.conf
+(rt=$request_time, ut="$upstream_response_time", cs=$upstream_cache_status)
+ainsi que le format `combined` par défaut (sans temps de réponse).
+
+- Fichiers plats lus via mmap, fichiers rotés `.gz` décompressés en flux
+- Routes normalisées: /api/students/42/progress -> /api/students/:id/progress
+- Percentiles de latence par endpoint via histogramme logarithmique
+  (mémoire constante quel que soit le volume de logs)
+- Octets envoyés, statut cache, taux d'erreurs 5xx
+- Top N des routes lentes par fenêtre de temps, par famille de logs (access.log,
+  api.access.log...): chaque famille est chronologique, pas leur enchaînement
+- Ligne antérieure à la fenêtre en cours: comptée dans les totaux seulement, et signalée
+
+Usage:
+    python3 scripts/utils/analyze-nginx-logs.py /var/log/nginx/access.log*
+    python3 scripts/utils/analyze-nginx-logs.py --window 15 --top 5 access.log.2.gz
+    python3 scripts/utils/analyze-nginx-logs.py --json rapport.json /var/log/nginx/
+"""
+
+import argparse
+import gzip
+import json
+import math
+import mmap
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+
+# Format main_ext (nginx/nginx.conf). Les champs après le user-agent sont optionnels
+# pour accepter aussi le format `combined` (nginx-claudyne-optimized.conf).
+LOG_PATTERN = re.compile(
+    rb'^(?P<ip>\S+) \S+ (?P<user>\S+) \[(?P<time>[^\]]+)\] '
+    rb'"(?P<method>[A-Z]+) (?P<path>\S+)(?: [^"]*)?" '
+    rb'(?P<status>\d{3}) (?P<bytes>\d+|-)'
+    rb'(?: "[^"]*" "[^"]*")?'
+    rb'(?:.*? rt=(?P<rt>[\d.]+|-))?'
+    rb'(?:.*? ut="(?P<ut>[^"]*)")?'
+    rb'(?:.*? cs=(?P<cs>\S+))?'
+)
+
+TIME_FORMAT = '%d/%b/%Y:%H:%M:%S %z'
+
+# Segments de chemin considérés comme des identifiants
+ID_PATTERNS = [
+    re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'),  # UUID
+    re.compile(r'^\d+$'),                      # ID numérique
+    re.compile(r'^[0-9a-fA-F]{16,}$'),         # hash / token hexadécimal
+    re.compile(r'^[A-Z]{2,5}-[A-Z0-9-]{4,}$'),  # référence (ex: PAY-2025-XXXX)
+]
+
+STATIC_EXTENSIONS = ('.js', '.css', '.png', '.jpg', '.jpeg', '.svg', '.ico',
+                     '.woff', '.woff2', '.ttf', '.webp', '.gif', '.map')
+
+
+def normalize_route(path):
+    """Normalise un chemin de requête en identifiant de route"""
+    path = path.split('?', 1)[0].split('#', 1)[0]
+    if path.lower().endswith(STATIC_EXTENSIONS):
+        return '[static]' + os.path.splitext(path)[1].lower()
+
+    segments = []
+    for segment in path.split('/'):
+        if segment and any(pattern.match(segment) for pattern in ID_PATTERNS):
+            segments.append(':id')
+        else:
+            segments.append(segment)
+
+    route = '/'.join(segments)
+    if len(route) > 1:
+        route = route.rstrip('/')
+    return route or '/'
+
+
+def parse_upstream_time(value):
+    """Additionne les temps upstream ("0.010, 0.120" en cas de retry)"""
+    if not value:
+        return None
+    total = 0.0
+    found = False
+    for part in value.replace(':', ',').split(','):
+        part = part.strip()
+        if part and part != '-':
+            try:
+                total += float(part)
+                found = True
+            except ValueError:
+                continue
+    return total if found else None
+
+
+class LatencyHistogram:
+    """Histogramme logarithmique (précision ~2%) pour percentiles en mémoire constante"""
+
+    GROWTH = 1.02
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        ms = seconds * 1000.0
+        index = 0 if ms < 1 else int(math.log(ms) / math.log(self.GROWTH)) + 1
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def merge(self, other):
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, p):
+        """Retourne le percentile p (0-100) en millisecondes"""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(self.count * p / 100.0))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                upper = 1.0 if index == 0 else self.GROWTH ** index
+                return min(upper, self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+
+class RouteStats:
+    """Statistiques agrégées pour une route (method + route normalisée)"""
+
+    def __init__(self):
+        self.requests = 0
+        self.bytes_out = 0
+        self.errors_5xx = 0
+        self.errors_4xx = 0
+        self.request_time = LatencyHistogram()
+        self.upstream_time = LatencyHistogram()
+        self.cache_status = {}
+
+    def add(self, status, body_bytes, rt, ut, cache_status):
+        self.requests += 1
+        self.bytes_out += body_bytes
+        if status >= 500:
+            self.errors_5xx += 1
+        elif status >= 400:
+            self.errors_4xx += 1
+        if rt is not None:
+            self.request_time.add(rt)
+        if ut is not None:
+            self.upstream_time.add(ut)
+        if cache_status:
+            self.cache_status[cache_status] = self.cache_status.get(cache_status, 0) + 1
+
+    def merge(self, other):
+        self.requests += other.requests
+        self.bytes_out += other.bytes_out
+        self.errors_5xx += other.errors_5xx
+        self.errors_4xx += other.errors_4xx
+        self.request_time.merge(other.request_time)
+        self.upstream_time.merge(other.upstream_time)
+        for key, count in other.cache_status.items():
+            self.cache_status[key] = self.cache_status.get(key, 0) + count
+
+    def to_dict(self):
+        def percentiles(histogram):
+            if not histogram.count:
+                return None
+            return {
+                'p50': round(histogram.percentile(50), 1),
+                'p90': round(histogram.percentile(90), 1),
+                'p95': round(histogram.percentile(95), 1),
+                'p99': round(histogram.percentile(99), 1),
+                'max': round(histogram.max, 1),
+                'mean': round(histogram.mean, 1),
+            }
+
+        return {
+            'requests': self.requests,
+            'bytesOut': self.bytes_out,
+            'errors4xx': self.errors_4xx,
+            'errors5xx': self.errors_5xx,
+            'requestTimeMs': percentiles(self.request_time),
+            'upstreamTimeMs': percentiles(self.upstream_time),
+            'cacheStatus': self.cache_status,
+        }
+
+
+def rotation_order(path):
+    """Trie access.log.3.gz, access.log.2.gz, access.log.1, access.log (du plus ancien au plus récent)"""
+    name = os.path.basename(path)
+    match = re.search(r'\.(\d+)(?:\.gz)?$', name)
+    rotation = int(match.group(1)) if match else 0
+    base = name[:match.start()] if match else name
+    return (base, -rotation)
+
+
+def log_family(path):
+    """Famille de logs d'un fichier (access.log pour access.log.2.gz)"""
+    return rotation_order(path)[0] if path != '-' else 'stdin'
+
+
+def collect_files(inputs):
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for name in os.listdir(item):
+                if 'access' in name and ('.log' in name):
+                    files.append(os.path.join(item, name))
+        else:
+            files.append(item)
+    return sorted(files, key=rotation_order)
+
+
+def iter_lines(path):
+    """Itère sur les lignes (bytes) d'un fichier plat (mmap) ou gzip (flux)"""
+    if path.endswith('.gz'):
+        with gzip.open(path, 'rb') as f:
+            for line in f:
+                yield line
+        return
+
+    if path == '-':
+        for line in sys.stdin.buffer:
+            yield line
+        return
+
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            line = mapped.readline()
+            while line:
+                yield line
+                line = mapped.readline()
+
+
+class LogAnalyzer:
+    """Agrège les logs en une seule passe, fenêtre par fenêtre"""
+
+    def __init__(self, window_minutes=60, top=10, min_requests=5, on_window=None):
+        self.window = timedelta(minutes=window_minutes)
+        self.top = top
+        self.min_requests = min_requests
+        self.on_window = on_window
+        self.totals = {}
+        # Fenêtre en cours par famille de logs: {'start': datetime, 'stats': {route: RouteStats}}
+        self.streams = {}
+        self.windows = []
+        self.lines = 0
+        self.skipped = 0
+        self.out_of_order = 0
+        self.first_seen = None
+        self.last_seen = None
+
+    def _window_start(self, timestamp):
+        epoch = datetime(1970, 1, 1, tzinfo=timestamp.tzinfo)
+        offset = (timestamp - epoch) // self.window
+        return epoch + offset * self.window
+
+    def _close_window(self, source, stream):
+        if stream['start'] is None:
+            return
+        slow = [
+            (key, stats) for key, stats in stream['stats'].items()
+            if stats.request_time.count >= self.min_requests
+        ]
+        slow.sort(key=lambda item: item[1].request_time.percentile(95), reverse=True)
+        summary = {
+            'start': stream['start'].isoformat(),
+            'source': source,
+            'requests': sum(stats.requests for stats in stream['stats'].values()),
+            'slowest': [
+                {
+                    'route': key,
+                    'requests': stats.requests,
+                    'p95Ms': round(stats.request_time.percentile(95), 1),
+                    'p99Ms': round(stats.request_time.percentile(99), 1),
+                }
+                for key, stats in slow[:self.top]
+            ],
+        }
+        self.windows.append(summary)
+        if self.on_window:
+            self.on_window(summary)
+
+        for key, stats in stream['stats'].items():
+            self.totals.setdefault(key, RouteStats()).merge(stats)
+        stream['stats'] = {}
+
+    def feed(self, line, source=None):
+        self.lines += 1
+        match = LOG_PATTERN.match(line)
+        if not match:
+            self.skipped += 1
+            return
+
+        try:
+            timestamp = datetime.strptime(match.group('time').decode('ascii'), TIME_FORMAT)
+        except ValueError:
+            self.skipped += 1
+            return
+
+        window_start = self._window_start(timestamp)
+        stream = self.streams.setdefault(source, {'start': None, 'stats': {}})
+        if stream['start'] is None or window_start > stream['start']:
+            # Une famille de logs est chronologique: sa fenêtre précédente est terminée
+            self._close_window(source, stream)
+            stream['start'] = window_start
+            target = stream['stats']
+        elif window_start < stream['start']:
+            # Fenêtre déjà fermée: la ligne ne compte que dans les totaux
+            self.out_of_order += 1
+            target = None
+        else:
+            target = stream['stats']
+        if self.first_seen is None or timestamp < self.first_seen:
+            self.first_seen = timestamp
+        if self.last_seen is None or timestamp > self.last_seen:
+            self.last_seen = timestamp
+
+        method = match.group('method').decode('ascii', 'replace')
+        route = normalize_route(match.group('path').decode('utf-8', 'replace'))
+        raw_bytes = match.group('bytes')
+        raw_rt = match.group('rt')
+        raw_ut = match.group('ut')
+        raw_cs = match.group('cs')
+
+        rt = float(raw_rt) if raw_rt and raw_rt != b'-' else None
+        ut = parse_upstream_time(raw_ut.decode('ascii', 'replace')) if raw_ut else None
+        cache_status = raw_cs.decode('ascii', 'replace') if raw_cs and raw_cs != b'-' else None
+
+        key = f"{method} {route}"
+        if target is None:
+            target = self.totals
+        stats = target.get(key)
+        if stats is None:
+            stats = target[key] = RouteStats()
+        stats.add(
+            int(match.group('status')),
+            int(raw_bytes) if raw_bytes != b'-' else 0,
+            rt, ut, cache_status
+        )
+
+    def finish(self):
+        for source, stream in self.streams.items():
+            self._close_window(source, stream)
+        return self.report()
+
+    def report(self):
+        routes = sorted(self.totals.items(), key=lambda item: item[1].requests, reverse=True)
+        return {
+            'generatedAt': datetime.now().isoformat(),
+            'lines': self.lines,
+            'skipped': self.skipped,
+            'outOfOrder': self.out_of_order,
+            'from': self.first_seen.isoformat() if self.first_seen else None,
+            'to': self.last_seen.isoformat() if self.last_seen else None,
+            'routes': {key: stats.to_dict() for key, stats in routes},
+            'windows': sorted(self.windows, key=lambda window: window['start']),
+        }
+
+
+def format_bytes(value):
+    for unit in ('o', 'Ko', 'Mo', 'Go'):
+        if value < 1024:
+            return f"{value:.0f} {unit}"
+        value /= 1024.0
+    return f"{value:.1f} To"
+
+
+def print_window(summary):
+    if not summary['slowest']:
+        return
+    source = f" [{summary['source']}]" if summary['source'] else ""
+    print(f"\n⏱️  Fenêtre {summary['start']}{source} - {summary['requests']} requêtes")
+    for item in summary['slowest']:
+        print(f"   {item['p95Ms']:>8.1f} ms p95 | {item['p99Ms']:>8.1f} ms p99 | "
+              f"{item['requests']:>6} req | {item['route']}")
+
+
+def print_report(report, limit):
+    print(f"\n{'=' * 100}")
+    print("📊 LATENCE PAR ENDPOINT")
+    print('=' * 100)
+    print(f"Lignes: {report['lines']} (ignorées: {report['skipped']}) | "
+          f"Période: {report['from']} → {report['to']}")
+    if report['outOfOrder']:
+        print(f"⚠️  {report['outOfOrder']} lignes antérieures à la fenêtre en cours de leur famille de logs: "
+              f"comptées dans les totaux, pas dans les fenêtres")
+    print(f"\n{'Route':<45} {'Req':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'5xx':>6} {'Sortie':>10}  Cache")
+    print('-' * 100)
+
+    for key, stats in list(report['routes'].items())[:limit]:
+        latency = stats['requestTimeMs'] or {}
+        cache = ' '.join(f"{status}:{count}" for status, count in sorted(stats['cacheStatus'].items()))
+        print(f"{key[:45]:<45} {stats['requests']:>8} "
+              f"{latency.get('p50', '-'):>8} {latency.get('p95', '-'):>8} {latency.get('p99', '-'):>8} "
+              f"{stats['errors5xx']:>6} {format_bytes(stats['bytesOut']):>10}  {cache}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyse de latence des logs d'accès nginx")
+    parser.add_argument('inputs', nargs='+', help="Fichiers de log (.log, .gz), dossiers ou '-' pour stdin")
+    parser.add_argument('--window', type=int, default=60, help="Taille de fenêtre en minutes (défaut: 60)")
+    parser.add_argument('--top', type=int, default=10, help="Routes lentes affichées par fenêtre (défaut: 10)")
+    parser.add_argument('--min-requests', type=int, default=5,
+                        help="Requêtes minimum pour classer une route dans une fenêtre (défaut: 5)")
+    parser.add_argument('--routes', type=int, default=50, help="Routes affichées dans le résumé (défaut: 50)")
+    parser.add_argument('--json', metavar='FICHIER', help="Écrire le rapport complet en JSON")
+    parser.add_argument('--quiet', action='store_true', help="Ne pas afficher le détail par fenêtre")
+    args = parser.parse_args()
+
+    analyzer = LogAnalyzer(
+        window_minutes=args.window,
+        top=args.top,
+        min_requests=args.min_requests,
+        on_window=None if args.quiet else print_window
+    )
+
+    for path in collect_files(args.inputs):
+        print(f"📖 Lecture de {path}...", file=sys.stderr)
+        for line in iter_lines(path):
+            analyzer.feed(line, log_family(path))
+
+    report = analyzer.finish()
+    print_report(report, args.routes)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n✅ Rapport JSON écrit dans {args.json}")
+
+
+if __name__ == "__main__":
+    main()
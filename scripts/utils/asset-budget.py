@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Budget de poids des pages Claudyne et manifeste de précache du service worker
+
+check: mesure chaque page HTML (taille brute, gzip, brotli, scripts et styles inline,
+       images base64, requêtes tierces) et la compare à son budget (PAGE_BUDGETS,
+       DEFAULT_BUDGET pour les autres pages). Code de sortie 1 si un budget est dépassé.
+
+manifest: génère precache-manifest.js (importé par sw.js) avec une révision SHA-256 par
+          fichier. Le service worker ne retélécharge que les fichiers dont la révision a
+          changé au lieu de vider tout son cache à chaque version.
+          --check échoue si le manifeste sur disque n'est plus à jour (avant déploiement).
+
+Le manifeste doit être servi sans cache HTTP long (comme sw.js): c'est sa modification
+qui déclenche la mise à jour du service worker.
+
+La mesure brotli nécessite le module brotli (pip install brotli); sans lui, la colonne
+et son budget sont ignorés.
+
+Usage:
+    python3 scripts/utils/asset-budget.py check
+    python3 scripts/utils/asset-budget.py check student-interface-modern.html --json budget.json
+    python3 scripts/utils/asset-budget.py manifest
+    python3 scripts/utils/asset-budget.py manifest --check
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+MANIFEST_FILE = 'precache-manifest.js'
+FIRST_PARTY_HOSTS = {'claudyne.com', 'www.claudyne.com'}
+
+# Pages mises en cache à l'installation du service worker, avec les fichiers locaux
+# qu'elles référencent. L'interface admin (réseau d'abord) n'y figure pas: elle ne doit
+# pas être téléchargée sur les appareils des élèves.
+PRECACHE_PAGES = ['index.html', 'student-interface-modern.html']
+PRECACHE_EXTRA = ['manifest.json']
+
+# Budgets en octets (third_party: nombre d'URL tierces distinctes)
+DEFAULT_BUDGET = {
+    'raw': 100 * 1024,
+    'gzip': 25 * 1024,
+    'brotli': 20 * 1024,
+    'inline_script': 50 * 1024,
+    'inline_style': 30 * 1024,
+    'base64': 10 * 1024,
+    'third_party': 3
+}
+
+# Pages monolithiques: plafonds au niveau actuel pour bloquer toute régression,
+# à abaisser au fur et à mesure du découpage
+PAGE_BUDGETS = {
+    'index.html': {
+        'raw': 210 * 1024, 'gzip': 38 * 1024, 'brotli': 32 * 1024,
+        'inline_script': 65 * 1024, 'inline_style': 72 * 1024, 'third_party': 2
+    },
+    'student-interface-modern.html': {
+        'raw': 385 * 1024, 'gzip': 60 * 1024, 'brotli': 51 * 1024,
+        'inline_script': 175 * 1024, 'inline_style': 52 * 1024, 'third_party': 1
+    },
+    'admin-interface.html': {
+        'raw': 660 * 1024, 'gzip': 95 * 1024, 'brotli': 80 * 1024,
+        'inline_script': 400 * 1024, 'inline_style': 100 * 1024, 'third_party': 1
+    },
+    os.path.join('parent-interface', 'index.html'): {
+        'raw': 210 * 1024, 'gzip': 27 * 1024, 'brotli': 23 * 1024,
+        'inline_style': 58 * 1024, 'third_party': 3
+    }
+}
+
+METRICS = ['raw', 'gzip', 'brotli', 'inline_script', 'inline_style', 'base64', 'third_party']
+
+BASE64_IMAGE_PATTERN = re.compile(rb'data:image/[\w.+-]+;base64,[A-Za-z0-9+/=\s]+')
+CSS_URL_PATTERN = re.compile(r'''(?:@import\s+|url\()\s*['"]?((?:https?:)?//[^'")\s]+)''', re.IGNORECASE)
+
+# Balises qui déclenchent une requête au chargement de la page
+RESOURCE_ATTRIBUTES = {
+    'script': 'src',
+    'img': 'src',
+    'iframe': 'src',
+    'audio': 'src',
+    'video': 'src',
+    'source': 'src',
+    'embed': 'src'
+}
+LINK_RESOURCE_RELS = {'stylesheet', 'icon', 'preload', 'prefetch', 'modulepreload', 'manifest', 'apple-touch-icon'}
+LOCAL_ASSET_TAGS = {'script', 'img', 'link'}
+
+
+def print_section(title):
+    print(f"\n{'='*60}")
+    print(f"  {title}")
+    print('='*60)
+
+
+def format_size(size):
+    if size is None:
+        return '-'
+    if size < 1024:
+        return f"{size} o"
+    return f"{size / 1024:.1f} Ko"
+
+
+class PageScanner(HTMLParser):
+    """Relève le poids inline et les ressources référencées d'une page"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.inline_script = 0
+        self.inline_style = 0
+        self.resources = []
+        self.current = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if attrs.get('style'):
+            self.inline_style += len(attrs['style'].encode('utf-8'))
+
+        if tag == 'script' and not attrs.get('src'):
+            self.current = 'script'
+        elif tag == 'style':
+            self.current = 'style'
+
+        if tag == 'link':
+            rels = set((attrs.get('rel') or '').lower().split())
+            if rels & LINK_RESOURCE_RELS and attrs.get('href'):
+                self.resources.append((tag, attrs['href']))
+        elif tag in RESOURCE_ATTRIBUTES and attrs.get(RESOURCE_ATTRIBUTES[tag]):
+            self.resources.append((tag, attrs[RESOURCE_ATTRIBUTES[tag]]))
+
+    def handle_endtag(self, tag):
+        if tag in ('script', 'style'):
+            self.current = None
+
+    def handle_data(self, data):
+        if self.current == 'script':
+            self.inline_script += len(data.encode('utf-8'))
+        elif self.current == 'style':
+            self.inline_style += len(data.encode('utf-8'))
+            for match in CSS_URL_PATTERN.finditer(data):
+                self.resources.append(('css', match.group(1)))
+
+
+def third_party_host(url):
+    """Hôte d'une URL tierce, None pour une URL locale, data: ou dynamique (${...})"""
+    if url.startswith('data:') or '${' in url:
+        return None
+    host = urlsplit(url if not url.startswith('//') else f"https:{url}").hostname
+    if not host or host in FIRST_PARTY_HOSTS:
+        return None
+    return host
+
+
+def local_asset_path(url):
+    """Chemin relatif à la racine d'une ressource locale existante, sinon None"""
+    parts = urlsplit(url)
+    if parts.scheme or parts.netloc or url.startswith(('data:', '#')) or '${' in url:
+        return None
+    path = os.path.normpath(parts.path.lstrip('/'))
+    if path.startswith('..') or not os.path.isfile(os.path.join(REPO_ROOT, path)):
+        return None
+    return path
+
+
+def measure_page(path):
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    scanner = PageScanner()
+    scanner.feed(content.decode('utf-8', errors='replace'))
+    scanner.close()
+
+    third_party = sorted({url for _, url in scanner.resources if third_party_host(url)})
+
+    return {
+        'raw': len(content),
+        'gzip': len(gzip.compress(content, compresslevel=9)),
+        'brotli': len(brotli.compress(content, quality=11)) if brotli else None,
+        'inline_script': scanner.inline_script,
+        'inline_style': scanner.inline_style,
+        'base64': sum(len(match.group(0)) for match in BASE64_IMAGE_PATTERN.finditer(content)),
+        'third_party': len(third_party),
+        'third_party_urls': third_party,
+        'local_assets': sorted({asset for tag, url in scanner.resources
+                                if tag in LOCAL_ASSET_TAGS for asset in [local_asset_path(url)] if asset})
+    }
+
+
+def default_pages():
+    pages = sorted(name for name in os.listdir(REPO_ROOT) if name.endswith('.html'))
+    if os.path.isfile(os.path.join(REPO_ROOT, 'parent-interface', 'index.html')):
+        pages.append(os.path.join('parent-interface', 'index.html'))
+    return pages
+
+
+def check_budgets(args):
+    pages = args.pages or default_pages()
+    if brotli is None:
+        print("⚠️  Module brotli absent (pip install brotli): tailles brotli non mesurées")
+
+    print_section("📏 POIDS DES PAGES")
+    print(f"   {'Page':<32} {'Brut':>10} {'gzip':>10} {'brotli':>10} {'JS inline':>10} "
+          f"{'CSS inline':>10} {'base64':>10} {'Tiers':>6}")
+
+    report = {}
+    violations = []
+    for page in pages:
+        path = os.path.join(REPO_ROOT, page)
+        if not os.path.isfile(path):
+            print(f"   ⚠️  {page}: introuvable")
+            continue
+
+        measures = measure_page(path)
+        budget = {**DEFAULT_BUDGET, **PAGE_BUDGETS.get(page, {})}
+        over = [metric for metric in METRICS
+                if measures[metric] is not None and measures[metric] > budget[metric]]
+
+        print(f"   {'❌' if over else '✅'} {page[:30]:<30} "
+              + ' '.join(f"{format_size(measures[metric]):>10}" for metric in METRICS[:-1])
+              + f" {measures['third_party']:>6}")
+
+        for metric in over:
+            limit = budget[metric] if metric == 'third_party' else format_size(budget[metric])
+            value = measures[metric] if metric == 'third_party' else format_size(measures[metric])
+            violations.append(f"{page}: {metric} {value} > {limit}")
+
+        report[page] = {'measures': measures, 'budget': budget, 'over': over}
+
+    if args.verbose:
+        print_section("🌍 REQUÊTES TIERCES")
+        for page, entry in report.items():
+            for url in entry['measures']['third_party_urls']:
+                print(f"   {page}: {url}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'pages': report, 'violations': violations, 'brotli': brotli is not None},
+                      f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Rapport écrit dans {args.json}")
+
+    if violations:
+        print("\n❌ Budgets dépassés:")
+        for violation in violations:
+            print(f"   - {violation}")
+        return 1
+    print("\n✅ Toutes les pages respectent leur budget")
+    return 0
+
+
+def file_revision(path):
+    digest = hashlib.sha256()
+    with open(os.path.join(REPO_ROOT, path), 'rb') as f:
+        for block in iter(lambda: f.read(65536), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def build_manifest():
+    files = []
+    for page in PRECACHE_PAGES:
+        files.append(page)
+        files.extend(measure_page(os.path.join(REPO_ROOT, page))['local_assets'])
+    files.extend(path for path in PRECACHE_EXTRA if os.path.isfile(os.path.join(REPO_ROOT, path)))
+
+    assets = []
+    for path in dict.fromkeys(files):
+        assets.append({
+            'url': '/' + path.replace(os.sep, '/'),
+            'revision': file_revision(path),
+            'size': os.path.getsize(os.path.join(REPO_ROOT, path))
+        })
+
+    version = hashlib.sha256(''.join(f"{a['url']}:{a['revision']}" for a in assets).encode()).hexdigest()[:12]
+    return {'version': version, 'assets': assets}
+
+
+def render_manifest(manifest):
+    return ("// Généré par scripts/utils/asset-budget.py manifest - ne pas modifier à la main\n"
+            f"self.__PRECACHE_MANIFEST = {json.dumps(manifest, indent=2)};\n")
+
+
+def write_manifest(args):
+    manifest = build_manifest()
+    content = render_manifest(manifest)
+    path = os.path.join(REPO_ROOT, args.output)
+
+    existing = None
+    if os.path.isfile(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            existing = f.read()
+
+    print_section(f"📦 MANIFESTE DE PRÉCACHE {manifest['version']}")
+    for asset in manifest['assets']:
+        print(f"   {asset['url']:<40} {asset['revision'][:12]} {format_size(asset['size']):>10}")
+    print(f"   Total: {len(manifest['assets'])} fichiers, "
+          f"{format_size(sum(asset['size'] for asset in manifest['assets']))}")
+
+    if args.check:
+        if existing != content:
+            print(f"\n❌ {args.output} n'est plus à jour: lancez asset-budget.py manifest")
+            return 1
+        print(f"\n✅ {args.output} à jour")
+        return 0
+
+    if existing == content:
+        print(f"\nℹ️  {args.output} inchangé")
+        return 0
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    print(f"\n💾 {args.output} écrit")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Budget de poids des pages et manifeste de précache Claudyne")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    check_parser = subparsers.add_parser('check', help="Mesure les pages et vérifie leurs budgets")
+    check_parser.add_argument('pages', nargs='*',
+                              help="Pages relatives à la racine (défaut: *.html et parent-interface/index.html)")
+    check_parser.add_argument('--verbose', action='store_true', help="Liste les URL tierces de chaque page")
+    check_parser.add_argument('--json', help="Écrit le rapport en JSON")
+
+    manifest_parser = subparsers.add_parser('manifest', help="Génère le manifeste de précache de sw.js")
+    manifest_parser.add_argument('--output', default=MANIFEST_FILE,
+                                 help=f"Fichier généré, relatif à la racine (défaut: {MANIFEST_FILE})")
+    manifest_parser.add_argument('--check', action='store_true',
+                                 help="Vérifie que le manifeste est à jour sans l'écrire")
+
+    args = parser.parse_args()
+    if args.command == 'check':
+        sys.exit(check_budgets(args))
+    sys.exit(write_manifest(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Téléchargement en flux des exports admin vers le disque
+
+Consomme les exports NDJSON / CSV de l'API sans jamais charger le résultat
+en mémoire: les octets reçus sont écrits directement dans le fichier.
+Le transfert est compressé (gzip) et peut être conservé tel quel avec --gzip.
+
+Exports disponibles:
+    progress   GET /api/admin/analytics/export?format=ndjson|csv&dataset=progress
+    students   GET /api/admin/analytics/export?format=ndjson|csv&dataset=students
+    content    GET /api/admin/content?format=ndjson
+
+Usage:
+    python3 scripts/utils/export-to-disk.py progress progress.ndjson
+    python3 scripts/utils/export-to-disk.py students eleves.csv --format csv
+    python3 scripts/utils/export-to-disk.py progress progress.ndjson.gz --gzip --since 2026-09-01
+    python3 scripts/utils/export-to-disk.py content contenu.ndjson --api http://localhost:3001/api
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import requests
+
+API_URL = "https://claudyne.com/api"
+ADMIN_KEY = os.environ.get("CLAUDYNE_ADMIN_KEY", "claudyne-admin-2024")
+
+CHUNK_SIZE = 256 * 1024
+
+
+def get_admin_token(api_url, admin_key):
+    response = requests.post(f"{api_url}/admin/generate-token", json={"adminKey": admin_key}, timeout=15)
+    data = response.json()
+    if not data.get('success'):
+        print("❌ Échec génération token")
+        sys.exit(1)
+    return data['token']
+
+
+def build_request(api_url, export, export_format, since):
+    if export == 'content':
+        return f"{api_url}/admin/content", {"format": "ndjson"}
+    params = {"format": export_format, "dataset": export}
+    if since:
+        params["since"] = since
+    return f"{api_url}/admin/analytics/export", params
+
+
+def format_size(size):
+    for unit in ('o', 'Ko', 'Mo', 'Go'):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024.0
+    return f"{size:.1f} To"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export admin en flux vers un fichier")
+    parser.add_argument('export', choices=['progress', 'students', 'content'], help="Export à télécharger")
+    parser.add_argument('output', help="Fichier de destination")
+    parser.add_argument('--format', dest='export_format', choices=['ndjson', 'csv'], default='ndjson',
+                        help="Format (défaut: ndjson, csv non disponible pour content)")
+    parser.add_argument('--since', help="Seulement les lignes modifiées depuis cette date (progress)")
+    parser.add_argument('--gzip', action='store_true', help="Conserver le flux compressé tel que reçu")
+    parser.add_argument('--api', default=API_URL, help=f"URL de l'API (défaut: {API_URL})")
+    parser.add_argument('--token', help="Token admin (sinon généré avec CLAUDYNE_ADMIN_KEY)")
+    args = parser.parse_args()
+
+    if args.export == 'content' and args.export_format == 'csv':
+        parser.error("L'export content n'existe qu'en NDJSON")
+
+    token = args.token or get_admin_token(args.api, ADMIN_KEY)
+    url, params = build_request(args.api, args.export, args.export_format, args.since)
+
+    print(f"📥 Export {args.export} → {args.output}")
+    started = time.time()
+    received = 0
+    lines = 0
+    tmp_path = args.output + '.part'
+
+    try:
+        with requests.get(
+            url,
+            params=params,
+            headers={"Authorization": f"Bearer {token}", "Accept-Encoding": "gzip"},
+            stream=True,
+            timeout=(15, 300)
+        ) as response:
+            if response.status_code != 200:
+                print(f"❌ HTTP {response.status_code}: {response.text[:200]}")
+                sys.exit(1)
+
+            compressed = response.headers.get('Content-Encoding') == 'gzip'
+            if args.gzip and not compressed:
+                print("⚠️  Le serveur n'a pas compressé la réponse: écriture non compressée")
+
+            if args.gzip and compressed:
+                chunks = response.raw.stream(CHUNK_SIZE, decode_content=False)
+            else:
+                chunks = response.iter_content(chunk_size=CHUNK_SIZE)
+
+            last_report = started
+            with open(tmp_path, 'wb') as out:
+                for chunk in chunks:
+                    out.write(chunk)
+                    received += len(chunk)
+                    if not (args.gzip and compressed):
+                        lines += chunk.count(b'\n')
+
+                    now = time.time()
+                    if now - last_report >= 2:
+                        rate = received / max(now - started, 0.001)
+                        print(f"   ... {format_size(received)} ({format_size(rate)}/s)"
+                              + (f" - {lines} lignes" if lines else ""))
+                        last_report = now
+
+    except (requests.ConnectionError, requests.exceptions.ChunkedEncodingError) as error:
+        # Le serveur coupe le flux en cas d'erreur en cours d'export
+        print(f"❌ Flux interrompu après {format_size(received)}: {error}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        sys.exit(1)
+
+    os.replace(tmp_path, args.output)
+    duration = time.time() - started
+
+    print(f"\n✅ {format_size(received)} écrits en {duration:.1f}s"
+          + (f" ({lines} lignes)" if lines else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Import en flux du contenu pédagogique (subjects / lessons) au format NDJSON
+
+Envoie le fichier par lots à POST /api/admin/bulk/content/import, en pipeline
+(plusieurs lots en vol), avec contre-pression et nouvelles tentatives.
+L'import est idempotent (upsert par externalKey): relancer après un échec
+ne crée pas de doublons.
+
+Format d'entrée, une entrée JSON par ligne (fichiers .ndjson ou .ndjson.gz):
+    {"type":"subject","externalKey":"math-6eme","title":"Mathématiques 6ème","subject":"mathematiques","level":"6eme"}
+    {"type":"lesson","externalKey":"math-6eme-c1-l1","subjectKey":"math-6eme","title":"Nombres entiers","content":{...}}
+
+Les lots contenant des subjects sont envoyés seuls (barrière) pour que les
+leçons des lots suivants puissent les référencer.
+
+Usage:
+    python3 scripts/utils/import-content-ndjson.py curriculum-math.ndjson
+    python3 scripts/utils/import-content-ndjson.py *.ndjson.gz --api http://localhost:3001/api --workers 4
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import requests
+
+API_URL = "https://claudyne.com/api"
+ADMIN_KEY = os.environ.get("CLAUDYNE_ADMIN_KEY", "claudyne-admin-2024")
+
+# 500 n'est pas réessayé: une erreur serveur sur un lot donné est déterministe
+RETRYABLE_STATUS = (429, 502, 503, 504)
+
+
+def get_admin_token(api_url, admin_key):
+    response = requests.post(f"{api_url}/admin/generate-token", json={"adminKey": admin_key}, timeout=15)
+    data = response.json()
+    if not data.get('success'):
+        print("❌ Échec génération token")
+        sys.exit(1)
+    return data['token']
+
+
+def open_source(path):
+    if path == '-':
+        return sys.stdin
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def iter_batches(paths, batch_size, max_bytes):
+    """Produit des lots (lignes, contient_des_subjects) sans charger les fichiers en mémoire"""
+    lines = []
+    size = 0
+    has_subjects = False
+
+    for path in paths:
+        with open_source(path) as source:
+            for line in source:
+                line = line.strip()
+                if not line:
+                    continue
+                # Détection légère sans parser toute la ligne
+                is_subject = '"type":"subject"' in line.replace(' ', '')
+                if lines and is_subject != has_subjects:
+                    yield lines, has_subjects
+                    lines, size = [], 0
+                has_subjects = is_subject
+                lines.append(line)
+                size += len(line) + 1
+                if len(lines) >= batch_size or size >= max_bytes:
+                    yield lines, has_subjects
+                    lines, size = [], 0
+    if lines:
+        yield lines, has_subjects
+
+
+def send_batch(session, api_url, token, lines, retries):
+    payload = ('\n'.join(lines) + '\n').encode('utf-8')
+    delay = 1.0
+    last_error = None
+
+    for attempt in range(retries + 1):
+        try:
+            response = session.post(
+                f"{api_url}/admin/bulk/content/import",
+                data=payload,
+                headers={
+                    "Authorization": f"Bearer {token}",
+                    "Content-Type": "application/x-ndjson"
+                },
+                timeout=300
+            )
+            if response.status_code not in RETRYABLE_STATUS:
+                data = response.json()
+                if not data.get('success'):
+                    raise RuntimeError(data.get('message') or f"HTTP {response.status_code}")
+                return data['data']
+            last_error = f"HTTP {response.status_code}"
+        except (requests.ConnectionError, requests.Timeout) as error:
+            last_error = f"Réseau: {error}"
+
+        if attempt < retries:
+            time.sleep(delay)
+            delay = min(delay * 2, 30)
+
+    raise RuntimeError(last_error or "Nombre maximum de tentatives atteint")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import NDJSON du contenu pédagogique")
+    parser.add_argument('files', nargs='+', help="Fichiers NDJSON (.ndjson, .ndjson.gz) ou '-' pour stdin")
+    parser.add_argument('--api', default=API_URL, help=f"URL de l'API (défaut: {API_URL})")
+    parser.add_argument('--token', help="Token admin (sinon généré avec CLAUDYNE_ADMIN_KEY)")
+    parser.add_argument('--batch-size', type=int, default=500, help="Entrées par lot (défaut: 500)")
+    parser.add_argument('--max-batch-mb', type=float, default=8, help="Taille maximum d'un lot en Mo (défaut: 8)")
+    parser.add_argument('--workers', type=int, default=3, help="Lots en vol simultanément (défaut: 3)")
+    parser.add_argument('--retries', type=int, default=5, help="Tentatives par lot (défaut: 5)")
+    parser.add_argument('--errors', default='import-errors.ndjson', help="Fichier des entrées rejetées")
+    args = parser.parse_args()
+
+    print("\n📚 IMPORT DU CONTENU PÉDAGOGIQUE")
+    print("=" * 60)
+
+    token = args.token or get_admin_token(args.api, ADMIN_KEY)
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=args.workers)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    totals = {}
+    failed_batches = 0
+    batch_number = 0
+    started = time.time()
+    errors_file = open(args.errors, 'w', encoding='utf-8')
+
+    def collect(future, number):
+        nonlocal failed_batches
+        try:
+            data = future.result()
+        except Exception as error:
+            failed_batches += 1
+            print(f"❌ Lot {number}: {error}")
+            return
+        for status, count in data['summary'].items():
+            if status not in ('total', 'durationMs'):
+                totals[status] = totals.get(status, 0) + count
+        for result in data['results']:
+            errors_file.write(json.dumps({'batch': number, **result}, ensure_ascii=False) + '\n')
+
+    def drain(in_flight, until):
+        while len(in_flight) > until:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                collect(future, in_flight.pop(future))
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        in_flight = {}
+        max_bytes = int(args.max_batch_mb * 1024 * 1024)
+
+        for lines, has_subjects in iter_batches(args.files, args.batch_size, max_bytes):
+            batch_number += 1
+            if has_subjects:
+                # Barrière: les subjects doivent exister avant les leçons suivantes
+                drain(in_flight, 0)
+                future = executor.submit(send_batch, session, args.api, token, lines, args.retries)
+                collect(future, batch_number)
+                continue
+
+            # Contre-pression: au plus `workers` lots en vol
+            drain(in_flight, args.workers - 1)
+            in_flight[executor.submit(send_batch, session, args.api, token, lines, args.retries)] = batch_number
+
+            done = sum(totals.values())
+            elapsed = max(time.time() - started, 0.001)
+            print(f"   📤 Lot {batch_number} | {done} entrées traitées ({done / elapsed:.0f}/s) - {totals}")
+
+        drain(in_flight, 0)
+
+    errors_file.close()
+    duration = time.time() - started
+
+    print(f"\n{'=' * 60}")
+    print("📊 RÉSUMÉ")
+    print('=' * 60)
+    for status, count in sorted(totals.items()):
+        print(f"   {status}: {count}")
+    print(f"   Lots: {batch_number} ({failed_batches} en échec)")
+    print(f"   Durée: {duration:.1f}s")
+
+    if totals.get('invalid'):
+        print(f"\n⚠️  Entrées rejetées détaillées dans {args.errors}")
+    if failed_batches:
+        print("\n❌ Import incomplet - relancez la commande (l'import est idempotent)")
+        sys.exit(1)
+    print("\n✅ Import terminé")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Import d'une classe / d'un établissement depuis un CSV
+
+Lit le CSV en flux, l'envoie par lots à POST /api/admin/bulk/students/register
+avec une concurrence bornée, et reprend là où il s'était arrêté en cas d'échec.
+
+Colonnes CSV (séparateur , ou ;):
+    firstName, lastName, email, phone, password, educationLevel, dateOfBirth, externalRef
+Si `password` est vide, un mot de passe temporaire est généré et écrit dans
+le fichier de résultats pour être distribué aux élèves. Il est journalisé avant
+l'envoi du lot et réutilisé aux tentatives suivantes: si le serveur a créé le compte
+mais que la réponse s'est perdue (délai dépassé, tentatives épuisées), l'élève revient
+en "exists" et son mot de passe est repris du journal (tempPasswordRecovered, à
+vérifier si le compte pouvait exister avant l'import).
+
+Fichiers produits à côté du CSV:
+    <fichier>.progress.json      lots terminés (reprise)
+    <fichier>.credentials.ndjson mots de passe temporaires générés (à conserver jusqu'à distribution)
+    <fichier>.results.ndjson     résultat par élève
+
+Usage:
+    python3 scripts/utils/import-students-csv.py eleves.csv --school "Lycée de Biyem-Assi"
+    python3 scripts/utils/import-students-csv.py eleves.csv --api http://localhost:3001/api --workers 4
+"""
+
+import argparse
+import csv
+import json
+import os
+import secrets
+import string
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import requests
+
+API_URL = "https://claudyne.com/api"
+ADMIN_KEY = os.environ.get("CLAUDYNE_ADMIN_KEY", "claudyne-admin-2024")
+
+FIELDS = ('firstName', 'lastName', 'email', 'phone', 'password', 'educationLevel', 'dateOfBirth', 'externalRef')
+RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+
+
+def generate_password():
+    """Mot de passe temporaire conforme à la validation (minuscule, majuscule, chiffre)"""
+    alphabet = string.ascii_letters + string.digits
+    while True:
+        password = ''.join(secrets.choice(alphabet) for _ in range(10))
+        if any(c.islower() for c in password) and any(c.isupper() for c in password) \
+                and any(c.isdigit() for c in password):
+            return password
+
+
+def get_admin_token(api_url, admin_key):
+    response = requests.post(f"{api_url}/admin/generate-token", json={"adminKey": admin_key}, timeout=15)
+    data = response.json()
+    if not data.get('success'):
+        print("❌ Échec génération token")
+        sys.exit(1)
+    return data['token']
+
+
+def iter_chunks(path, chunk_size):
+    """Lit le CSV en flux et produit (numéro de lot, lignes)"""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        sample = f.read(4096)
+        f.seek(0)
+        dialect = csv.Sniffer().sniff(sample, delimiters=',;')
+        reader = csv.DictReader(f, dialect=dialect)
+
+        rows = []
+        chunk_number = 0
+        for line_number, row in enumerate(reader, start=2):
+            student = {field: (row.get(field) or '').strip() for field in FIELDS}
+            student['externalRef'] = student['externalRef'] or f"ligne-{line_number}"
+            rows.append(student)
+            if len(rows) >= chunk_size:
+                yield chunk_number, rows
+                chunk_number += 1
+                rows = []
+        if rows:
+            yield chunk_number, rows
+
+
+class Checkpoint:
+    """Suivi des lots terminés pour la reprise après échec"""
+
+    def __init__(self, path, chunk_size):
+        self.path = path
+        self.lock = threading.Lock()
+        self.completed = set()
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('chunkSize') != chunk_size:
+                print(f"❌ Reprise impossible: taille de lot différente ({data.get('chunkSize')} ≠ {chunk_size})")
+                sys.exit(1)
+            self.completed = set(data.get('completedChunks', []))
+        self.chunk_size = chunk_size
+
+    def mark(self, chunk_number):
+        with self.lock:
+            self.completed.add(chunk_number)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'chunkSize': self.chunk_size, 'completedChunks': sorted(self.completed)}, f)
+            os.replace(tmp_path, self.path)
+
+
+class CredentialJournal:
+    """Mots de passe temporaires écrits sur disque avant l'envoi de leur lot"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.passwords = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.passwords[entry['externalRef']] = entry['password']
+
+    def reserve(self, rows):
+        """Retourne (externalRef -> mot de passe des lignes sans mot de passe, refs déjà journalisées)"""
+        with self.lock:
+            known = {row['externalRef'] for row in rows if row['externalRef'] in self.passwords}
+            new_entries = []
+            for row in rows:
+                if not row['password'] and row['externalRef'] not in self.passwords:
+                    self.passwords[row['externalRef']] = generate_password()
+                    new_entries.append(row['externalRef'])
+            if new_entries:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    for ref in new_entries:
+                        f.write(json.dumps({'externalRef': ref, 'password': self.passwords[ref]}) + '\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+            generated = {row['externalRef']: self.passwords[row['externalRef']] for row in rows if not row['password']}
+        return generated, known
+
+
+def send_chunk(session, api_url, token, rows, options, retries, journal):
+    generated, sent_before = journal.reserve(rows)
+    students = []
+    for row in rows:
+        student = {key: value for key, value in row.items() if value}
+        if not student.get('password'):
+            student['password'] = generated[row['externalRef']]
+        students.append(student)
+
+    payload = {"students": students, **options}
+    delay = 1.0
+    for attempt in range(retries + 1):
+        try:
+            response = session.post(
+                f"{api_url}/admin/bulk/students/register",
+                json=payload,
+                headers={"Authorization": f"Bearer {token}"},
+                timeout=300
+            )
+            if response.status_code not in RETRYABLE_STATUS:
+                data = response.json()
+                if not data.get('success'):
+                    raise RuntimeError(data.get('message') or f"HTTP {response.status_code}")
+                results = data['data']['results']
+                for result in results:
+                    ref = result.get('externalRef')
+                    if ref not in generated:
+                        continue
+                    if result.get('status') == 'created':
+                        result['tempPassword'] = generated[ref]
+                    elif result.get('status') == 'exists' and (attempt > 0 or ref in sent_before):
+                        # Compte créé par un envoi précédent dont la réponse a été perdue
+                        result['tempPassword'] = generated[ref]
+                        result['tempPasswordRecovered'] = True
+                return results
+        except (requests.ConnectionError, requests.Timeout) as error:
+            if attempt == retries:
+                raise RuntimeError(f"Réseau: {error}")
+        if attempt < retries:
+            time.sleep(delay)
+            delay = min(delay * 2, 30)
+    raise RuntimeError("Nombre maximum de tentatives atteint")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inscription en masse d'élèves depuis un CSV")
+    parser.add_argument('csv_file', help="Fichier CSV des élèves")
+    parser.add_argument('--api', default=API_URL, help=f"URL de l'API (défaut: {API_URL})")
+    parser.add_argument('--token', help="Token admin (sinon généré avec CLAUDYNE_ADMIN_KEY)")
+    parser.add_argument('--chunk-size', type=int, default=200, help="Élèves par requête (défaut: 200)")
+    parser.add_argument('--workers', type=int, default=3, help="Requêtes simultanées (défaut: 3)")
+    parser.add_argument('--retries', type=int, default=4, help="Tentatives par lot (défaut: 4)")
+    parser.add_argument('--school', help="Nom de l'établissement (schoolName)")
+    parser.add_argument('--city', help="Ville par défaut des élèves")
+    args = parser.parse_args()
+
+    print("\n🏫 IMPORT D'ÉLÈVES EN MASSE")
+    print("=" * 60)
+
+    token = args.token or get_admin_token(args.api, ADMIN_KEY)
+    checkpoint = Checkpoint(f"{args.csv_file}.progress.json", args.chunk_size)
+    journal = CredentialJournal(f"{args.csv_file}.credentials.ndjson")
+    results_path = f"{args.csv_file}.results.ndjson"
+    results_lock = threading.Lock()
+    options = {key: value for key, value in (('schoolName', args.school), ('city', args.city)) if value}
+
+    if checkpoint.completed:
+        print(f"🔁 Reprise: {len(checkpoint.completed)} lots déjà importés seront ignorés")
+
+    totals = {}
+    recovered = []
+    failed_chunks = []
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=args.workers)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    started = time.time()
+
+    def process(chunk_number, rows):
+        results = send_chunk(session, args.api, token, rows, options, args.retries, journal)
+        with results_lock, open(results_path, 'a', encoding='utf-8') as out:
+            for result in results:
+                out.write(json.dumps({'chunk': chunk_number, **result}, ensure_ascii=False) + '\n')
+                totals[result['status']] = totals.get(result['status'], 0) + 1
+                if result.get('tempPasswordRecovered'):
+                    recovered.append(result['externalRef'])
+        # Un lot avec des lignes en échec sera renvoyé à la prochaine exécution
+        # (les élèves déjà créés reviennent alors en "exists")
+        if not any(result['status'] == 'failed' for result in results):
+            checkpoint.mark(chunk_number)
+        return len(results)
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        in_flight = {}
+        for chunk_number, rows in iter_chunks(args.csv_file, args.chunk_size):
+            if chunk_number in checkpoint.completed:
+                continue
+            # Contre-pression: pas plus de `workers` lots en mémoire
+            while len(in_flight) >= args.workers:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    number = in_flight.pop(future)
+                    try:
+                        future.result()
+                    except Exception as error:
+                        failed_chunks.append(number)
+                        print(f"❌ Lot {number}: {error}")
+            in_flight[executor.submit(process, chunk_number, rows)] = chunk_number
+
+            processed = sum(totals.values())
+            if processed:
+                rate = processed / max(time.time() - started, 0.001)
+                print(f"   📤 {processed} élèves traités ({rate:.0f}/s) - {totals}")
+
+        for future in list(in_flight):
+            number = in_flight.pop(future)
+            try:
+                future.result()
+            except Exception as error:
+                failed_chunks.append(number)
+                print(f"❌ Lot {number}: {error}")
+
+    duration = time.time() - started
+    print(f"\n{'=' * 60}")
+    print("📊 RÉSUMÉ")
+    print('=' * 60)
+    for status, count in sorted(totals.items()):
+        print(f"   {status}: {count}")
+    if recovered:
+        print(f"   mots de passe repris du journal: {len(recovered)} (tempPasswordRecovered)")
+    print(f"   Durée: {duration:.1f}s")
+    print(f"   Résultats: {results_path}")
+
+    if failed_chunks or totals.get('failed'):
+        print("\n⚠️  Import incomplet - relancez la même commande pour reprendre")
+        sys.exit(1)
+    print("\n✅ Import terminé")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,15 +4,31 @@
  * Spécialement adapté pour le marché camerounais
  */
 
-const CACHE_NAME = 'claudyne-v1.7.9';
+// Manifeste de précache généré par scripts/utils/asset-budget.py manifest:
+// une révision SHA-256 par fichier. Sa modification déclenche la mise à jour du
+// service worker, qui ne retélécharge que les fichiers dont la révision a changé.
+try {
+    importScripts('/precache-manifest.js');
+} catch (error) {
+    console.warn('⚠️ Manifeste de précache indisponible:', error.message);
+}
+const PRECACHE_MANIFEST = self.__PRECACHE_MANIFEST || { version: 'dev', assets: [] };
+
+// Cache des fichiers précachés (stable: les entrées sont versionnées une par une)
+const PRECACHE_NAME = 'claudyne-precache';
+// Cache d'exécution (ressources non précachées); à changer seulement si sa stratégie change
+const CACHE_NAME = 'claudyne-runtime-v1';
 const OFFLINE_URL = '/offline.html';
 
-// Ressources critiques à mettre en cache
+// Chemins servis par un fichier précaché
+const PRECACHE_ALIASES = {
+    '/': '/index.html'
+};
+
+// Ressources critiques hors manifeste (mises en cache si le manifeste est absent)
 const CRITICAL_RESOURCES = [
     '/',
     '/index.html',
-    '/admin-interface.html',
-    '/admin-secure-k7m9x4n2p8w5z1c6',
     '/student-interface-modern.html'
 ];
 
@@ -28,14 +44,112 @@ self.addEventListener('install', event => {
 
     event.waitUntil(
         Promise.all([
-            // Cache des ressources critiques avec gestion d'erreur
-            cacheResourcesSafely(CRITICAL_RESOURCES),
+            // Précache des fichiers nouveaux ou modifiés uniquement
+            precacheChangedAssets(),
+            // Cache des ressources critiques non couvertes par le manifeste
+            cacheResourcesSafely(CRITICAL_RESOURCES.filter(url => !precacheEntry(url))),
             // Prise de contrôle immédiate
             self.skipWaiting()
         ])
     );
 });
 
+// Entrée du manifeste servant un chemin, ou undefined
+function precacheEntry(pathname) {
+    const target = PRECACHE_ALIASES[pathname] || pathname;
+    return PRECACHE_MANIFEST.assets.find(asset => asset.url === target);
+}
+
+// Clé de cache d'une révision: une nouvelle révision n'écrase jamais l'ancienne en cours d'usage
+function precacheKey(asset) {
+    return new URL(`${asset.url}?__rev=${asset.revision.slice(0, 16)}`, self.location.origin).href;
+}
+
+async function sha256Hex(buffer) {
+    const digest = await crypto.subtle.digest('SHA-256', buffer);
+    return Array.from(new Uint8Array(digest), byte => byte.toString(16).padStart(2, '0')).join('');
+}
+
+// Télécharge séquentiellement (connexions 2G/3G) les seules révisions absentes du cache
+async function precacheChangedAssets() {
+    const cache = await caches.open(PRECACHE_NAME);
+    const cachedKeys = new Set((await cache.keys()).map(request => request.url));
+    const missing = PRECACHE_MANIFEST.assets.filter(asset => !cachedKeys.has(precacheKey(asset)));
+
+    console.log(`📦 Précache ${PRECACHE_MANIFEST.version}: ${missing.length}/${PRECACHE_MANIFEST.assets.length} fichiers à télécharger`);
+
+    for (const asset of missing) {
+        try {
+            const response = await fetch(new Request(asset.url, { cache: 'reload' }));
+            if (!response.ok) {
+                console.warn('⚠️ Ressource non trouvée (ignorée):', asset.url, response.status);
+                continue;
+            }
+
+            // Une réponse périmée (proxy, CDN) ne doit pas être enregistrée sous la nouvelle révision
+            const body = await response.clone().arrayBuffer();
+            if (await sha256Hex(body) !== asset.revision) {
+                console.warn('⚠️ Révision inattendue (ignorée):', asset.url);
+                continue;
+            }
+
+            await cache.put(precacheKey(asset), response);
+            console.log('✅ Ressource précachée:', asset.url);
+        } catch (error) {
+            console.warn('⚠️ Impossible de précacher (ignoré):', asset.url, error.message);
+        }
+    }
+}
+
+// Supprime les révisions qui ne figurent plus dans le manifeste
+async function cleanupPrecache() {
+    const cache = await caches.open(PRECACHE_NAME);
+    const expected = new Set(PRECACHE_MANIFEST.assets.map(precacheKey));
+    const requests = await cache.keys();
+
+    await Promise.all(
+        requests
+            .filter(request => !expected.has(request.url))
+            .map(request => cache.delete(request))
+    );
+}
+
+// Délai avant de servir une page précachée quand le réseau est lent (2G/3G)
+const PAGE_NETWORK_TIMEOUT = 4000;
+
+// Fichier précaché. Pages HTML: réseau d'abord (revalidation HTTP, peu coûteuse) avec la
+// révision précachée en repli hors ligne ou après PAGE_NETWORK_TIMEOUT, pour qu'un
+// manifeste en retard ne fige jamais une page. Autres fichiers: révision précachée.
+async function handlePrecachedRequest(request, asset) {
+    const cachedResponse = await caches.match(precacheKey(asset), { cacheName: PRECACHE_NAME });
+
+    if (!asset.url.endsWith('.html')) {
+        return cachedResponse || handleOtherRequests(request);
+    }
+    if (!cachedResponse) {
+        return handlePageRequest(request);
+    }
+
+    // Course contre un délai (une navigation ne peut pas être refaite avec un AbortSignal)
+    let timeoutId;
+    const timeout = new Promise(resolve => {
+        timeoutId = setTimeout(() => resolve(null), PAGE_NETWORK_TIMEOUT);
+    });
+    try {
+        const networkResponse = await Promise.race([fetch(request), timeout]);
+        if (networkResponse && networkResponse.ok) {
+            return networkResponse;
+        }
+    } catch (error) {
+        // Hors ligne: repli sur la révision précachée
+    } finally {
+        clearTimeout(timeoutId);
+    }
+
+    console.log('📴 Page précachée servie (réseau indisponible ou lent):', asset.url);
+    return cachedResponse;
+}
+
 // Cache les ressources de manière sécurisée (ne plante pas si une ressource n'existe pas)
 async function cacheResourcesSafely(resources) {
     const cache = await caches.open(CACHE_NAME);
@@ -71,13 +185,15 @@ self.addEventListener('activate', event => {
             caches.keys().then(cacheNames => {
                 return Promise.all(
                     cacheNames
-                        .filter(cacheName => cacheName !== CACHE_NAME)
+                        .filter(cacheName => cacheName !== CACHE_NAME && cacheName !== PRECACHE_NAME)
                         .map(cacheName => {
                             console.log('🗑️ Suppression cache obsolète:', cacheName);
                             return caches.delete(cacheName);
                         })
                 );
             }),
+            // Nettoyage des révisions obsolètes du précache
+            cleanupPrecache(),
             // Prise de contrôle de toutes les pages
             self.clients.claim()
         ])
@@ -94,6 +210,13 @@ self.addEventListener('fetch', event => {
         return;
     }
 
+    // Fichiers du manifeste servis depuis leur révision précachée
+    const asset = request.method === 'GET' && url.origin === self.location.origin && precacheEntry(url.pathname);
+    if (asset) {
+        event.respondWith(handlePrecachedRequest(request, asset));
+        return;
+    }
+
     // Stratégie différente selon le type de ressource
     if (url.pathname.endsWith('.html') || url.pathname === '/admin-secure-k7m9x4n2p8w5z1c6') {
         event.respondWith(handlePageRequest(request));
@@ -401,30 +524,39 @@ async function clearAllCaches() {
 
 // Calcul de la taille du cache
 async function getCacheSize() {
-    const cache = await caches.open(CACHE_NAME);
-    const requests = await cache.keys();
-    
     let totalSize = 0;
-    
-    for (const request of requests) {
-        try {
-            const response = await cache.match(request);
-            if (response) {
-                const blob = await response.blob();
-                totalSize += blob.size;
-            }
-        } catch (error) {
-            console.warn('⚠️ Erreur calcul taille:', error);
+    let items = 0;
+
+    for (const cacheName of [PRECACHE_NAME, CACHE_NAME]) {
+        const cache = await caches.open(cacheName);
+        const requests = await cache.keys();
+        items += requests.length;
+
+        for (const request of requests) {
+            totalSize += await cachedEntrySize(cache, request);
         }
     }
-    
+
     return {
         bytes: totalSize,
         mb: (totalSize / 1024 / 1024).toFixed(2),
-        items: requests.length
+        items
     };
 }
 
+async function cachedEntrySize(cache, request) {
+    try {
+        const response = await cache.match(request);
+        if (response) {
+            const blob = await response.blob();
+            return blob.size;
+        }
+    } catch (error) {
+        console.warn('⚠️ Erreur calcul taille:', error);
+    }
+    return 0;
+}
+
 // Gestion des erreurs globales
 self.addEventListener('error', event => {
     console.error('❌ Erreur Service Worker:', event.error);
@@ -434,4 +566,4 @@ self.addEventListener('unhandledrejection', event => {
     console.error('❌ Promise rejetée dans Service Worker:', event.reason);
 });
 
-console.log('🚀 Service Worker Claudyne initialisé - Version', CACHE_NAME);
\ No newline at end of file
+console.log('🚀 Service Worker Claudyne initialisé - Précache', PRECACHE_MANIFEST.version, '- Runtime', CACHE_NAME);
\ No newline at end of file
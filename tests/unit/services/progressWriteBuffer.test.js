@@ -0,0 +1,303 @@
+/**
+ * Tests unitaires - Tampon d'écriture différée des progrès
+ * Fusion des événements, remise en attente après échec, isolation d'une entrée fautive,
+ * lecture de ses propres écritures et statistiques des leçons
+ */
+
+jest.mock('../../../backend/src/utils/logger', () => ({
+  info: jest.fn(),
+  warn: jest.fn(),
+  error: jest.fn()
+}));
+
+const BAD_LESSON_ID = 999;
+
+/**
+ * Modèles en mémoire: table progress indexée par "élève:leçon", leçons avec leurs statistiques
+ */
+function createModels({ failures = 0 } = {}) {
+  const table = new Map();
+  const lessons = new Map();
+  const calls = { bulkCreate: 0 };
+  let remainingFailures = failures;
+
+  const lessonStub = id => {
+    if (!lessons.has(id)) {
+      lessons.set(id, {
+        id,
+        stats: { viewCount: 0, completionCount: 0, averageScore: 0 },
+        update: jest.fn(async function (values) { Object.assign(this, values); })
+      });
+    }
+    return lessons.get(id);
+  };
+
+  const Progress = {
+    findAll: jest.fn(async ({ where }) => {
+      const [conditions] = Object.getOwnPropertySymbols(where).map(symbol => where[symbol]);
+      return conditions
+        .map(({ studentId, lessonId }) => table.get(`${studentId}:${lessonId}`))
+        .filter(Boolean)
+        .map(row => ({ ...row }));
+    }),
+    bulkCreate: jest.fn(async (records) => {
+      calls.bulkCreate++;
+      if (remainingFailures > 0) {
+        remainingFailures--;
+        throw new Error('connexion perdue');
+      }
+      if (records.some(record => record.lessonId === BAD_LESSON_ID)) {
+        throw new Error('violation de clé étrangère');
+      }
+      records.forEach(record => table.set(`${record.studentId}:${record.lessonId}`, { ...record }));
+    })
+  };
+
+  const Lesson = {
+    findAll: jest.fn(async ({ where }) => where.id.map(lessonStub))
+  };
+
+  const sequelize = {
+    transaction: jest.fn(async (callback) => callback({}))
+  };
+
+  return { models: { Progress, Lesson, sequelize }, table, lessons, lessonStub, calls };
+}
+
+function loadBuffer(models) {
+  let buffer;
+  jest.isolateModules(() => {
+    buffer = require('../../../backend/src/services/progressWriteBuffer');
+  });
+  // Pas de fenêtre automatique: chaque test décide quand écrire
+  buffer.windowMs = 60 * 60 * 1000;
+  buffer.models = models;
+  return buffer;
+}
+
+describe('Progress Write Buffer', () => {
+  let buffer;
+
+  afterEach(() => {
+    if (buffer && buffer.timer) {
+      clearTimeout(buffer.timer);
+      buffer.timer = null;
+    }
+  });
+
+  describe('Merging', () => {
+    test('should merge events for the same student and lesson into one row', async () => {
+      const { models, table } = createModels();
+      buffer = loadBuffer(models);
+
+      const persisted = [
+        buffer.add({ studentId: 's1', lessonId: 1, progress: 30, score: 50 }),
+        buffer.add({ studentId: 's1', lessonId: 1, progress: 60, score: 80 }),
+        buffer.add({ studentId: 's1', lessonId: 1, progress: 40, score: 70 })
+      ];
+      await buffer.flush();
+      const records = await Promise.all(persisted);
+
+      expect(models.Progress.bulkCreate).toHaveBeenCalledTimes(1);
+      expect(table.size).toBe(1);
+      expect(records[0]).toBe(records[2]);
+      expect(records[0].completionPercentage).toBe(60);
+      expect(records[0].lastScore).toBe(70);
+      expect(records[0].bestScore).toBe(80);
+      expect(records[0].status).toBe('in_progress');
+      expect(buffer.getStats().merged).toBe(2);
+    });
+
+    test('should keep the best stored score and completion percentage', async () => {
+      const { models, table } = createModels();
+      table.set('s1:1', { studentId: 's1', lessonId: 1, status: 'in_progress', completionPercentage: 80, bestScore: 95 });
+      buffer = loadBuffer(models);
+
+      const persisted = buffer.add({ studentId: 's1', lessonId: 1, progress: 50, score: 60 });
+      await buffer.flush();
+      const record = await persisted;
+
+      expect(record.completionPercentage).toBe(80);
+      expect(record.lastScore).toBe(60);
+      expect(record.bestScore).toBe(95);
+    });
+
+    test('should keep a completed or mastered status sticky', async () => {
+      const { models, table } = createModels();
+      const completedAt = new Date('2026-01-01');
+      table.set('s1:1', { studentId: 's1', lessonId: 1, status: 'completed', completionPercentage: 100, completedAt });
+      table.set('s1:2', { studentId: 's1', lessonId: 2, status: 'mastered', completionPercentage: 100, completedAt });
+      buffer = loadBuffer(models);
+
+      const persisted = [
+        buffer.add({ studentId: 's1', lessonId: 1, progress: 20 }),
+        buffer.add({ studentId: 's1', lessonId: 2, progress: 10 })
+      ];
+      await buffer.flush();
+      const [completed, mastered] = await Promise.all(persisted);
+
+      expect(completed.status).toBe('completed');
+      expect(completed.completionPercentage).toBe(100);
+      expect(completed.completedAt).toBe(completedAt);
+      expect(mastered.status).toBe('mastered');
+    });
+
+    test('should write a completed lesson without waiting for the window', async () => {
+      const { models, table } = createModels();
+      buffer = loadBuffer(models);
+
+      const record = await buffer.add({ studentId: 's1', lessonId: 1, progress: 100, score: 90 });
+
+      expect(record.status).toBe('completed');
+      expect(record.completedAt).toBeInstanceOf(Date);
+      expect(table.get('s1:1').status).toBe('completed');
+    });
+  });
+
+  describe('Retries', () => {
+    test('should requeue entries after a failed write and persist them on the next flush', async () => {
+      const { models, table } = createModels({ failures: 1 });
+      buffer = loadBuffer(models);
+
+      const persisted = buffer.add({ studentId: 's1', lessonId: 1, progress: 40 });
+      await buffer.flush();
+
+      expect(table.size).toBe(0);
+      expect(buffer.getStats().pending).toBe(1);
+      expect(buffer.getStats().failures).toBe(1);
+
+      // Un événement arrivé entre-temps est fusionné avec l'entrée remise en attente
+      const newer = buffer.add({ studentId: 's1', lessonId: 1, progress: 20, score: 75 });
+      await buffer.flush();
+
+      const [record, newerRecord] = await Promise.all([persisted, newer]);
+      expect(record).toBe(newerRecord);
+      expect(record.completionPercentage).toBe(40);
+      expect(record.lastScore).toBe(75);
+      expect(table.get('s1:1').completionPercentage).toBe(40);
+      expect(buffer.getStats().pending).toBe(0);
+    });
+
+    test('should give up after MAX_RETRIES failed writes', async () => {
+      const { models, table, calls } = createModels({ failures: Infinity });
+      buffer = loadBuffer(models);
+
+      const persisted = buffer.add({ studentId: 's1', lessonId: 1, progress: 40 });
+      const outcome = persisted.then(() => 'written', error => error.message);
+      for (let attempt = 0; attempt < 4; attempt++) {
+        await buffer.flush();
+      }
+
+      expect(await outcome).toBe('connexion perdue');
+      expect(calls.bulkCreate).toBe(4);
+      expect(buffer.getStats().pending).toBe(0);
+      expect(table.size).toBe(0);
+
+      // Plus rien à écrire: pas de tentative supplémentaire
+      await buffer.flush();
+      expect(calls.bulkCreate).toBe(4);
+    });
+  });
+
+  describe('Isolation', () => {
+    test('should bisect a failing batch and only requeue the bad row', async () => {
+      const { models, table } = createModels();
+      buffer = loadBuffer(models);
+
+      const lessonIds = [1, 2, BAD_LESSON_ID, 3, 4];
+      const outcomes = lessonIds.map(lessonId =>
+        buffer.add({ studentId: 's1', lessonId, progress: 50 }).then(() => 'written', () => 'failed'));
+      await buffer.flush();
+
+      expect([...table.keys()].sort()).toEqual(['s1:1', 's1:2', 's1:3', 's1:4']);
+      expect(buffer.getStats().pending).toBe(1);
+      expect(buffer.hasPending('s1')).toBe(true);
+      expect(buffer.getStats().failures).toBe(1);
+      expect(buffer.getStats().rowsWritten).toBe(4);
+
+      // L'entrée fautive finit par être abandonnée sans bloquer les autres
+      for (let attempt = 0; attempt < 3; attempt++) {
+        await buffer.flush();
+      }
+      expect(await Promise.all(outcomes)).toEqual(['written', 'written', 'failed', 'written', 'written']);
+      expect(buffer.getStats().pending).toBe(0);
+    });
+  });
+
+  describe('Read your writes', () => {
+    test('should flush pending progress of the student before reading', async () => {
+      const { models, table } = createModels();
+      buffer = loadBuffer(models);
+
+      buffer.add({ studentId: 's1', lessonId: 1, progress: 30 });
+      buffer.add({ studentId: 's2', lessonId: 1, progress: 30 });
+      await buffer.flushStudent('s1');
+
+      expect(table.has('s1:1')).toBe(true);
+      expect(buffer.hasPending('s1')).toBe(false);
+    });
+
+    test('should wait for an in-flight write when nothing is pending', async () => {
+      const { models, table } = createModels();
+      let release;
+      const writeStarted = new Promise(resolve => {
+        const bulkCreate = models.Progress.bulkCreate;
+        models.Progress.bulkCreate = jest.fn(async (records, options) => {
+          resolve();
+          await new Promise(done => { release = done; });
+          return bulkCreate(records, options);
+        });
+      });
+      buffer = loadBuffer(models);
+
+      buffer.add({ studentId: 's1', lessonId: 1, progress: 30 });
+      buffer.flush();
+      await writeStarted;
+
+      let readDone = false;
+      const read = buffer.flushStudent('s1').then(() => { readDone = true; });
+      await Promise.resolve();
+      expect(readDone).toBe(false);
+
+      release();
+      await read;
+      expect(table.has('s1:1')).toBe(true);
+    });
+  });
+
+  describe('Lesson statistics', () => {
+    test('should count views for new rows and completions for rows reaching completed', async () => {
+      const { models, table, lessonStub } = createModels();
+      table.set('s1:2', { studentId: 's1', lessonId: 2, status: 'in_progress', completionPercentage: 50 });
+      table.set('s2:2', { studentId: 's2', lessonId: 2, status: 'in_progress', completionPercentage: 50 });
+      buffer = loadBuffer(models);
+
+      await Promise.all([
+        buffer.add({ studentId: 's1', lessonId: 1, progress: 10 }),
+        buffer.add({ studentId: 's2', lessonId: 1, progress: 10 }),
+        buffer.add({ studentId: 's1', lessonId: 2, progress: 100, score: 80 }),
+        buffer.add({ studentId: 's2', lessonId: 2, progress: 100, score: 60 })
+      ]);
+
+      expect(lessonStub(1).stats.viewCount).toBe(2);
+      expect(lessonStub(1).stats.completionCount).toBe(0);
+      expect(lessonStub(2).stats.viewCount).toBe(0);
+      expect(lessonStub(2).stats.completionCount).toBe(2);
+      // Même moyenne que Lesson.updateStats: (0 × 1 + 80) / 2 puis (40 × 2 + 60) / 3
+      expect(lessonStub(2).stats.averageScore).toBe(47);
+      // Une seule mise à jour par leçon
+      expect(lessonStub(2).update).toHaveBeenCalledTimes(1);
+    });
+
+    test('should not count progress on an already completed lesson again', async () => {
+      const { models, table, lessons } = createModels();
+      table.set('s1:1', { studentId: 's1', lessonId: 1, status: 'completed', completionPercentage: 100 });
+      buffer = loadBuffer(models);
+
+      await buffer.add({ studentId: 's1', lessonId: 1, progress: 100, score: 90 });
+
+      expect(models.Lesson.findAll).not.toHaveBeenCalled();
+      expect(lessons.size).toBe(0);
+    });
+  });
+});